@@ -0,0 +1,166 @@
+# :filename: benchmarks/bench.py    benchmark runner
+# to use: "cd benchmarks; python bench.py [options]"
+#
+# examples:
+#   python bench.py                                # run all cases, print a table
+#   python bench.py -k sha1 -k des                 # run only cases with "sha1" or "des" in their name
+#   python bench.py --out results.json             # save results as json
+#   python bench.py --baseline results.json        # compare with saved results, exit 1 if there is a regression
+#
+# each case (see cases.py) is timed as:
+#   - warmup calls, not timed
+#   - repeat repetitions, each one of number calls; number is calibrated so that a
+#       repetition lasts at least min_time seconds
+#   - statistics of the latency of a single call: min, median, mean, stdev;
+#       throughput is computed on the median, as bytes/s (if the case declares the
+#       bytes it processes) or as calls/s
+# comparing with a baseline, a case is a regression if its median latency is
+# greater than (1 + threshold) times the one in the baseline
+
+# import std libs
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+# import project's libs
+import cases
+
+
+def calibrate(stmt, min_time):
+    '''number of calls of stmt lasting at least min_time seconds (as timeit.Timer.autorange)'''
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            stmt()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return number
+        number = number * 10 if elapsed == 0 else max(number + 1, int(number * min_time / elapsed * 1.2))
+
+
+def measure(stmt, warmup=1, repeat=5, min_time=0.05):
+    '''time stmt
+
+       params
+         - stmt        callable - without arguments, what to time
+         - warmup      int - calls to do before timing
+         - repeat      int - n.of repetitions
+         - min_time    float - min seconds of a repetition
+
+       return list of latencies (seconds) of a single call, one for each repetition
+    '''
+    for _ in range(warmup):
+        stmt()
+    number = calibrate(stmt, min_time)
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            stmt()
+        result.append((time.perf_counter() - start) / number)
+    return result
+
+
+def stats(latencies, nbytes=None):
+    '''statistics of latencies, as dict'''
+    median = statistics.median(latencies)
+    result = {
+        'min':    min(latencies),
+        'median': median,
+        'mean':   statistics.mean(latencies),
+        'stdev':  statistics.stdev(latencies) if len(latencies) > 1 else 0.0,
+        'repeat': len(latencies),
+        'calls_per_s': 1 / median if median else float('inf'),
+    }
+    if nbytes is not None:
+        result['bytes'] = nbytes
+        result['bytes_per_s'] = nbytes / median if median else float('inf')
+    return result
+
+
+def compare(results, baseline, threshold=0.10):
+    '''compare results with baseline
+
+       params
+         - results      dict - {case name: stats}
+         - baseline     dict - as results, from a previous run
+         - threshold    float - allowed relative increase of median latency
+
+       return list of (name, ratio, is_regression,) for cases present in both;
+              ratio is current median / baseline median
+    '''
+    result = []
+    for name in results:
+        if name not in baseline:
+            continue
+        ratio = results[name]['median'] / baseline[name]['median']
+        result.append((name, ratio, ratio > 1 + threshold,))
+    return result
+
+
+def human(seconds):
+    '''latency as a short string'''
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+    return f'{seconds / 1e-9:.1f} ns'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmarks of py_naive_cryptology')
+    parser.add_argument('-k', dest='keywords', action='append', default=[], help='run only cases containing this string')
+    parser.add_argument('--list', action='store_true', help='list cases and exit')
+    parser.add_argument('--warmup', type=int, default=1, help='calls before timing')
+    parser.add_argument('--repeat', type=int, default=5, help='n.of timed repetitions')
+    parser.add_argument('--min-time', type=float, default=0.05, help='min seconds of a repetition')
+    parser.add_argument('--out', help='json file where to save results')
+    parser.add_argument('--baseline', help='json file of results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative slow down against baseline')
+    args = parser.parse_args()
+
+    selected = [item for item in cases.CASES
+                if not args.keywords or any(k in item.name for k in args.keywords)]
+    if args.list:
+        for item in selected:
+            print(item.name)
+        return 0
+
+    results = {}
+    print(f'{"case":<36}{"median":>14}{"stdev %":>10}{"throughput":>18}')
+    for item in selected:
+        stmt, nbytes = item.make()
+        results[item.name] = stats(measure(stmt, warmup=args.warmup, repeat=args.repeat, min_time=args.min_time),
+                                   nbytes=nbytes)
+        r = results[item.name]
+        throughput = f'{r["bytes_per_s"] / 1024:.1f} KiB/s' if nbytes else f'{r["calls_per_s"]:.1f} calls/s'
+        print(f'{item.name:<36}{human(r["median"]):>14}{100 * r["stdev"] / r["mean"]:>10.1f}{throughput:>18}')
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'meta': {'python': sys.version,
+                                'platform': platform.platform(),
+                                'date': time.strftime('%Y-%m-%dT%H:%M:%S'), },
+                       'results': results, },
+                      f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = 0
+        print()
+        print(f'{"case":<36}{"current/baseline":>18}')
+        for name, ratio, is_regression in compare(results, baseline, threshold=args.threshold):
+            regressions += is_regression
+            print(f'{name:<36}{ratio:>18.2f}{"  REGRESSION" if is_regression else ""}')
+        if regressions:
+            print(f'{regressions} regression(s) over {100 * args.threshold:.0f}%')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
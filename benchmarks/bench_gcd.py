@@ -0,0 +1,89 @@
+# :filename: benchmarks/bench_gcd.py    timing of gcd, egcd, invmod
+# to use: "cd benchmarks; python bench_gcd.py [--small N] [--bits B] [--big N]"
+#
+# it compares numbers_ops functions with the previous (recursive egcd, plain
+# euclidean gcd) versions, copied here as reference, on:
+#   - a few pairs of big operands (default 4096 bits)
+#   - a lot of pairs of small operands (default 1000000 pairs of 32 bits)
+
+# import std libs
+import argparse
+import os
+import random
+import sys
+import time
+
+# import project's libs
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.numbers_ops as nops        # NOW we find numbers_ops module if we import it
+
+
+def egcd_recursive(a, b):
+    '''reference: previous recursive egcd'''
+    if a == 0:
+        return (b, 0, 1)
+    else:
+        g, y, x = egcd_recursive(b % a, a)
+        return (g, x - (b // a) * y, y)
+
+
+def gcd_euclid(a, b):
+    '''reference: previous euclidean loop'''
+    while b != 0:
+        t = b
+        b = a % b
+        a = t
+    return a
+
+
+def invmod_egcd(a, m):
+    '''reference: previous invmod, using egcd_recursive'''
+    g, x, y = egcd_recursive(a, m)
+    if g != 1:
+        raise ValueError(f"{a} doesn't have an inverse under modulo {m}")
+    return x % m
+
+
+def timing(func, pairs):
+    '''seconds to call func on each pair'''
+    start = time.perf_counter()
+    for a, b in pairs:
+        func(a, b)
+    return time.perf_counter() - start
+
+
+def invertible_pairs(count, bits):
+    '''pairs (a, m) with a invertible modulo m, both of bits bits'''
+    result = []
+    while len(result) < count:
+        a, m = random.getrandbits(bits) | 1, random.getrandbits(bits) | (1 << (bits - 1))
+        if nops.gcd(a, m) == 1:
+            result.append((a, m))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='timing of gcd, egcd, invmod')
+    parser.add_argument('--bits', type=int, default=4096, help='bits of big operands')
+    parser.add_argument('--big', type=int, default=200, help='number of big pairs')
+    parser.add_argument('--small', type=int, default=1000000, help='number of small (32 bits) pairs')
+    args = parser.parse_args()
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * args.bits))   # egcd_recursive needs a deep stack
+
+    cases = [(f'{args.bits} bits', invertible_pairs(args.big, args.bits)),
+             ('32 bits', invertible_pairs(args.small, 32)), ]
+    funcs = [('gcd', gcd_euclid, nops.gcd),
+             ('egcd', egcd_recursive, nops.egcd),
+             ('invmod', invmod_egcd, nops.invmod), ]
+    print(f'{"function":<10}{"operands":<12}{"pairs":>10}{"previous s":>14}{"current s":>14}{"speedup":>10}')
+    for label, pairs in cases:
+        for name, previous, current in funcs:
+            t0 = timing(previous, pairs)
+            t1 = timing(current, pairs)
+            print(f'{name:<10}{label:<12}{len(pairs):>10}{t0:>14.4f}{t1:>14.4f}{t0 / t1:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# :filename: benchmarks/bench_slots.py    memory and time to make instances of NBitArray and NMatrix
+# to use: "cd benchmarks; python bench_slots.py [--count N]"
+#
+# it compares the classes (with __slots__) against copies of them with a
+# per-instance __dict__ (same methods, no __slots__), making count instances:
+#   - NBitArray of 32 bits, as the words of sha1
+#   - NMatrix of 1 x 3, as the vectors of hill
+# memory is the tracemalloc peak while all instances are alive, in a second
+# (not timed) run
+
+# import std libs
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# import project's libs
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.nbitarray as nba           # NOW we find project's modules if we import them
+import source.nmatrix   as nm
+
+
+def with_dict(cls):
+    '''copy of cls without __slots__, so its instances have a __dict__'''
+    slots = set(cls.__slots__) | {'_' + cls.__name__ + name for name in cls.__slots__ if name.startswith('__')}
+    namespace = {name: item for name, item in vars(cls).items()
+                 if name not in slots and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__ + 'WithDict', cls.__bases__, namespace)
+
+
+def measure(make, count):
+    '''(seconds, bytes per instance) to make count instances by make()'''
+    start = time.perf_counter()
+    items = [make() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    del items
+    tracemalloc.start()                             # memory in a second run: tracemalloc slows down
+    items = [make() for _ in range(count)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return elapsed, peak / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='memory and time to make instances, with and without __slots__')
+    parser.add_argument('--count', type=int, default=1000000, help='n.of instances')
+    args = parser.parse_args()
+
+    word = b'\x67\x45\x23\x01'
+    row = [[1, 2, 3]]
+    cases = [('NBitArray(32 bits)', nba.NBitArray, with_dict(nba.NBitArray), lambda cls: cls(word)),
+             ('NMatrix(1 x 3)', nm.NMatrix, with_dict(nm.NMatrix), lambda cls: cls(row)), ]
+    print(f'{"class":<22}{"layout":<10}{"seconds":>10}{"bytes/instance":>16}')
+    for name, slotted, dicted, make in cases:
+        for layout, cls in (('__dict__', dicted), ('__slots__', slotted)):
+            elapsed, size = measure(lambda: make(cls), args.count)
+            print(f'{name:<22}{layout:<10}{elapsed:>10.3f}{size:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
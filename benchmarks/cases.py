@@ -0,0 +1,342 @@
+# :filename: benchmarks/cases.py    benchmark cases, used by bench.py
+#
+# a case is registered by the "case" decorator on a function without arguments
+# returning (stmt, nbytes,):
+#   - stmt      callable - without arguments, the operation to time
+#   - nbytes    int - bytes processed by stmt, or None if throughput is in calls
+# input data are built outside stmt and they are deterministic (random.Random
+# with a fixed seed), so two runs time the same work
+#
+# names are "module.function/size"
+
+# import std libs
+import os
+import random
+import sys
+from collections import namedtuple
+from functools import partial
+
+# import project's libs
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.des            as des      # NOW we find project's modules if we import them
+import source.hill           as hill
+import source.hmac_sha1      as hmac_sha1
+import source.merkle         as merkle
+import source.nbitarray      as nba
+import source.nmatrix        as nm
+import source.numbers_ops    as nops
+import source.pbkdf2         as pbkdf2
+import source.schoolbook_rsa as srsa
+import source.sha1           as sha1
+import source.sha256         as sha256
+
+
+Case = namedtuple('Case', 'name make')
+
+CASES = []
+
+
+def case(name, *sizes):
+    '''register the decorated function as a case for each size;
+       the function is called as f(size) (or f() without sizes)
+    '''
+    def decorator(func):
+        if not sizes:
+            CASES.append(Case(name, func))
+        for size in sizes:
+            CASES.append(Case(f'{name}/{size}', partial(func, size)))
+        return func
+    return decorator
+
+
+def prime(bits, seed=0):
+    '''deterministic prime of bits bits: the 1st one after a pseudorandom odd number'''
+    p = random.Random(seed).getrandbits(bits) | (1 << (bits - 1)) | 1
+    while not nops.is_prime_mr(p):
+        p += 2
+    return p
+
+
+def rbytes(n, seed=0):
+    '''n deterministic pseudorandom bytes'''
+    return bytes(random.Random(seed).getrandbits(8) for _ in range(n))
+
+
+# sha1 ---------------------------------------------------------------------------
+@case('sha1.sha1', 64, 256, 1024)
+def sha1_sha1(size):
+    msg = nba.NBitArray(rbytes(size))
+    return (lambda: sha1.sha1(msg)), size
+
+@case('sha1.sha1_buffer', 1024, 65536)
+def sha1_sha1_buffer(size):
+    msg = rbytes(size)
+    return (lambda: sha1.sha1(msg)), size
+
+
+@case('sha1.sha1_many', 1000)
+def sha1_sha1_many(size):
+    msgs = [rbytes(20 + n % 181, seed=n) for n in range(size)]         # records of 20-200 bytes
+    return (lambda: sha1.sha1_many(msgs)), sum(len(msg) for msg in msgs)
+
+
+# sha256 -------------------------------------------------------------------------
+@case('sha256.sha256_buffer', 1024, 65536)
+def sha256_sha256_buffer(size):
+    msg = rbytes(size)
+    return (lambda: sha256.sha256(msg)), size
+
+
+# hmac_sha1 ----------------------------------------------------------------------
+@case('hmac_sha1.digest', 64, 1024)
+def hmac_sha1_digest(size):
+    mac, msg = hmac_sha1.hmac_sha1(rbytes(20, seed=1)), rbytes(size)
+    return (lambda: mac.digest(msg)), size
+
+@case('pbkdf2.pbkdf2_sha1/1000')
+def pbkdf2_pbkdf2_sha1():
+    return (lambda: pbkdf2.pbkdf2_sha1(b'password', b'salt', 1000, jobs=1)), 20
+
+
+# merkle -------------------------------------------------------------------------
+@case('merkle.build', 65536)
+def merkle_build(size):
+    data = rbytes(size)
+    return (lambda: merkle.MerkleSHA1(chunk_size=4096).build(data, jobs=1)), size
+
+@case('merkle.update', 65536)
+def merkle_update(size):
+    data = rbytes(size)
+    tree = merkle.MerkleSHA1(chunk_size=4096).build(data, jobs=1)
+    return (lambda: tree.update(data, [3])), 4096
+
+
+# des ----------------------------------------------------------------------------
+DES_KEY = [0xaa, 0xbb, 0x09, 0x18, 0x27, 0x36, 0xcc, 0xdd, ]
+
+@case('des.encrypt')
+def des_encrypt():
+    ptext = list(rbytes(8))
+    return (lambda: des.encrypt(ptext, DES_KEY)), 8
+
+@case('des.decrypt')
+def des_decrypt():
+    ctext = list(rbytes(8))
+    return (lambda: des.encrypt(ctext, DES_KEY, reverse=True)), 8
+
+@case('des.encrypt_block')
+def des_encrypt_block():
+    k = des.Key(DES_KEY)
+    x = int.from_bytes(rbytes(8), 'big')
+    return (lambda: des.encrypt_block(x, k)), 8
+
+@case('des.key_search', 10)
+def des_key_search(size):
+    key = int.from_bytes(bytes(DES_KEY), 'big')
+    x = int.from_bytes(rbytes(8), 'big')
+    y = des.encrypt_block(x, DES_KEY)
+    mask = int('01111111' * 8, 2) & ((1 << (size + size // 7 + 1)) - 1)   # size bits, not parity bits
+    return (lambda: des.key_search(x, y, base=key ^ mask, mask=mask, first=False)), None
+
+@case('des.SBoxes.scrumble')
+def des_scrumble():
+    v = nba.NBitArray(rbytes(6))
+    return (lambda: des.SBoxes.scrumble(v)), 6
+
+
+# hill ---------------------------------------------------------------------------
+HILL_KEY = nm.NMatrix([[17, 17,  5],
+                       [21, 18, 21],
+                       [ 2,  2, 19], ])
+
+def letters(n, seed=0):
+    rnd = random.Random(seed)
+    return ''.join(chr(ord('A') + rnd.randrange(26)) for _ in range(n))
+
+@case('hill.encrypt', 12, 120, 1200)
+def hill_encrypt(size):
+    text = letters(size)
+    return (lambda: hill.encrypt(text, HILL_KEY)), size
+
+@case('hill.decrypt', 12, 120, 1200)
+def hill_decrypt(size):
+    text = letters(size)
+    return (lambda: hill.decrypt(text, HILL_KEY)), size
+
+
+# schoolbook_rsa -----------------------------------------------------------------
+def rsa_keys(prime_len):
+    '''deterministic keys'''
+    return srsa.keys(prime_len=prime_len, p=prime(prime_len), q=prime(prime_len + 8))
+
+@case('schoolbook_rsa.keys', 16, 64, 256)
+def rsa_keygen(size):
+    return (lambda: rsa_keys(size)), None         # primes searched from a fixed seed, as generate_prime_number does from a random one
+
+@case('schoolbook_rsa.encrypt', 64, 256, 1024)
+def rsa_encrypt(size):
+    pub, _ = rsa_keys(size)
+    x = random.Random(size).randrange(pub[0])
+    return (lambda: srsa.encrypt(x, pub)), None
+
+@case('schoolbook_rsa.decrypt', 64, 256, 1024)
+def rsa_decrypt(size):
+    pub, pri = rsa_keys(size)
+    y = srsa.encrypt(random.Random(size).randrange(pub[0]), pub)
+    return (lambda: srsa.decrypt(y, pri)), None
+
+
+# nbitarray ----------------------------------------------------------------------
+def nbitarray(nbits, seed=0):
+    return nba.NBitArray(rbytes(nbits // 8, seed=seed))
+
+@case('NBitArray.init_bytes', 32, 512, 4096)
+def nba_init_bytes(size):
+    data = rbytes(size // 8)
+    return (lambda: nba.NBitArray(data)), size // 8
+
+@case('NBitArray.init_bits', 32, 512, 4096)
+def nba_init_bits(size):
+    bits = nbitarray(size).bit_list()
+    return (lambda: nba.NBitArray(bits)), size // 8
+
+@case('NBitArray.getitem', 32, 512, 4096)
+def nba_getitem(size):
+    ba = nbitarray(size)
+    return (lambda: [ba[ndx] for ndx in range(size)]), size // 8
+
+@case('NBitArray.setitem', 32, 512, 4096)
+def nba_setitem(size):
+    ba = nbitarray(size)
+    def stmt():
+        for ndx in range(size):
+            ba[ndx] = 1
+    return stmt, size // 8
+
+@case('NBitArray.eq', 32, 512, 4096)
+def nba_eq(size):
+    ba, bb = nbitarray(size), nbitarray(size)
+    return (lambda: ba == bb), size // 8
+
+@case('NBitArray.add', 32, 512, 4096)
+def nba_add(size):
+    ba, bb = nbitarray(size), nbitarray(size, seed=1)
+    return (lambda: ba + bb), size // 4
+
+@case('NBitArray.xor', 32, 512, 4096)
+def nba_xor(size):
+    ba, bb = nbitarray(size), nbitarray(size, seed=1)
+    return (lambda: ba ^ bb), size // 8
+
+@case('NBitArray.ixor', 32, 512, 4096)
+def nba_ixor(size):
+    ba, bb = nbitarray(size), nbitarray(size, seed=1)
+    def run():
+        nonlocal ba
+        ba ^= bb
+    return run, size // 8
+
+@case('NBitArray.lshift', 32, 512, 4096)
+def nba_lshift(size):
+    ba = nbitarray(size)
+    return (lambda: ba.__lshift__(5, circular=True)), size // 8
+
+@case('NBitArray.to_int', 32, 512, 4096)
+def nba_to_int(size):
+    ba = nbitarray(size)
+    return (lambda: ba.to_int()), size // 8
+
+@case('NBitArray.permutate', 32, 512, 4096)
+def nba_permutate(size):
+    ba = nbitarray(size)
+    pt = list(range(1, size + 1))
+    random.Random(size).shuffle(pt)
+    return (lambda: ba.permutate(pt)), size // 8
+
+@case('NBitArray.padding', 64, 512, 4096)
+def nba_padding(size):
+    ba = nbitarray(size)
+    return (lambda: ba.padding()), size // 8
+
+@case('NBitArray.break_to_list', 512, 4096)
+def nba_break_to_list(size):
+    ba = nbitarray(size)
+    return (lambda: ba.break_to_list(el=32)), size // 8
+
+
+# nmatrix ------------------------------------------------------------------------
+def matrix(n, mod=26, seed=0):
+    '''deterministic n x n matrix, invertible modulo mod (and so invertible)'''
+    rnd = random.Random(seed)
+    while True:
+        m = nm.NMatrix([[rnd.randrange(mod) for _ in range(n)] for _ in range(n)])
+        if nops.gcd(int(round(m.rdet() if n <= 6 else m.det())) % mod, mod) == 1:
+            return m
+
+@case('NMatrix.mul', 3, 8, 16)
+def nm_mul(size):
+    a, b = matrix(size), matrix(size, seed=1)
+    return (lambda: a * b), None
+
+@case('NMatrix.det', 3, 8, 16)
+def nm_det(size):
+    a = matrix(size)
+    return (lambda: a.det()), None
+
+@case('NMatrix.inv', 3, 8, 16)
+def nm_inv(size):
+    a = matrix(size)
+    return (lambda: a.inv()), None
+
+@case('NMatrix.inv_mod', 3, 6)
+def nm_inv_mod(size):
+    a = matrix(size)
+    return (lambda: a.inv_mod(26)), None
+
+
+# numbers_ops --------------------------------------------------------------------
+@case('numbers_ops.is_prime', 24, 32)
+def nops_is_prime(size):
+    p = prime(size)
+    return (lambda: nops.is_prime(p)), None
+
+@case('numbers_ops.is_prime_mr', 64, 512, 2048)
+def nops_is_prime_mr(size):
+    p = prime(size)
+    return (lambda: nops.is_prime_mr(p, k=16)), None
+
+@case('numbers_ops.primes', 10000, 100000)
+def nops_primes(size):
+    return (lambda: nops.primes(max=size)), None
+
+@case('numbers_ops.generate_prime_number', 64, 256)
+def nops_generate_prime_number(size):
+    return (lambda: nops.generate_prime_number(length=size)), None
+
+@case('numbers_ops.coprimes', 10000, 1000000)
+def nops_coprimes(size):
+    return (lambda: nops.coprimes(size)), None
+
+@case('numbers_ops.factorize', 32, 64)
+def nops_factorize(size):
+    n = prime(size // 2) * prime(size // 2, seed=1)
+    return (lambda: nops.factorize(n)), None
+
+@case('numbers_ops.gcd', 32, 4096)
+def nops_gcd(size):
+    rnd = random.Random(size)
+    a, b = rnd.getrandbits(size), rnd.getrandbits(size)
+    return (lambda: nops.gcd(a, b)), None
+
+@case('numbers_ops.invmod', 32, 4096)
+def nops_invmod(size):
+    rnd = random.Random(size)
+    m = rnd.getrandbits(size) | 1
+    a = 2 ** (size // 2)                                   # invertible: m is odd
+    return (lambda: nops.invmod(a, m)), None
+
+@case('numbers_ops.lcg_fill', 1000, 100000)
+def nops_lcg_fill(size):
+    return (lambda: nops.lcg_fill(size)), None
@@ -0,0 +1,71 @@
+# :filename: naive_cryptology/__init__.py    package entry point
+#
+# use:
+#   import naive_cryptology as nc
+#   nc.sha1(nc.NBitArray(b'abc'))
+#   pub, pri = nc.rsa_keys()
+#
+# names are loaded lazily (PEP 562 module __getattr__): a module of source/
+# is imported only the first time one of its names is used, so importing this
+# package (and running short-lived scripts) stays fast
+
+_LAZY = {                                # name: (module in source/, attribute; None for the module itself)
+    # modules
+    'des':                   ('des', None),
+    'digest_cache':          ('digest_cache', None),
+    'hill':                  ('hill', None),
+    'nbitarray':             ('nbitarray', None),
+    'nmatrix':               ('nmatrix', None),
+    'numbers_ops':           ('numbers_ops', None),
+    'schoolbook_rsa':        ('schoolbook_rsa', None),
+    'sha1sum':               ('sha1sum', None),
+    'merkle':                ('merkle', None),
+    'words':                 ('words', None),
+    # classes
+    'NBitArray':             ('nbitarray', 'NBitArray'),
+    'NMatrix':               ('nmatrix', 'NMatrix'),
+    'MerkleSHA1':            ('merkle', 'MerkleSHA1'),
+    'DigestCache':           ('digest_cache', 'DigestCache'),
+    'Word32':                ('words', 'Word32'),
+    'Word64':                ('words', 'Word64'),
+    # algorithms
+    'sha1':                  ('sha1', 'sha1'),
+    'sha1_files':            ('sha1sum', 'digest_files'),
+    'sha1_many':             ('sha1', 'sha1_many'),
+    'sha256':                ('sha256', 'sha256'),
+    'sha224':                ('sha256', 'sha224'),
+    'hmac_sha1':             ('hmac_sha1', 'hmac_sha1'),
+    'pbkdf2_sha1':           ('pbkdf2', 'pbkdf2_sha1'),
+    'des_encrypt':           ('des', 'encrypt'),
+    'hill_encrypt':          ('hill', 'encrypt'),
+    'hill_decrypt':          ('hill', 'decrypt'),
+    'rsa_keys':              ('schoolbook_rsa', 'keys'),
+    'rsa_encrypt':           ('schoolbook_rsa', 'encrypt'),
+    'rsa_decrypt':           ('schoolbook_rsa', 'decrypt'),
+    # numbers
+    'gcd':                   ('numbers_ops', 'gcd'),
+    'invmod':                ('numbers_ops', 'invmod'),
+    'is_prime_mr':           ('numbers_ops', 'is_prime_mr'),
+    'generate_prime_number': ('numbers_ops', 'generate_prime_number'),
+    'factorize':             ('numbers_ops', 'factorize'),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    '''import the module of name, on first use'''
+    try:
+        module, attribute = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    value = import_module('source.' + module)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value              # next uses don't call __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,11 @@
+# :filename: naive_cryptology/__main__.py    to run the command line interface
+# use: python -m naive_cryptology --help
+
+# import std libs
+import sys
+
+# import project's libs
+from naive_cryptology import cli
+
+if __name__ == '__main__':
+    sys.exit(cli.main())
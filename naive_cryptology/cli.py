@@ -0,0 +1,333 @@
+# :filename: naive_cryptology/cli.py    command line interface, run by "python -m naive_cryptology"
+#
+# use:
+#   python -m naive_cryptology sha1 [FILE ...]                           # "hex  name" lines, as sha1sum
+#   python -m naive_cryptology sha1 -c SUMS [SUMS ...]                   # check files listed in SUMS, as sha1sum -c
+#   python -m naive_cryptology sha1 --cache DB [FILE ...]                # unchanged files aren't read again
+#   python -m naive_cryptology des-enc --key HEX16 [FILE ...] [-o OUT]   # DES, ECB mode, PKCS#7 padding
+#   python -m naive_cryptology des-dec --key HEX16 [FILE ...] [-o OUT]
+#   python -m naive_cryptology hill-enc --key 17,17,5,21,18,21,2,2,19 [FILE ...] [-o OUT]
+#   python -m naive_cryptology hill-dec --key 17,17,5,21,18,21,2,2,19 [FILE ...] [-o OUT]
+#   python -m naive_cryptology rsa-keygen [--bits 64] [-o PREFIX]        # writes PREFIX.pub and PREFIX.pri
+#   python -m naive_cryptology rsa-enc --key PREFIX.pub [FILE ...] [-o OUT]
+#   python -m naive_cryptology rsa-dec --key PREFIX.pri [FILE ...] [-o OUT]
+#
+# common options (after the command):
+#   --chunk-size B   bytes read at a time from stdin, or by ciphers (default 64 KiB);
+#                    sha1 of files maps them, so it doesn't use it
+#   --stats          bytes, seconds and throughput of each file, to stderr
+#   --jobs N         process N files at a time, each one in a worker process
+#
+# sha1 of files (not stdin) runs on sha1sum.digest_files: a bounded queue of
+# files in --jobs processes, lines in order of arguments (or as soon as they
+# are ready, with --unordered). With --cache DB, digests are kept in the sqlite
+# database DB and unchanged files (same size, mtime and inode) aren't read again.
+#
+# input is read by chunks from the files (des maps them by mmap), or from stdin
+# if there are no files (or a file is "-"); output goes to -o OUT, or to stdout, through a buffered
+# writer. With more than one file, the output of FILE is written to
+# FILE + --suffix (default: .des, .hill, .rsa encrypting; .dec decrypting).
+#
+# hill works on letters only: other chars are dropped, letters are made
+# uppercase and the text is padded with X to a multiple of the key size.
+# rsa key files are a line "n,e" (public) or "n,d" (private), in decimal.
+#
+# modules of source/ are imported by the command using them.
+
+
+# import std libs
+import argparse
+import os
+import sys
+import time
+
+CHUNK_SIZE = 1 << 16                     # bytes
+SUFFIXES = {'des-enc': '.des', 'hill-enc': '.hill', 'rsa-enc': '.rsa', }
+STDIN = '-'
+MAPPED = {'des-enc', 'des-dec', }       # commands reading a file path by mmap
+
+
+def hill_stream(fin, fout, key, reverse=False, chunk_size=CHUNK_SIZE, filler='X'):
+    '''hill encrypt (or decrypt) a binary file of ascii text
+
+       params
+         - fin          binary file - text, read chunk_size bytes at a time
+         - fout         binary file - where to write the result, as ascii uppercase letters
+         - key          NMatrix - the key
+         - reverse      bool - if True, then decrypt
+         - filler       str - letter to pad the text to a multiple of the key size
+
+       return number of letters read
+    '''
+    from source import hill
+    func = hill.decrypt if reverse else hill.encrypt
+    size = len(key)
+    total = 0
+    rest = ''
+    chunk = fin.read(chunk_size)
+    while chunk:
+        new = ''.join(c for c in chunk.decode('ascii', errors='ignore').upper() if 'A' <= c <= 'Z')
+        total += len(new)
+        letters = rest + new
+        end = len(letters) - len(letters) % size
+        if end:
+            fout.write(func(letters[:end], key).encode('ascii'))
+        rest = letters[end:]
+        chunk = fin.read(chunk_size)
+    if rest:
+        fout.write(func(rest + filler * (size - len(rest)), key).encode('ascii'))
+    return total
+
+
+def read_rsa_key(path):
+    '''rsa key, as (n, e|d,), from a file of a line "n,e|d"'''
+    with open(path) as f:
+        n, x = (int(item) for item in f.read().split(','))
+    return (n, x,)
+
+
+def write_rsa_key(path, key):
+    with open(path, 'w') as f:
+        f.write(f'{key[0]},{key[1]}\n')
+
+
+def parse_des_key(text):
+    '''des key from 16 hex digits, as list of 8 ints'''
+    key = list(bytes.fromhex(text))
+    if len(key) != 8:
+        raise ValueError('des key must be 16 hex digits')
+    return key
+
+
+def parse_hill_key(text):
+    '''hill key from a comma separated list of n*n ints, as list of rows'''
+    items = [int(item) for item in text.split(',')]
+    size = int(len(items) ** 0.5)
+    if size < 1 or size * size != len(items):
+        raise ValueError('hill key must be n*n comma separated integers')
+    return [items[ndx:ndx + size] for ndx in range(0, len(items), size)]
+
+
+def process(command, key, fin, fout, chunk_size=CHUNK_SIZE):
+    '''run command on binary file fin, writing to binary file fout
+
+       params
+         - command      str - one of the commands, but rsa-keygen
+         - fin          binary file; or a file path, for the commands in MAPPED
+         - key          des key (list), hill key (rows), rsa key (n, x,) or None (sha1)
+
+       return (bytes read, hex digest for sha1 or None,)
+    '''
+    if command == 'sha1':
+        from source import sha1
+        h = sha1.Sha1()
+        chunk = fin.read(chunk_size)
+        while chunk:
+            h.update(chunk)
+            chunk = fin.read(chunk_size)
+        return h.length, h.hexdigest()
+    if command in ('des-enc', 'des-dec'):
+        from source import des
+        stream = des.encrypt_stream if command == 'des-enc' else des.decrypt_stream
+        return stream(fin, fout, des.Key(key), nblocks=max(1, chunk_size // des.BLOCK_SIZE)), None
+    if command in ('hill-enc', 'hill-dec'):
+        from source import nmatrix as nm
+        return hill_stream(fin, fout, nm.NMatrix(key), reverse=(command == 'hill-dec'), chunk_size=chunk_size), None
+    if command in ('rsa-enc', 'rsa-dec'):
+        from source import schoolbook_rsa as srsa
+        stream = srsa.encrypt_stream if command == 'rsa-enc' else srsa.decrypt_stream
+        return stream(fin, fout, key, nblocks=max(1, chunk_size // srsa.cipher_block_size(key[0]))), None
+    raise ValueError(f'unknown command "{command}"')
+
+
+def run_file(command, key, path, out_path, chunk_size=CHUNK_SIZE):
+    '''run command on file path (STDIN for stdin), writing to out_path (None for stdout, or no output)
+
+       return (path, bytes read, seconds, hex digest for sha1 or None,)
+    '''
+    start = time.perf_counter()
+    if path == STDIN:
+        fin = sys.stdin.buffer
+    elif command in MAPPED:
+        fin = path                                     # the command maps it by mmap
+    else:
+        fin = open(path, 'rb')
+    try:
+        if out_path is None:
+            nbytes, digest = process(command, key, fin, sys.stdout.buffer, chunk_size)
+            sys.stdout.buffer.flush()
+        else:
+            with open(out_path, 'wb', buffering=chunk_size) as fout:
+                nbytes, digest = process(command, key, fin, fout, chunk_size)
+    finally:
+        if fin is not sys.stdin.buffer and fin is not path:
+            fin.close()
+    return path, nbytes, time.perf_counter() - start, digest
+
+
+def _run_file(item):
+    '''run_file with a single argument, for Executor.map'''
+    return run_file(*item)
+
+
+def stats_line(path, nbytes, seconds):
+    rate = nbytes / seconds if seconds else float('inf')
+    return f'{"<stdin>" if path == STDIN else path}: {nbytes} bytes in {seconds:.3f} s, {rate / 1024:.1f} KiB/s'
+
+
+def report(results, args):
+    '''print each result (sha1 lines to stdout, stats to stderr) as soon as it is ready; yield it'''
+    out = sys.stdout
+    for path, nbytes, seconds, digest in results:
+        if digest is not None:
+            out.write(f'{digest}  {path}\n')
+            out.flush()
+        if args.stats:
+            print(stats_line(path, nbytes, seconds), file=sys.stderr)
+        yield path, nbytes, seconds, digest
+
+
+def sha1_files(args, prog):
+    '''sha1 command on files, or check (-c) of sha1sum files, by sha1sum
+
+       return exit code: 0 if all files are read (and they match, checking), else 1
+    '''
+    from source import sha1sum
+    start = time.perf_counter()
+    jobs, ordered = args.jobs, not args.unordered
+    cache = None
+    db_errors = ()                                 # errors of the cache database (sqlite3 is imported only with --cache)
+    try:
+        if args.cache:
+            import sqlite3
+            from source import digest_cache
+            db_errors = (sqlite3.Error, )
+            cache = digest_cache.DigestCache(args.cache)
+        failed = unreadable = 0
+        if args.check:
+            def lines():
+                for path in args.files or [STDIN]:
+                    with (open(sys.stdin.fileno(), closefd=False) if path == STDIN else open(path)) as f:
+                        yield from f
+            results = sha1sum.check(lines(), jobs=jobs, ordered=ordered, cache=cache)
+        else:
+            results = sha1sum.digest_files(args.files, jobs=jobs, ordered=ordered, cache=cache)
+        nbytes = 0
+        hits = 0 if cache is None else cache.hits
+        for path, result in results:
+            hit = cache is not None and cache.hits > hits     # the file wasn't read
+            hits = hits if cache is None else cache.hits
+            if result is None:
+                unreadable += 1
+                print(f'{prog}: {path}: cannot read', file=sys.stderr)
+                if args.check:
+                    print(f'{path}: FAILED open or read')
+                continue
+            if not hit:
+                try:
+                    nbytes += os.path.getsize(path)
+                except OSError:                    # removed (or replaced) after it was hashed
+                    pass
+            if args.check:
+                failed += not result
+                print(f'{path}: {"OK" if result else "FAILED"}')
+            else:
+                print(sha1sum.format_line(path, result))
+            sys.stdout.flush()
+        if unreadable:
+            print(f'{prog}: WARNING: {unreadable} listed file(s) could not be read', file=sys.stderr)
+        if failed:
+            print(f'{prog}: WARNING: {failed} computed checksum(s) did NOT match', file=sys.stderr)
+        if args.stats:
+            print(stats_line('total', nbytes, time.perf_counter() - start), file=sys.stderr)
+            if cache is not None:
+                print(f'cache: {cache.report()}', file=sys.stderr)
+        return 1 if failed or unreadable else 0
+    except db_errors as e:
+        print(f'{prog}: error: {args.cache}: {e}', file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='python -m naive_cryptology',
+                                     description='naive cryptology: hash, encrypt and decrypt files')
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='bytes read at a time from stdin, or by ciphers')
+    common.add_argument('--stats', action='store_true', help='print bytes, seconds and throughput to stderr')
+    common.add_argument('--jobs', type=int, default=1, help='n.of files processed at a time, in worker processes')
+    files = argparse.ArgumentParser(add_help=False, parents=[common])
+    files.add_argument('files', nargs='*', help='input files (stdin if none, or "-")')
+    output = argparse.ArgumentParser(add_help=False, parents=[files])
+    output.add_argument('-o', '--output', help='output file for a single input (stdout if omitted)')
+    output.add_argument('--suffix', help='with more than one input, output of FILE goes to FILE + suffix')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    sub = commands.add_parser('sha1', parents=[files], help='sha-1 of files, as sha1sum')
+    sub.add_argument('-c', '--check', action='store_true', help='read sha1 sums from files and check them')
+    sub.add_argument('--unordered', action='store_true', help='print results as soon as they are ready')
+    sub.add_argument('--cache', metavar='DB', help='sqlite database of digests of unchanged files')
+    for name, what in (('des-enc', 'DES encrypt'), ('des-dec', 'DES decrypt'), ):
+        sub = commands.add_parser(name, parents=[output], help=f'{what}, ECB mode, PKCS#7 padding')
+        sub.add_argument('--key', required=True, type=parse_des_key, help='16 hex digits')
+    for name, what in (('hill-enc', 'hill encrypt'), ('hill-dec', 'hill decrypt'), ):
+        sub = commands.add_parser(name, parents=[output], help=f'{what} letters of text')
+        sub.add_argument('--key', required=True, type=parse_hill_key, help='n*n comma separated integers, by rows')
+    sub = commands.add_parser('rsa-keygen', parents=[common], help='write PREFIX.pub and PREFIX.pri')
+    sub.add_argument('--bits', type=int, default=64, help='bits of each prime')
+    sub.add_argument('-o', '--output', default='rsa', help='prefix of key files')
+    for name, what in (('rsa-enc', 'RSA encrypt (public key)'), ('rsa-dec', 'RSA decrypt (private key)'), ):
+        sub = commands.add_parser(name, parents=[output], help=what)
+        sub.add_argument('--key', required=True, type=read_rsa_key, help='key file, as made by rsa-keygen')
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    if args.chunk_size < 1 or args.jobs < 1:
+        parser.error('--chunk-size and --jobs must be positive')
+    try:
+        if args.command == 'rsa-keygen':
+            from source import schoolbook_rsa as srsa
+            pub, pri = srsa.keys(prime_len=args.bits)
+            write_rsa_key(args.output + '.pub', pub)
+            write_rsa_key(args.output + '.pri', pri)
+            if args.stats:
+                print(f'{args.output}.pub, {args.output}.pri: n of {pub[0].bit_length()} bits '
+                      f'in {time.perf_counter() - start:.3f} s', file=sys.stderr)
+            return 0
+
+        paths = args.files or [STDIN]
+        if args.command == 'sha1' and (args.check or STDIN not in paths):
+            return sha1_files(args, parser.prog)
+        if args.command == 'sha1':
+            outputs = [None] * len(paths)
+        elif len(paths) == 1:
+            outputs = [args.output]
+        else:
+            if args.output:
+                parser.error('-o/--output needs a single input, use --suffix')
+            if STDIN in paths:
+                parser.error('stdin ("-") can be the only input')
+            suffix = args.suffix or SUFFIXES.get(args.command, '.dec')
+            outputs = [path + suffix for path in paths]
+        items = [(args.command, getattr(args, 'key', None), path, out, args.chunk_size)
+                 for path, out in zip(paths, outputs)]
+
+        if args.jobs > 1 and len(items) > 1 and STDIN not in paths:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+                results = list(report(executor.map(_run_file, items), args))
+        else:
+            results = list(report(map(_run_file, items), args))
+        if args.stats and len(results) > 1:
+            nbytes = sum(r[1] for r in results)
+            print(stats_line('total', nbytes, time.perf_counter() - start), file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f'{parser.prog}: error: {e}', file=sys.stderr)
+        return 1
+    return 0
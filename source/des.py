@@ -84,15 +84,48 @@
 # the previously cited docs
 #
 # this module uses the auxiliary module nbitarray.py: a naive approach to array of bits
+#
+# profiling: to get cumulative timings (ns) and calls of each stage of encrypt
+#
+#   with des.Profiler() as prof:
+#       des.encrypt(ptext, key)
+#   print(prof.report())
+#
+# stages are: ip (initial permutation), key_schedule, expansion, xor, sbox, pbox (straight), fp (final permutation)
+# when no profiler is active, stages only test the module global _profiler
+#
+# bulk operations, in ECB mode (each block of 8 bytes is encrypted by itself):
+#     - encrypt_bytes / decrypt_bytes     byte strings
+#     - encrypt_stream / decrypt_stream   binary files, read in chunks; or file paths and bytes-like
+#                                         (mmap, memoryview, ...), read a block at a time without copies
+# plaintext is padded as PKCS#7: n bytes of value n, 1 <= n <= 8, to a multiple of 8 bytes;
+# the key schedule is computed once, passing a Key instance to encrypt
+#
+# int core: encrypt_int, key_schedule_int do the same of encrypt, Key on python
+# ints, by lookup tables; the bulk operations use them (by encrypt_block).
+#
+# key search, known a plaintext block and its ciphertext:
+#
+#   des.key_search(ptext, ctext, base=known_key, mask=unknown_bits, jobs=4, progress=des.print_progress)
+#   des.key_search(ptext, ctext, candidates=iterable_of_keys)
+
 
+# import std libs
+#   concurrent.futures is imported where it is used: importing this module stays light
+import io
+from itertools import islice
+from time import perf_counter, perf_counter_ns
 
 # import user libs
-try:
+if __package__:                          # imported as a module of package "source"
+    from . import nbitarray as nba
+    from .words import Word32, Word48, Word56, Word64
+else:                                    # run as script, or imported from its directory
     import nbitarray as nba
-except:
-    import source.nbitarray as nba
+    from words import Word32, Word48, Word56, Word64
 
 N_ROUNDS = 16
+BLOCK_SIZE = 8                # bytes
 
 START_PT = [58, 50, 42, 34, 26, 18, 10,  2,     # initial permutation table
             60, 52, 44, 36, 28, 20, 12,  4,
@@ -183,14 +216,80 @@ KEY_COMPRESSION = [14, 17, 11, 24,  1,  5,  3, 28,
                    51, 45, 33, 48, 44, 49, 39, 56,
                    34, 53, 46, 42, 50, 36, 29, 32, ]
 
+_profiler = None              # the active Profiler, if any
+
+
+class Profiler(object):
+    '''cumulative timings of DES stages, as context manager
+    
+       instance data:
+         - ns         dict - {stage: cumulative nanoseconds}
+         - calls      dict - {stage: n.of calls}
+       
+       note. while active (inside "with"), encrypt, round_txt and des_function
+             record each stage by "record"; profilers can be nested, the
+             previous one is restored on exit
+    '''
+    STAGES = ('ip', 'key_schedule', 'expansion', 'xor', 'sbox', 'pbox', 'fp', )
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        '''zero all timings and calls'''
+        self.ns    = dict.fromkeys(self.STAGES, 0)
+        self.calls = dict.fromkeys(self.STAGES, 0)
+    
+    def record(self, stage, start):
+        '''add to stage the time elapsed from start (as perf_counter_ns)
+        
+           return now, as perf_counter_ns, to be the start of the next stage
+        '''
+        now = perf_counter_ns()
+        self.ns[stage] += now - start
+        self.calls[stage] += 1
+        return now
+    
+    def report(self):
+        '''timings as a table: one row for each stage'''
+        total = sum(self.ns.values()) or 1
+        rows = [f'{"stage":<14}{"calls":>10}{"total ms":>12}{"ns/call":>12}{"%":>8}']
+        for stage in self.STAGES:
+            ns, calls = self.ns[stage], self.calls[stage]
+            rows.append(f'{stage:<14}{calls:>10}{ns / 1e6:>12.3f}{ns // calls if calls else 0:>12}{100 * ns / total:>8.1f}')
+        return '\n'.join(rows)
+    
+    def __enter__(self):
+        global _profiler
+        self._previous = _profiler
+        _profiler = self
+        return self
+    
+    def __exit__(self, *exc_info):
+        global _profiler
+        _profiler = self._previous
+        return False
+
+
+def _flat_sbox(sbox):
+    '''an S-box (4 rows x 16 columns) as a table of 64 entries, indexed by
+       the 6 bits input value rccccr: row is "rr", column is "cccc"
+    '''
+    return tuple(sbox[((v >> 4) & 2) | (v & 1)][(v >> 1) & 0xf] for v in range(64))
+
+
 class SBoxes(object):
     '''S-Boxes operation.
     
        note. we don't need to instantiate an S-Box.
-             the only useful operation is the class
-             method SBoxes.scrumble(txt48)
+             the only useful operations are the class
+             methods SBoxes.scrumble(txt48), on NBitArray,
+             and SBoxes.scrumble_int(x48), on int
+       note. _tables has, for each S-box, its 64 entries indexed by the 6 bits
+             input, so an S-box is a single lookup
     '''
     _sboxes = SBOXES
+    _tables = tuple(_flat_sbox(sbox) for sbox in SBOXES)
     
     @classmethod
     def _indices(cls, snum, v):
@@ -228,6 +327,21 @@ class SBoxes(object):
         ncol = int( "".join([str(item) for item in ncol]), 2)
         return (nrow, ncol,)
     
+    @classmethod
+    def scrumble_int(cls, x):
+        '''text input to sboxes, as int
+        
+           params
+             - x         int - 48 bit text to scrumble
+           
+           return scrumbled text as int (32 bits)
+        '''
+        t = cls._tables
+        return ((t[0][(x >> 42) & 0x3f] << 28) | (t[1][(x >> 36) & 0x3f] << 24) |
+                (t[2][(x >> 30) & 0x3f] << 20) | (t[3][(x >> 24) & 0x3f] << 16) |
+                (t[4][(x >> 18) & 0x3f] << 12) | (t[5][(x >> 12) & 0x3f] <<  8) |
+                (t[6][(x >>  6) & 0x3f] <<  4) |  t[7][ x        & 0x3f])
+    
     @classmethod
     def scrumble(cls, v):
         '''text input to sboxes
@@ -237,13 +351,9 @@ class SBoxes(object):
            
            return scrumbled text as NBitArray (32 bits)
         '''
-        txt32 = nba.NBitArray([0,] * (4 * 8))  # 4*8 == 32 bits, all 0s
-        step_size = 4                          # a nibble at time
-        for num in range(1, 9):                # sbox number: 1 to 8, indices will be 0-7
-            r, c = cls._indices(num, v)
-            txt4 = cls._sboxes[num-1][r][c]
-            txt32.set_byte(txt4, bit_ndx=(num-1)*step_size, length=step_size)
-        return txt32
+        if len(v) != 48:
+            raise TypeError("value doesn't have 48 bits size")
+        return nba.NBitArray(nba.int_to_bit_list(cls.scrumble_int(v.to_int()), length=32))
 
     
 class Key(object):
@@ -259,30 +369,48 @@ class Key(object):
     def key_core(self):
         return self._key64.permutate(type(self)._drop_parity_bit)
     
+    @property
+    def keys_int(self):
+        '''the 16 keys of 48 bit of rounds, as ints (computed on first use)'''
+        if self._keys_int is None:
+            self._keys_int = key_schedule_int(self._key64.to_int())
+        return self._keys_int
+    
+    @property
+    def keys_int_reversed(self):
+        '''keys_int in reverse order, to decrypt (computed on first use)'''
+        if self._keys_int_reversed is None:
+            self._keys_int_reversed = self.keys_int[::-1]
+        return self._keys_int_reversed
+    
     def __init__(self, key):
         self._key64  = nba.NBitArray(key)
         self._keys48 = self.calculate_keys()
+        self._keys_int = None
+        self._keys_int_reversed = None
         self._curr = -1
         
     def calculate_keys(self):
-        '''calculate all 16 keys of 48 bits to use during rounds'''
-        try:
-            key56 = self.key_core     # drop parity bits and permutate
-        except:
+        '''calculate all 16 keys of 48 bits to use during rounds
+        
+           note. halves are 28 bits registers (words.Word28), permutations
+                 use the byte-wise tables of the int core
+        '''
+        if len(self._key64) != 64:
             raise ValueError('cannot calculate keys')
+        t = _int_tables()
+        key56 = Word56(_permute(self._key64.to_int(), t['pc1'], 64))    # drop parity bits and permutate
         result = []
-        left  = key56[:len(key56)//2]
-        right = key56[len(key56)//2:]
+        left, right = key56.split()
         for n in range(1, 17):          # rem.round is from 1 to 16 included
             if n in type(self)._one_key_shifting:
-                left  = left.__lshift__(1, circular=True)
-                right = right.__lshift__(1, circular=True)
+                left  = left.rotl(1)
+                right = right.rotl(1)
             else:
-                left  = left.__lshift__(2, circular=True)
-                right = right.__lshift__(2, circular=True)
-            tmp56 = left + right
-            key48 = tmp56.permutate(type(self)._key_compression)
-            result.append(key48)
+                left  = left.rotl(2)
+                right = right.rotl(2)
+            key48 = _permute(left.concat(right), t['pc2'], 56)
+            result.append(nba.NBitArray.from_int(key48, 48))
         return result
     
     def __getitem__(self, num):
@@ -307,21 +435,28 @@ def encrypt(ptext, key, reverse=False, verbose=False):
     
        params
          - ptext      list of hex - 64 bit plain text
-         - key        list of hex - 64 bit == 56 bit cipher key + 8 parity bits
+         - key        list of hex - 64 bit == 56 bit cipher key + 8 parity bits;
+                        or a Key instance, to reuse its round keys
          - reverse    bool - if True, then decrypt; if False it encrypts
          - verbose    bool - if True prints intermediate results
        
        return ctext   NBitArray - 64 bit ciphertext
     '''
+    prof = _profiler
     nbptext = nba.NBitArray(ptext)            # nbptext: plain text as NBitArray instance
-    k   = Key(key)                            # key as instance of Key
+    if prof: t = perf_counter_ns()
+    k   = key if isinstance(key, Key) else Key(key)   # key as instance of Key
+    if prof: prof.record('key_schedule', t)
     if verbose:
         print('plaintext: {}'.format(nbptext.hex()))
         print('key:       {}'.format(k.key.hex()))
     if len(nbptext) != 64 or len(k.key) != 64:
         raise ValueError('wrong length of plaintext or key')
         
-    txt = pbox(nbptext, astype='start', verbose=verbose)           # txt: working copy of NBitArray
+    if prof: t = perf_counter_ns()
+    txt = pbox(nbptext, astype='start', verbose=verbose)
+    txt = Word64(txt.to_int())                      # txt: working copy as Word64
+    if prof: prof.record('ip', t)
     if verbose:
         print("round\ttxt\t\t\tkey48")
         
@@ -333,11 +468,14 @@ def encrypt(ptext, key, reverse=False, verbose=False):
         txt = round_txt(txt, k[kndx], r, verbose=verbose)
         
     # straightening last round
-    txt = txt.swap_lr()
+    left, right = txt.split()
+    txt = nba.NBitArray.from_int(right.concat(left), 64)
     if verbose:
         print('after straightening: {}'.format(txt.hex()))
         
+    if prof: t = perf_counter_ns()
     ctext = pbox(txt, astype='stop', verbose=verbose)              # ctext: ciphertext as NBitArray
+    if prof: prof.record('fp', t)
     
     return ctext
     
@@ -360,41 +498,532 @@ def pbox(txt, astype='start', verbose=False):
 def round_txt(txt, key, round, verbose=False):
     '''
        params
-         - txt         NBitArray - input text
-         - key         NBitArray - cryptographic key
+         - txt         NBitArray | Word64 - input text
+         - key         NBitArray | Word48 - cryptographic key
          
-       returns an NBitArray
+       returns a Word64 if txt is a Word64, otherwise an NBitArray
+       
+       note. halves are Word32 (see words.py), whatever the type of txt
     '''
     if len(txt) != 64 or len(key) != 48:
         raise ValueError('wrong length of text or key, round {}'.format(round))
-    left  = txt[:len(txt)//2]                  # left input
-    right = txt[len(txt)//2:]                   # right input
+    left, right = Word64(txt.to_int()).split()    # left and right input
     
     # mixer
-    other_right = des_function(right, key)
+    other_right = _des_function(right, Word48(key.to_int()))
+    prof = _profiler
+    if prof: t = perf_counter_ns()
     left = left ^ other_right
+    if prof: prof.record('xor', t)
     
     # swapper: left part to right and viceversa
-    result = right + left
+    result = right.concat(left)
     if verbose:
         print('{}\t{} {}\t{}'.format(round, right.hex(), left.hex(), key.hex()))
 
-    return result
+    return result if isinstance(txt, Word64) else nba.NBitArray.from_int(result, 64)
 
 def des_function(txt, key):
     '''
        params
-         - txt       NBitArray - input text
+         - txt       NBitArray | Word32 - input text
+         - key       NBitArray | Word48 - cryptographic key
+       
+       returns a Word32 if txt is a Word32, otherwise an NBitArray
+    '''
+    result = _des_function(Word32(txt.to_int()), Word48(key.to_int()))
+    return result if isinstance(txt, Word32) else nba.NBitArray.from_int(result, 32)
+
+def _des_function(txt, key):
+    '''des_function on words: txt Word32, key Word48; return a Word32
+    
+       note. permutations use the byte-wise tables of the int core
     '''
-    txt48 = txt.permutate(EXPANSION_DBOX)       # expansion D-box
+    prof = _profiler
+    if prof: t = perf_counter_ns()
+    tables = _int_tables()
+    
+    txt48 = Word48(_permute(txt, tables['e'], 32))    # expansion D-box
+    if prof: t = prof.record('expansion', t)
     
     txt48 = txt48 ^ key                         # XOR with key
+    if prof: t = prof.record('xor', t)
     
-    txt32 = SBoxes.scrumble(txt48)              # S-Boxes
+    txt32 = Word32(SBoxes.scrumble_int(txt48))  # S-Boxes
+    if prof: t = prof.record('sbox', t)
     
-    txt32 = txt32.permutate(STRAIGHT_DBOX)      # straight permutation
+    txt32 = Word32(_permute(txt32, tables['p'], 32))  # straight permutation
+    if prof: prof.record('pbox', t)
     return txt32
 
+# int core ------------------------------------------------------------------------
+# the same algorithm of encrypt, on python ints: a permutation is a few lookups
+# in byte-wise tables (the output bits of each byte of input, see _perm_tables)
+# and S-boxes are merged with the straight P-box (_sp_tables). Tables are
+# built on first use, by _int_tables
+
+M28 = (1 << 28) - 1
+M32 = (1 << 32) - 1
+PARITY_BITS = 0x0101010101010101                # parity bits of a 64 bit key, ignored by DES
+
+_tables = None                                  # tables of the int core, see _int_tables
+
+
+def _perm_tables(pt, nin):
+    '''byte-wise lookup tables of permutation table pt, on an input of nin bits
+    
+       return a tuple of nin // 8 tuples of 256 ints: element [i][b] is the
+              output when the i-th byte (left to right) of input is b, and the
+              other bits are 0s. So a permutation is the "or" of nin // 8 lookups
+    '''
+    nout = len(pt)
+    tables = []
+    for i in range(nin // 8):
+        single = [0] * 8                        # output of each bit of the byte, right to left
+        for target_ndx, source in enumerate(pt):
+            source_ndx = source - 1             # 0-based, left to right
+            if source_ndx // 8 == i:
+                single[7 - source_ndx % 8] |= 1 << (nout - 1 - target_ndx)
+        row = [0] * 256
+        for b in range(1, 256):
+            low = b & -b
+            row[b] = row[b ^ low] | single[low.bit_length() - 1]
+        tables.append(tuple(row))
+    return tuple(tables)
+
+
+def _permute(x, tables, nin):
+    '''permutation of the nin bits int x by byte-wise tables (see _perm_tables)'''
+    y = 0
+    for t in tables:
+        nin -= 8
+        y |= t[(x >> nin) & 0xff]
+    return y
+
+
+def _sp_tables(p_tables):
+    '''S-boxes and straight P-box merged: element [s][v] is the straight
+       permutation of the output of S-box s+1 for the 6 bit input v
+    '''
+    return tuple(tuple(_permute(SBoxes._tables[s][v] << (28 - 4 * s), p_tables, 32) for v in range(64))
+                 for s in range(8))
+
+
+def _int_tables():
+    '''tables of the int core, built on first use'''
+    global _tables
+    if _tables is None:
+        _tables = {'ip':  _perm_tables(START_PT, 64),
+                   'fp':  _perm_tables(STOP_PT, 64),
+                   'e':   _perm_tables(EXPANSION_DBOX, 32),
+                   'pc1': _perm_tables(DROP_PARITY_BIT, 64),
+                   'pc2': _perm_tables(KEY_COMPRESSION, 56),
+                   'p':   _perm_tables(STRAIGHT_DBOX, 32), }
+        _tables['sp'] = _sp_tables(_tables['p'])
+    return _tables
+
+
+def key_schedule_int(key):
+    '''the 16 keys of 48 bit of rounds, as Key.calculate_keys
+    
+       params
+         - key      int - 64 bit key (56 bit + 8 parity bits)
+       
+       return list of 16 ints
+    '''
+    t = _int_tables()
+    cd = _permute(key, t['pc1'], 64)            # 56 bits: drop parity bits and permutate
+    c, d = cd >> 28, cd & M28
+    result = []
+    for n in range(1, N_ROUNDS + 1):
+        shift = 1 if n in Key._one_key_shifting else 2
+        c = ((c << shift) | (c >> (28 - shift))) & M28
+        d = ((d << shift) | (d >> (28 - shift))) & M28
+        result.append(_permute((c << 28) | d, t['pc2'], 56))
+    return result
+
+
+def _feistel(l, r, keys, t):
+    '''rounds of DES on halves l, r (32 bit ints), one for each key of keys
+    
+       return (l, r,) after the last round (not swapped)
+    '''
+    e0, e1, e2, e3 = t['e']
+    s0, s1, s2, s3, s4, s5, s6, s7 = t['sp']
+    for k in keys:
+        x = (e0[r >> 24] | e1[(r >> 16) & 0xff] | e2[(r >> 8) & 0xff] | e3[r & 0xff]) ^ k
+        l, r = r, l ^ (s0[x >> 42] | s1[(x >> 36) & 0x3f] | s2[(x >> 30) & 0x3f] | s3[(x >> 24) & 0x3f] |
+                       s4[(x >> 18) & 0x3f] | s5[(x >> 12) & 0x3f] | s6[(x >> 6) & 0x3f] | s7[x & 0x3f])
+    return l, r
+
+
+def encrypt_int(x, keys):
+    '''DES encryption of a block, on ints
+    
+       params
+         - x          int - 64 bit plain text
+         - keys       list of 16 int - keys of rounds, as key_schedule_int; reversed to decrypt
+       
+       return 64 bit ciphertext as int
+    '''
+    t = _int_tables()
+    x = _permute(x, t['ip'], 64)
+    l, r = _feistel(x >> 32, x & M32, keys, t)
+    return _permute((r << 32) | l, t['fp'], 64)
+
+
+def pad(data, size=BLOCK_SIZE):
+    '''PKCS#7 padding of data to a multiple of size bytes'''
+    n = size - len(data) % size
+    return data + bytes([n]) * n
+
+
+def unpad(data, size=BLOCK_SIZE):
+    '''remove PKCS#7 padding'''
+    n = data[-1] if data else 0
+    if not 1 <= n <= size or data[-n:] != bytes([n]) * n:
+        raise ValueError("wrong padding")
+    return data[:-n]
+
+
+def encrypt_block(x, key, reverse=False):
+    '''DES encryption/decryption of a block as int, by the int core
+    
+       params
+         - x          int - 64 bit plain text
+         - key        list of hex | Key - cipher key
+         - reverse    bool - if True, then decrypt
+       
+       return 64 bit ciphertext as int
+    '''
+    k = key if isinstance(key, Key) else Key(key)
+    return encrypt_int(x, k.keys_int_reversed if reverse else k.keys_int)
+
+
+def encrypt_blocks(data, key, reverse=False):
+    '''encrypt (or decrypt) data, in ECB mode, without padding
+    
+       params
+         - data       bytes-like - its length is a multiple of BLOCK_SIZE
+         - key        list of hex | Key - cipher key
+         - reverse    bool - if True, then decrypt
+       
+       return bytes
+       
+       note. blocks are read by int.from_bytes straight from data, without copying it
+    '''
+    k = key if isinstance(key, Key) else Key(key)
+    result = bytearray()
+    with memoryview(data) as raw, raw.cast('B') as view:
+        if len(view) % BLOCK_SIZE:
+            raise ValueError(f'data length is not a multiple of {BLOCK_SIZE}')
+        for ndx in range(0, len(view), BLOCK_SIZE):
+            x = int.from_bytes(view[ndx:ndx + BLOCK_SIZE], 'big')
+            result += encrypt_block(x, k, reverse=reverse).to_bytes(BLOCK_SIZE, 'big')
+    return bytes(result)
+
+
+def encrypt_bytes(data, key):
+    '''encrypt data (bytes-like or file path), in ECB mode, padded as PKCS#7'''
+    fout = io.BytesIO()
+    encrypt_stream(data, fout, key)
+    return fout.getvalue()
+
+
+def decrypt_bytes(data, key):
+    '''decrypt data (bytes-like or file path), in ECB mode, removing PKCS#7 padding'''
+    fout = io.BytesIO()
+    decrypt_stream(data, fout, key)
+    return fout.getvalue()
+
+
+def _crypt_buffer(buf, fout, k, reverse, nblocks):
+    '''encrypt_stream / decrypt_stream of an nba.Buffer: blocks are read
+       straight from its view, releasing (mapped) pages already used
+    '''
+    view = buf.view
+    size = len(view)
+    full = size - size % BLOCK_SIZE
+    if reverse and (size % BLOCK_SIZE or not size):
+        raise ValueError(f'ciphertext length is not a positive multiple of {BLOCK_SIZE}')
+    end = full - BLOCK_SIZE if reverse else full       # decrypting, the last block is held back to remove padding
+    step = BLOCK_SIZE * nblocks
+    for start in range(0, end, step):
+        stop = min(start + step, end)
+        fout.write(encrypt_blocks(view[start:stop], k, reverse=reverse))
+        buf.release(start, stop)
+    if reverse:
+        last = unpad(encrypt_blocks(view[end:], k, reverse=True))
+        fout.write(last)
+        return end + len(last)
+    fout.write(encrypt_blocks(pad(view[full:].tobytes()), k))
+    return size
+
+
+def read_exactly(fin, size):
+    '''read size bytes from a binary file, less only at end of file
+    
+       rem. a raw file, a pipe or a socket can return less bytes than asked for:
+            a chunk must be a whole number of blocks
+    '''
+    chunk = fin.read(size)
+    if not chunk or len(chunk) == size:
+        return chunk
+    chunks = [chunk]
+    size -= len(chunk)
+    while size > 0:
+        chunk = fin.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def encrypt_stream(fin, fout, key, nblocks=1024):
+    '''encrypt a binary file, in ECB mode, padded as PKCS#7
+    
+       params
+         - fin        binary file - plaintext, read nblocks blocks at a time; or
+                      str | os.PathLike - path of the plaintext file (it is mapped in memory); or
+                      bytes-like - bytes, mmap.mmap, memoryview, ... of plaintext
+         - fout       binary file - where to write ciphertext
+         - key        list of hex | Key - cipher key
+         - nblocks    int - blocks to read (or encrypt) at a time
+       
+       return number of plaintext bytes read
+    '''
+    k = key if isinstance(key, Key) else Key(key)
+    if nba.Buffer.accepts(fin):
+        with nba.Buffer(fin) as buf:
+            return _crypt_buffer(buf, fout, k, False, nblocks)
+    total = 0
+    chunk = read_exactly(fin, BLOCK_SIZE * nblocks)
+    while True:
+        nxt = read_exactly(fin, BLOCK_SIZE * nblocks)
+        total += len(chunk)
+        if not nxt:                             # last chunk: pad it
+            chunk = pad(chunk)
+        fout.write(encrypt_blocks(chunk, k))
+        if not nxt:
+            return total
+        chunk = nxt
+
+
+def decrypt_stream(fin, fout, key, nblocks=1024):
+    '''decrypt a binary file, in ECB mode, removing PKCS#7 padding
+    
+       params
+         - fin        binary file - ciphertext, read nblocks blocks at a time; or
+                      a path or a bytes-like, as encrypt_stream
+         - fout       binary file - where to write plaintext
+         - key        list of hex | Key - cipher key
+         - nblocks    int - blocks to read (or decrypt) at a time
+       
+       return number of plaintext bytes written
+    '''
+    k = key if isinstance(key, Key) else Key(key)
+    if nba.Buffer.accepts(fin):
+        with nba.Buffer(fin) as buf:
+            return _crypt_buffer(buf, fout, k, True, nblocks)
+    total = 0
+    chunk = read_exactly(fin, BLOCK_SIZE * nblocks)
+    if not chunk:
+        raise ValueError("empty ciphertext")
+    while True:
+        nxt = read_exactly(fin, BLOCK_SIZE * nblocks)
+        ptext = encrypt_blocks(chunk, k, reverse=True)
+        if not nxt:                             # last chunk: remove padding
+            ptext = unpad(ptext)
+        fout.write(ptext)
+        total += len(ptext)
+        if not nxt:
+            return total
+        chunk = nxt
+
+
+def _as_int64(x):
+    '''64 bit block or key as int, from int, bytes-like or list of 8 ints'''
+    if isinstance(x, int):
+        return x
+    data = bytes(x)
+    if len(data) != BLOCK_SIZE:
+        raise ValueError(f'a block or a key must have {BLOCK_SIZE} bytes')
+    return int.from_bytes(data, 'big')
+
+
+def _search_gray(l0, r0, target_l, target_r, key, free_bits, partial, first):
+    '''search keys key ^ (any combination of free_bits), in gray code order:
+       each candidate differs from the previous one by a single bit, so its
+       round keys are the previous ones xor the contributions of that bit
+    
+       return (list of keys found, n.of candidates tested,)
+    '''
+    t = _int_tables()
+    keys = key_schedule_int(key)
+    last = keys.pop()                                                  # key of round 16, apart for partial
+    contributions = [key_schedule_int(1 << bit) for bit in free_bits]   # schedule is linear: a bit selection
+    found = []
+    count = 1 << len(free_bits)
+    for i in range(count):
+        if i:
+            ndx = (i & -i).bit_length() - 1     # the bit changing from gray(i-1) to gray(i)
+            key ^= 1 << free_bits[ndx]
+            c = contributions[ndx]
+            keys = [k ^ ck for k, ck in zip(keys, c)]
+            last ^= c[N_ROUNDS-1]
+        l, r = _feistel(l0, r0, keys, t)        # 15 rounds: r is R15, it must be L16
+        if partial and r != target_l:
+            continue
+        l, r = _feistel(l, r, (last,), t)
+        if r == target_r and l == target_l:     # (r << 32) | l is IP(ciphertext) before the final permutation
+            found.append(key)
+            if first:
+                return found, i + 1
+    return found, count
+
+
+def _search_list(l0, r0, target_l, target_r, keys, partial, first):
+    '''search a list of keys, computing the schedule of each one
+    
+       return (list of keys found, n.of candidates tested,)
+    '''
+    t = _int_tables()
+    found = []
+    for n, key in enumerate(keys, 1):
+        rkeys = key_schedule_int(key)
+        last = rkeys.pop()
+        l, r = _feistel(l0, r0, rkeys, t)
+        if partial and r != target_l:
+            continue
+        l, r = _feistel(l, r, (last,), t)
+        if r == target_r and l == target_l:
+            found.append(key)
+            if first:
+                return found, n
+    return found, len(keys)
+
+
+def _unordered_map(executor, func, items, max_inflight):
+    '''as executor.map, but results are yielded as soon as they are ready and
+       at most max_inflight items are submitted and not yet yielded
+       
+       return a (python) GENERATOR of results; closing it cancels what isn't started
+    '''
+    from concurrent.futures import wait, FIRST_COMPLETED
+    items = iter(items)
+    inflight = set()
+    try:
+        for item in islice(items, max_inflight):
+            inflight.add(executor.submit(func, item))
+        while inflight:
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for item in islice(items, 1):
+                    inflight.add(executor.submit(func, item))
+                yield future.result()
+    finally:
+        for future in inflight:
+            future.cancel()
+
+
+def _search_task(task):
+    '''run a task of key_search: (function, args,)'''
+    func, args = task
+    return func(*args)
+
+
+def print_progress(tested, total, seconds):
+    '''a progress callable for key_search: tested keys and rate, on stderr'''
+    import sys
+    rate = tested / seconds if seconds else 0.0
+    done = f'{tested}/{total} ({100 * tested / total:.1f}%)' if total else f'{tested}'
+    print(f'\rkeys tested: {done}, {rate:,.0f} keys/s', end='', file=sys.stderr, flush=True)
+
+
+def key_search(ptext, ctext, base=0, mask=None, candidates=None, partial=True, first=True,
+               jobs=1, chunksize=4096, progress=None):
+    '''search the keys encrypting plaintext ptext to ciphertext ctext
+    
+       params
+         - ptext, ctext  int | bytes-like | list of 8 ints - known plaintext and ciphertext blocks
+         - base          int | bytes-like | list of 8 ints - known bits of key
+         - mask          int - 1s on unknown bits of key (64 bits, the left bit is the 1st of key);
+                           the candidates are base with any value of these bits
+         - candidates    iterable of keys (as base) - keys to try, if mask is None
+         - partial       bool - if True, a candidate is dropped after round 15, if it
+                           doesn't give the 1st half of the output
+         - first         bool - if True, stop at the 1st key found
+         - jobs          int - n.of worker processes (1: no pool)
+         - chunksize     int - candidates of each task
+         - progress      callable - if not None, it is called after each task as
+                           progress(tested, total, seconds); total is None for candidates
+                           (see print_progress)
+       
+       return list of keys found, as ints
+       
+       note. the IP of ptext and ctext is computed once: the output of the 16 rounds
+             is compared with IP(ctext). With a mask, round keys of a candidate are
+             updated from the previous one (see _search_gray).
+             parity bits (the right bit of each byte) are ignored by DES: they are
+             dropped from mask, the keys found have the parity bits of base
+    '''
+    t = _int_tables()
+    x = _permute(_as_int64(ptext), t['ip'], 64)
+    l0, r0 = x >> 32, x & M32
+    y = _permute(_as_int64(ctext), t['ip'], 64)            # IP is the inverse of FP: y is (R16, L16)
+    target_r, target_l = y >> 32, y & M32
+    
+    if mask is not None:
+        mask &= ~PARITY_BITS & ((1 << 64) - 1)
+        free_bits = [bit for bit in range(64) if mask >> bit & 1]
+        base = _as_int64(base) & ~mask
+        total = 1 << len(free_bits)
+        split = max((total // chunksize).bit_length() - 1, (4 * jobs - 1).bit_length() if jobs > 1 else 0)
+        split = min(len(free_bits), split)          # 2 ** split tasks
+        low, high = free_bits[:len(free_bits) - split], free_bits[len(free_bits) - split:]
+        def tasks():
+            for i in range(1 << split):                      # each task fixes the "high" free bits
+                key = base
+                for n, bit in enumerate(high):
+                    if i >> n & 1:
+                        key |= 1 << bit
+                yield (_search_gray, (l0, r0, target_l, target_r, key, low, partial, first))
+    elif candidates is not None:
+        total = None
+        def tasks():
+            keys = iter(candidates)
+            chunk = [_as_int64(key) for key in islice(keys, chunksize)]
+            while chunk:
+                yield (_search_list, (l0, r0, target_l, target_r, chunk, partial, first))
+                chunk = [_as_int64(key) for key in islice(keys, chunksize)]
+    else:
+        raise ValueError('one of mask or candidates is needed')
+    
+    found, tested = [], 0
+    start = perf_counter()
+    if jobs == 1:
+        results = map(_search_task, tasks())
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = _unordered_map(executor, _search_task, tasks(), 2 * jobs)
+    try:
+        for keys, n in results:
+            found += keys
+            tested += n
+            if progress is not None:
+                progress(tested, total, perf_counter() - start)
+            if first and found:
+                break
+    finally:
+        if executor is not None:
+            results.close()                     # it cancels tasks not yet started
+            executor.shutdown(wait=True)
+    return found
+
+
 def main():
     plaintext = [0x12,0x34,0x56,0xab,0xcd,0x13,0x25,0x36,]
     cipherkey = [0xaa,0xbb,0x09,0x18,0x27,0x36,0xcc,0xdd,]
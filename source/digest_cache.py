@@ -0,0 +1,258 @@
+# :filename: digest_cache.py persistent cache of sha-1 digests of files
+#
+# a file is hashed again only if it changed: its digest is kept in a sqlite
+# database with its path, size, modification time (ns) and inode; if they are
+# the same at the next lookup, the cached digest is returned without reading
+# the file
+#
+# use:
+#   import digest_cache
+#
+#   with digest_cache.DigestCache('digests.db', max_entries=100000) as cache:
+#       cache.digest(path)             # 40 hex digits, by sha1sum.digest_file if not cached
+#       cache.get(path)                # cached digest, or None (file changed, or not cached)
+#       cache.put(path, digest)
+#       cache.hits, cache.misses, cache.hit_rate    # lookups of this instance
+#       print(cache.report())
+#
+#   sha1sum.digest_files(paths, jobs=4, cache=cache)   # workers use the same database
+#
+# least recently used entries are evicted when there are more than max_entries,
+# or when their size is more than max_bytes (size of an entry: its path and
+# digest, plus ENTRY_OVERHEAD bytes)
+#
+# the database is in WAL mode, and writes wait for the lock (up to timeout
+# seconds): more processes can use it at the same time. A DigestCache sent to
+# a worker process opens its own connection there (one for each process)
+#
+# a hit only reads the database: the last-used stamps of hits are kept in
+# memory and written together, by the next put (before evicting), by close,
+# every USED_BATCH hits, or when the process exits
+
+
+# import std libs
+#   sqlite3 and multiprocessing.util are imported where they are used: importing this module stays light
+import os
+import time
+
+# import user libs
+if __package__:                          # imported as a module of package "source"
+    from . import sha1sum
+else:                                    # run as script, or imported from its directory
+    import sha1sum
+
+ENTRY_OVERHEAD = 48                              # bytes of an entry, besides path and digest (for max_bytes)
+USED_BATCH = 256                                 # last-used stamps of hits written at a time
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS digests (
+    path      TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    inode     INTEGER NOT NULL,
+    digest    TEXT NOT NULL,
+    used      INTEGER NOT NULL,
+    nbytes    INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS digests_used ON digests (used);
+'''
+
+_connections = {}                                # {(pid, database): sqlite3.Connection} of this process
+_used = {}                                       # {(pid, database): {path: last used (ns)}} stamps of hits not yet written
+
+
+def _connect(database, timeout):
+    '''the connection of this process to database (opened on first use)'''
+    key = (os.getpid(), database)                 # a forked process doesn't use the connection of its parent
+    conn = _connections.get(key)
+    if conn is None:
+        import sqlite3
+        conn = sqlite3.connect(database, timeout=timeout, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(_SCHEMA)
+        _connections[key] = conn
+        from multiprocessing.util import Finalize
+        Finalize(None, _flush_used, args=(key, ), exitpriority=0)     # at exit, also of a pool worker
+    return conn
+
+
+def _write_used(conn, key):
+    '''write the pending last-used stamps of connection key (pid, database), in a transaction of conn'''
+    stamps = _used.pop(key, None)
+    if stamps:
+        conn.executemany('UPDATE digests SET used = ? WHERE path = ?', [(ns, path) for path, ns in stamps.items()])
+
+
+def _flush_used(key):
+    '''write the pending last-used stamps of connection key, in their own transaction'''
+    conn = _connections.get(key)
+    if conn is None or key[0] != os.getpid() or not _used.get(key):   # a forked process doesn't write the stamps of its parent
+        return
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        _write_used(conn, key)
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+
+class DigestCache(object):
+    '''cache of sha-1 digests of files, in a sqlite database
+
+       instance data:
+         - database      str - path of the database file
+         - max_entries   int - max n.of entries (None: no limit)
+         - max_bytes     int - max size of entries (None: no limit)
+         - timeout       float - seconds a write waits for the lock of another process
+         - hits          int - lookups that found the digest
+         - misses        int - lookups that didn't find it (or found it out of date)
+
+       note. a copy sent to another process (pickled) has the same database,
+             and its own connection and counters
+    '''
+
+    def __init__(self, database, max_entries=None, max_bytes=None, timeout=30.0):
+        self.database = os.path.abspath(database)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = self.misses = 0
+        _connect(self.database, timeout)
+
+    def __getstate__(self):
+        return {'database': self.database, 'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes, 'timeout': self.timeout, }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.hits = self.misses = 0
+
+    @property
+    def _conn(self):
+        return _connect(self.database, self.timeout)
+
+    @property
+    def _conn_key(self):
+        return os.getpid(), self.database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def close(self):
+        '''close the connection of this process, writing the pending last-used stamps'''
+        _flush_used(self._conn_key)
+        conn = _connections.pop(self._conn_key, None)
+        if conn is not None:
+            conn.close()
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM digests').fetchone()[0]
+
+    @staticmethod
+    def _key(path):
+        '''key and stat of path: (absolute path, (size, mtime_ns, inode),)'''
+        info = os.stat(path)
+        return os.path.abspath(path), (info.st_size, info.st_mtime_ns, info.st_ino)
+
+    def get(self, path):
+        '''cached digest of the file path, or None if it isn't cached or the
+           file changed (size, modification time or inode); OSError if the
+           file can't be read
+        '''
+        key, meta = self._key(path)
+        return self._get(key, meta)
+
+    def _get(self, key, meta):
+        conn = self._conn
+        row = conn.execute('SELECT size, mtime_ns, inode, digest FROM digests WHERE path = ?', (key, )).fetchone()
+        if row is None or tuple(row[:3]) != meta:
+            self.misses += 1
+            return None
+        self.hits += 1
+        stamps = _used.setdefault(self._conn_key, {})    # written later: a hit doesn't wait for the write lock
+        stamps[key] = time.time_ns()
+        if len(stamps) >= USED_BATCH:
+            _flush_used(self._conn_key)
+        return row[3]
+
+    def put(self, path, digest):
+        '''cache digest (40 hex digits) of the file path, as it is now'''
+        key, meta = self._key(path)
+        self._put(key, meta, digest)
+
+    def _put(self, key, meta, digest):
+        conn = self._conn
+        nbytes = len(key.encode('utf-8', 'surrogateescape')) + len(digest) + ENTRY_OVERHEAD
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            _write_used(conn, self._conn_key)             # before evicting
+            conn.execute('INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)',
+                         (key, *meta, digest, time.time_ns(), nbytes))
+            self._evict(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _evict(self, conn):
+        '''drop least recently used entries over max_entries or max_bytes'''
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        count, total = conn.execute('SELECT COUNT(*), TOTAL(nbytes) FROM digests').fetchone()
+        over = 0
+        for nbytes, in conn.execute('SELECT nbytes FROM digests ORDER BY used'):
+            if ((self.max_entries is None or count <= self.max_entries)
+                    and (self.max_bytes is None or total <= self.max_bytes)):
+                break
+            count -= 1
+            total -= nbytes
+            over += 1
+        if over:
+            conn.execute('DELETE FROM digests WHERE path IN '
+                         '(SELECT path FROM digests ORDER BY used LIMIT ?)', (over, ))
+
+    def digest(self, path):
+        '''sha-1 of the file path, as 40 hex digits: cached, or computed by
+           sha1sum.digest_file and cached; OSError if the file can't be read
+        '''
+        key, meta = self._key(path)
+        result = self._get(key, meta)
+        if result is None:
+            result = sha1sum.digest_file(path)
+            self._put(key, meta, result)          # metadata read before hashing: a file changed meanwhile is hashed again next time
+        return result
+
+    def clear(self):
+        '''drop all entries'''
+        self._conn.execute('DELETE FROM digests')
+
+    @property
+    def hit_rate(self):
+        '''hits / lookups (0.0 without lookups)'''
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        '''counters as text'''
+        return (f'lookups: {self.hits + self.misses}, hits: {self.hits}, misses: {self.misses}, '
+                f'hit rate: {100 * self.hit_rate:.1f}%, entries: {len(self)}')
+
+
+def main():
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        with DigestCache(os.path.join(tmp, 'digests.db')) as cache:
+            here = os.path.abspath(__file__)
+            print(cache.digest(here))
+            print(cache.digest(here))
+            print(cache.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,10 @@
 # :filename: hill.py hill cipher
 
 # import user libs
-try:
+if __package__:                          # imported as a module of package "source"
+    from . import nmatrix as nm
+else:                                    # run as script, or imported from its directory
     import nmatrix as nm
-except:
-    import source.nmatrix as nm
 
 #alphabet = { 'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4,
 #             'F': 5, 'G': 6, 'H': 7, 'I': 8, 'J': 9,
@@ -0,0 +1,135 @@
+# :filename: hmac_sha1.py hmac (keyed-hash message authentication code) using sha-1
+#
+# hmac(K, m) = H((K' xor opad) || H((K' xor ipad) || m))
+# where: H         the hash (sha-1)
+#        K'        the key, padded with 0s to a block (64 bytes); a longer key is hashed before
+#        ipad      a block of bytes 0x36
+#        opad      a block of bytes 0x5c
+#
+# (K' xor ipad) and (K' xor opad) are a whole block each: hashing them gives
+# two states (the 5 words h of sha1.Sha1) that depend only on the key. They
+# are computed once, by hmac_sha1(key); every mac starts from copies of them,
+# so a short message costs 2 compressions instead of 4
+#
+# use:
+#   mac = hmac_sha1(key)           # key: bytes-like
+#   mac.digest(msg)                # 20 bytes; mac.hexdigest(msg) as 40 hex digits; mac.to_int(msg) as integer
+#   mac.verify(msg, tag)           # True if tag (bytes) is the mac of msg, compared in constant time
+#
+# or, for a message arriving in chunks:
+#   h = mac.new()
+#   h.update(chunk)                # as many times as needed
+#   h.digest()
+
+
+# import std libs
+#   hmac (for compare_digest) is imported where it is used: it imports hashlib
+
+# import user libs
+if __package__:                          # imported as a module of package "source"
+    from . import sha1
+else:                                    # run as script, or imported from its directory
+    import sha1
+
+IPAD = 0x36
+OPAD = 0x5c
+
+
+class Hmac(object):
+    '''hmac of a key, with the inner and outer states precomputed
+
+       instance data:
+         - hasher     class - incremental hasher (sha1.Sha1 or a subclass, e.g. sha256.Sha256)
+         - inner      hasher instance - state after the block (K' xor ipad)
+         - outer      hasher instance - state after the block (K' xor opad)
+
+       note. inner and outer are never changed: every mac uses their copies
+    '''
+
+    def __init__(self, key, hasher=sha1.Sha1):
+        '''params
+             - key        bytes-like - the secret key
+             - hasher     class - the hash, sha1.Sha1 by default
+        '''
+        self.hasher = hasher
+        size = hasher.BLOCK_SIZE
+        key = bytes(key)
+        if len(key) > size:
+            key = hasher(key).digest()
+        key = key.ljust(size, b'\x00')
+        self.inner = hasher(bytes(item ^ IPAD for item in key))
+        self.outer = hasher(bytes(item ^ OPAD for item in key))
+
+    def new(self, data=b''):
+        '''a new incremental HmacHasher, with data as start of the message'''
+        return HmacHasher(self.inner.copy(), self.outer).update(data)
+
+    def digest(self, msg):
+        '''hmac of msg (bytes-like), as bytes'''
+        inner = self.inner.copy().update(msg)
+        return self.outer.copy().update(inner.digest()).digest()
+
+    def hexdigest(self, msg):
+        '''hmac of msg, as hex digits'''
+        return self.digest(msg).hex()
+
+    def to_int(self, msg):
+        '''hmac of msg, as integer'''
+        return int.from_bytes(self.digest(msg), 'big')
+
+    def verify(self, msg, tag):
+        '''True if tag (bytes-like) is the hmac of msg; the comparison takes the
+           same time wherever tag differs
+        '''
+        from hmac import compare_digest
+        return compare_digest(self.digest(msg), bytes(tag))
+
+
+class HmacHasher(object):
+    '''incremental hmac: message is given by chunks of bytes
+
+       instance data:
+         - inner      hasher instance - inner hash of the message given up to now
+         - outer      hasher instance - state after the block (K' xor opad), not changed
+    '''
+
+    def __init__(self, inner, outer):
+        self.inner = inner
+        self.outer = outer
+
+    def update(self, data):
+        '''add data (bytes-like) to the message'''
+        self.inner.update(data)
+        return self
+
+    def copy(self):
+        '''a new HmacHasher with the same state'''
+        return HmacHasher(self.inner.copy(), self.outer)
+
+    def digest(self):
+        '''hmac of the message given up to now, as bytes'''
+        return self.outer.copy().update(self.inner.digest()).digest()
+
+    def hexdigest(self):
+        '''hmac of the message given up to now, as hex digits'''
+        return self.digest().hex()
+
+    def to_int(self):
+        '''hmac of the message given up to now, as integer'''
+        return int.from_bytes(self.digest(), 'big')
+
+
+def hmac_sha1(key):
+    '''Hmac of key using sha-1: its inner and outer states are computed once'''
+    return Hmac(key, sha1.Sha1)
+
+
+def main():
+    # test vector from RFC 2202, test case 2
+    mac = hmac_sha1(b'Jefe')
+    print(mac.hexdigest(b'what do ya want for nothing?'))
+    print('effcdf6ae5eb2fa2d27416d5f184df9c259a7c79')
+
+
+if __name__ == '__main__':
+    main()
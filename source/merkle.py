@@ -0,0 +1,235 @@
+# :filename: merkle.py merkle tree of a (big) file, on chunks of fixed size, using sha-1
+#
+# leaves are the sha-1 of the chunks of the file, nodes the sha-1 of their two
+# children; the root is a digest of the whole file. A changed chunk changes
+# only the nodes on its path to the root, and a chunk can be proved part of
+# the file by the sibling nodes of that path (inclusion proof)
+#
+#     leaf      sha1(0x00 || chunk)
+#     node      sha1(0x01 || left || right)       a node without right child is its left child
+#
+# (the prefixes keep leaves and nodes apart, as in RFC 6962)
+#
+# use:
+#   tree = MerkleSHA1(chunk_size=1 << 20).build(path, jobs=4)   # path, or bytes-like
+#   tree.root                      # 20 bytes; tree.hexroot() as 40 hex digits
+#   tree.update(path, [3, 7])      # chunks 3 and 7 have been changed: rehash them and their paths
+#   proof = tree.proof(3)          # inclusion proof of chunk 3
+#   MerkleSHA1.verify(chunk, proof, tree.root)   # True if chunk is in the tree of root
+#
+# nodes are in a bytearray, 20 bytes for each one, level by level: leaves,
+# their parents, ..., root. Leaves are hashed in a process pool; each task
+# maps the file (see nbitarray.Buffer) and hashes a range of chunks
+
+
+# import std libs
+#   concurrent.futures is imported where it is used: importing this module stays light
+import os
+
+# import user libs
+if __package__:                          # imported as a module of package "source"
+    from . import nbitarray as nba
+    from . import sha1
+else:                                    # run as script, or imported from its directory
+    import nbitarray as nba
+    import sha1
+
+DIGEST_SIZE = sha1.Sha1.DIGEST_SIZE              # bytes of a node
+LEAF = b'\x00'                                   # prefix of the hashed chunk
+NODE = b'\x01'                                   # prefix of the hashed children
+
+
+def leaf_hash(chunk):
+    '''leaf of a chunk (bytes-like), as bytes'''
+    return sha1.Sha1(LEAF).update(chunk).digest()
+
+
+def node_hash(left, right):
+    '''node of two children (bytes), as bytes'''
+    return sha1.Sha1(NODE + left + right).digest()
+
+
+def _leaf_hashes(source, chunk_size, first, stop):
+    '''leaves of chunks from first to stop (excluded) of source (path or
+       bytes-like), as bytes: DIGEST_SIZE bytes for each chunk
+    '''
+    result = []
+    with nba.Buffer(source) as buf:
+        view = buf.view
+        for ndx in range(first, stop):
+            start = ndx * chunk_size
+            result.append(leaf_hash(view[start:start + chunk_size]))
+            buf.release(start, start + chunk_size)
+    return b''.join(result)
+
+
+def _leaf_task(args):
+    '''_leaf_hashes(*args), in a worker process'''
+    return _leaf_hashes(*args)
+
+
+class MerkleSHA1(object):
+    '''merkle tree of the chunks of a file
+
+       instance data:
+         - chunk_size   int - bytes of a chunk (the last one can be shorter)
+         - nchunks      int - n.of chunks, i.e. of leaves (an empty file has an empty chunk)
+         - nodes        bytearray - DIGEST_SIZE bytes for each node, level by level
+         - counts       list of int - n.of nodes of each level, from leaves to root
+         - offsets      list of int - index, in nodes, of the first node of each level
+    '''
+
+    def __init__(self, chunk_size=1 << 20):
+        if chunk_size < 1:
+            raise ValueError('chunk size must be at least 1 byte')
+        self.chunk_size = chunk_size
+        self.nchunks = 0
+        self.nodes = bytearray()
+        self.counts = []
+        self.offsets = []
+
+    def _chunks(self, source):
+        '''n.of chunks of source (path or bytes-like)'''
+        if isinstance(source, (str, os.PathLike)):
+            size = os.stat(source).st_size
+        else:
+            with memoryview(source) as view:
+                size = view.nbytes
+        return max(1, -(-size // self.chunk_size))
+
+    def _layout(self, nchunks):
+        '''counts and offsets of the levels of a tree of nchunks leaves'''
+        self.nchunks = nchunks
+        self.counts, self.offsets = [], []
+        count, offset = nchunks, 0
+        while True:
+            self.counts.append(count)
+            self.offsets.append(offset)
+            offset += count
+            if count == 1:
+                break
+            count = -(-count // 2)
+        self.nodes = bytearray(offset * DIGEST_SIZE)
+
+    def node(self, level, ndx):
+        '''node ndx of level (0: leaves), as bytes'''
+        start = (self.offsets[level] + ndx) * DIGEST_SIZE
+        return bytes(self.nodes[start:start + DIGEST_SIZE])
+
+    def _set_node(self, level, ndx, digest):
+        start = (self.offsets[level] + ndx) * DIGEST_SIZE
+        self.nodes[start:start + DIGEST_SIZE] = digest
+
+    def _compute_node(self, level, ndx):
+        '''compute node ndx of level (> 0) from its children'''
+        left = self.node(level - 1, 2 * ndx)
+        if 2 * ndx + 1 < self.counts[level - 1]:
+            self._set_node(level, ndx, node_hash(left, self.node(level - 1, 2 * ndx + 1)))
+        else:
+            self._set_node(level, ndx, left)
+
+    def build(self, source, jobs=None):
+        '''build the tree of source
+
+           params
+             - source     str | os.PathLike - path of the file (it is mapped in memory); or
+                          bytes-like - bytes, bytearray, mmap.mmap, memoryview, ...
+             - jobs       int - n.of worker processes hashing the leaves; None: os.cpu_count(); 1: no pool
+
+           return self
+        '''
+        self._layout(self._chunks(source))
+        jobs = min(jobs or os.cpu_count() or 1, self.nchunks)
+        if jobs == 1:
+            leaves = _leaf_hashes(source, self.chunk_size, 0, self.nchunks)
+        else:
+            leaves = self._pool_leaves(source, jobs)
+        self.nodes[:len(leaves)] = leaves
+        for level in range(1, len(self.counts)):
+            for ndx in range(self.counts[level]):
+                self._compute_node(level, ndx)
+        return self
+
+    def _pool_leaves(self, source, jobs):
+        '''leaves hashed by ranges of chunks in a process pool: a path is mapped
+           by every task, a bytes-like is sent by slices
+        '''
+        from concurrent.futures import ProcessPoolExecutor
+        step = -(-self.nchunks // (4 * jobs))           # chunks of a task
+        ranges = [(first, min(first + step, self.nchunks)) for first in range(0, self.nchunks, step)]
+        if isinstance(source, (str, os.PathLike)):
+            tasks = [(source, self.chunk_size, first, stop) for first, stop in ranges]
+        else:
+            size = self.chunk_size
+            with nba.Buffer(source) as buf:
+                tasks = [(buf.view[first * size:stop * size].tobytes(), size, 0, stop - first)
+                         for first, stop in ranges]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return b''.join(executor.map(_leaf_task, tasks))
+
+    @property
+    def root(self):
+        '''root of the tree, as bytes'''
+        return self.node(len(self.counts) - 1, 0)
+
+    def hexroot(self):
+        '''root of the tree, as 40 hex digits'''
+        return self.root.hex()
+
+    def update(self, source, chunks):
+        '''rehash changed chunks of source and the nodes of their paths only
+
+           params
+             - source     as build - the changed file (same n.of chunks)
+             - chunks     iterable of int - indexes of changed chunks
+
+           return self
+        '''
+        if self._chunks(source) != self.nchunks:
+            raise ValueError('the number of chunks changed: build the tree again')
+        changed = sorted(set(chunks))
+        if changed and not 0 <= changed[0] <= changed[-1] < self.nchunks:
+            raise IndexError('chunk index out of range')
+        with nba.Buffer(source) as buf:
+            for ndx in changed:
+                start = ndx * self.chunk_size
+                self._set_node(0, ndx, leaf_hash(buf.view[start:start + self.chunk_size]))
+        for level in range(1, len(self.counts)):
+            changed = sorted(set(ndx // 2 for ndx in changed))
+            for ndx in changed:
+                self._compute_node(level, ndx)
+        return self
+
+    def proof(self, ndx):
+        '''inclusion proof of chunk ndx: list of (left, digest,), the siblings
+           on the path from leaf to root; left is True if the sibling is on the left
+        '''
+        if not 0 <= ndx < self.nchunks:
+            raise IndexError('chunk index out of range')
+        result = []
+        for level in range(0, len(self.counts) - 1):
+            sibling = ndx ^ 1
+            if sibling < self.counts[level]:              # else the node goes up as it is
+                result.append((sibling < ndx, self.node(level, sibling)))
+            ndx //= 2
+        return result
+
+    @staticmethod
+    def verify(chunk, proof, root):
+        '''True if chunk (bytes-like) is in the tree of root, by its inclusion proof'''
+        digest = leaf_hash(chunk)
+        for left, sibling in proof:
+            digest = node_hash(sibling, digest) if left else node_hash(digest, sibling)
+        return digest == bytes(root)
+
+
+def main():
+    data = bytes(range(256)) * 40
+    tree = MerkleSHA1(chunk_size=1024).build(data, jobs=1)
+    print(tree.nchunks, tree.counts, tree.hexroot())
+    proof = tree.proof(7)
+    print(MerkleSHA1.verify(data[7 * 1024:8 * 1024], proof, tree.root))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,10 +9,18 @@
 #   len(ba)                    # number of bits
 #   ba[ndx]                    # bit at index ndx
 #   ba[ndx] = bit_as_integer   # set bit at index ndx
-#   ba == bb                   # eq operator
+#   ba == bb                   # eq operator: same length and same bits
+#   fa = ba.freeze()           # an ImmutableNBitArray copy: hashable, usable as dict key or in a set
 #   str(ba)                    # string of bits
 #   ba + bb                    # concatenation operator
-#   ba ^ bb                    # xor operator (ba and bb of the same length)
+#   ba ^ bb                    # xor operator (ba and bb of the same length); bb can be an int too
+#   ba & bb, ba | bb, ~ba      # and, or, not operators (as xor)
+#   ba ^= bb                   # in place xor, changing ba without a new instance; &= and |= too
+#   ba.add_mod(bb, inplace=)   # sum modulo 2**len(ba), as words of fixed width
+#   ba.popcount(), ba.parity()   # n.of bits set to 1, and its parity (0|1)
+#   ba.find_first_set()        # index of the first 1 from the left (-1 if none)
+#   ba.count_leading_zeros()   # n.of 0s on the left, before the first 1
+#   nba.NBitArray.from_int(x, length)  # create instance from an int
 #   ba << n                    # left shift, note: ba.__lshift__(n, circular=True) does a circular left shift
 #   ba >> n                    # right shift, note: ba.__rshift__(n, circular=True) does a circular right shift
 #   ba.get_byte(bit_ndx|byte_ndx=)  # return one byte as integer from indicated position
@@ -23,13 +31,32 @@
 #   ba.bit_list()              # return the bit array content as a list of integers with values 0|1
 #   ba.hex(asint=)            # return the bit array content as a string of hex numbers, or list of ints (an int for each byte)
 #   ba.to_int()                # return nbitarray as (single) integer
+#   ba.to_bytes()              # return nbitarray as bytes
 #   ba.swap_lr()               # return a new NBitArray with left and right halves inverted. len(ba) must be even
 #   ba.padding(md=)           # return a new NBitArray padded to "md" module (default 512)
+#   ba.padded_blocks(md=)     # GENERATOR of the blocks of ba.padding(md), without a padded copy
+#   nba.md_padding(tail, length, md=)  # bytes of the last padded block(s), from the message tail and length in bits
 #   ba.break_to_list(el=)     # break instance in a list of nbitarray elements, each element with length "el" (default 32) bits; return the list
+#
+# instrumentation: to count instances, bytes allocated, calls of each method and bit operations
+#
+#   with nba.Counters() as counters:
+#       sha1.sha1(msg)
+#   print(counters.report())     # or counters.snapshot() for a dict
+#
+#   while a Counters is active, methods of NBitArray and ImmutableNBitArray are replaced by
+#   counting wrappers; otherwise the classes are untouched
+#
+# input buffers: to read bytes of a file path, mmap, memoryview, bytes, ... without copying them
+#
+#   with nba.Buffer(path_or_buffer) as buf:
+#       buf.view                   # memoryview of bytes (a file is mapped: the kernel pages it in on demand)
+#       buf.release(start, stop)   # tell the kernel that bytes in [start, stop) are no more needed
+
 
 # import std libs
-import sys
-from numbers import Number
+import os
+import stat
 
 
 BYTE_SIZE = 8
@@ -121,9 +148,34 @@ def int_to_bit_list(v, length=None):
 def str_to_bit_list(s):
     return [int(item) for item in list(s)]
 
+def md_padding(tail, length, md=512):
+    '''last block(s) of a padded message (Merkle-Damgard padding, as sha-1):
+       the message tail, bit 1, bits 0, message length as 64 bits
+    
+       params
+         - tail        bytes-like - last bytes of message, after its last complete block, or
+                       NBitArray - last bits of message (when length isn't a multiple of 8)
+         - length      int - message length in bits (the whole message, not only tail)
+         - md          int - block length in bits, usually 512
+    
+       return bytes - one or two blocks (the second one if the tail has no room for 1 and length)
+    
+       note. only the tail is padded, so a long message isn't copied: the
+             whole message sha1.sha1 and the incremental Sha1 use it for the
+             last block(s). bytes are padded by bytes, without bit operations
+    '''
+    if isinstance(tail, NBitArray):
+        n = len(tail)
+        k = (md - 64 - 1 - n) % md
+        x = (((tail.to_int() << 1) | 1) << (k + 64)) | (length & 0xffffffffffffffff)
+        return x.to_bytes((n + 1 + k + 64) // BYTE_SIZE, 'big')
+    tail = bytes(tail) + b'\x80'                        # bit 1 and 7 bits 0
+    size = md // BYTE_SIZE
+    return tail + bytes(-(len(tail) + 8) % size) + (length & 0xffffffffffffffff).to_bytes(8, 'big')
+
 class NBitArray(object):
     '''
-         - nbits     int - num of valid bits in array
+         - length    int - num of valid bits in array
          - _ba       bytearray - physical container of bits
          
        note. this class isn't derived from bytearray because len(NBitArray)
@@ -131,7 +183,10 @@ class NBitArray(object):
              this observation drops validity of methods of bytearray: in every
              case we will need overimpose new algorithms to methods. So we use
              bytearray merely as an holder of our bits
+       note. instances have __slots__, without a __dict__: sha1 and des make a lot
+             of small instances
     '''
+    __slots__ = ('length', '_ba', )
 
     @property
     def bytes_size(self):
@@ -176,19 +231,40 @@ class NBitArray(object):
         return self.length
     
     def __eq__(self, other):
+        '''same length and same bits; other objects are compared as strings of bits
+        
+           note. bits after length, in the last byte, are always 0 (see __setitem__),
+                 so the bytes can be compared as they are
+        '''
+        if isinstance(other, NBitArray):
+            return self.length == other.length and self._ba == other._ba
         return str(self) == str(other)
     
+    __hash__ = None                          # mutable: see ImmutableNBitArray
+    
+    def freeze(self):
+        '''return an ImmutableNBitArray with the same bits'''
+        result = ImmutableNBitArray.__new__(ImmutableNBitArray)
+        result.length = self.length
+        result._ba = bytes(self._ba)
+        result._hash = None
+        return result
+    
     def __setitem__(self, index, value):
-        if index > self.length:
-            raise IndexError
+        if index < 0:                             # from the end, as for lists (never a padding bit)
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('NBitArray index out of range')
         array_index, bit_position = divmod(index, self.elem_size)
         self._ba[array_index] = set_bit(self._ba[array_index], bit_position, value)
 
     def __getitem__(self, index):
         if isinstance(index, slice):
             return NBitArray([self[x] for x in range(*index.indices(len(self)))])
-        if index >= self.length:
-            raise IndexError
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('NBitArray index out of range')
         array_index, bit_position = divmod(index, self.elem_size)
         return get_bit(self._ba[array_index], bit_position)
     
@@ -216,30 +292,104 @@ class NBitArray(object):
             target_ndx += 1
         return result
     
-    def __xor__(self, other):
+    @classmethod
+    def from_int(cls, x, length):
+        '''an instance of length bits holding the int x (its lowest length bits)'''
+        nbytes = -(-length // BYTE_SIZE)
+        pad = nbytes * BYTE_SIZE - length                 # unused bits on the right of the last byte
+        result = cls(((x & ((1 << length) - 1)) << pad).to_bytes(nbytes, 'big'))
+        result.length = length
+        return result
+    
+    def _set_int(self, x):
+        '''set bits in place from the int x (its lowest len(self) bits); return self'''
+        length = self.length
+        pad = len(self._ba) * BYTE_SIZE - length
+        self._ba[:] = ((x & ((1 << length) - 1)) << pad).to_bytes(len(self._ba), 'big')
+        return self
+    
+    def _other_int(self, other):
+        '''other (NBitArray of the same length, or int) as int'''
+        if isinstance(other, int):
+            return other
         if len(self) != len(other):
             raise ValueError('operands of different length')
-        return NBitArray([self[ndx]^other[ndx] for ndx in range(0,len(self))])
+        return other.to_int()
+    
+    def __and__(self, other):
+        return NBitArray.from_int(self.to_int() & self._other_int(other), self.length)
+    
+    def __or__(self, other):
+        return NBitArray.from_int(self.to_int() | self._other_int(other), self.length)
+    
+    def __xor__(self, other):
+        return NBitArray.from_int(self.to_int() ^ self._other_int(other), self.length)
+    
+    def __invert__(self):
+        return NBitArray.from_int(~self.to_int(), self.length)
+    
+    def __iand__(self, other):
+        return self._set_int(self.to_int() & self._other_int(other))
+    
+    def __ior__(self, other):
+        return self._set_int(self.to_int() | self._other_int(other))
+    
+    def __ixor__(self, other):
+        return self._set_int(self.to_int() ^ self._other_int(other))
+    
+    def add_mod(self, other, inplace=False):
+        '''sum modulo 2**len(self), as words of fixed width (+ is concatenation)
+        
+           params
+             - other      NBitArray of the same length, or int - the addend
+             - inplace    bool - if True, self is changed and returned, otherwise
+                          a new NBitArray is returned
+        '''
+        x = self.to_int() + self._other_int(other)
+        if inplace:
+            return self._set_int(x)
+        return NBitArray.from_int(x, self.length)
+    
+    def popcount(self):
+        '''n.of bits set to 1'''
+        return bin(int.from_bytes(self._ba, 'big')).count('1')
+    
+    def parity(self):
+        '''1 if the n.of bits set to 1 is odd, otherwise 0'''
+        return self.popcount() & 1
+    
+    def count_leading_zeros(self):
+        '''n.of bits set to 0 on the left, before the first 1 (len(self) if there isn't any)'''
+        return self.length - self.to_int().bit_length()
+    
+    def find_first_set(self):
+        '''index of the first bit set to 1, from the left; -1 if there isn't any'''
+        x = self.to_int()
+        return self.length - x.bit_length() if x else -1
 
     def __lshift__(self, num, circular=False):
         if type(num) != int:
             raise TypeError
-        bl = self.bit_list()
-        for n in range(0, num):
-            abit = bl.pop(0)                # the 1st element (on the left)
-            abit = abit if circular else 0
-            bl.append(abit)
-        return NBitArray(bl)
+        length = self.length
+        x = self.to_int()
+        if circular and length:
+            num %= length
+            x = (x << num) | (x >> (length - num))
+        else:
+            x <<= num
+        return NBitArray.from_int(x, length)
 
     def __rshift__(self, num, circular=False):
         if type(num) != int:
             raise TypeError
-        bl = self.bit_list()
-        for n in range(0, num):
-            abit = bl.pop()                  # the last element
-            abit = abit if circular else 0
-            bl.insert(0, abit)
-        return NBitArray(bl)
+        length = self.length
+        x = self.to_int()
+        if circular and length:
+            num %= length
+            x = (x >> num) | (x << (length - num))
+        else:
+            x >>= num
+        return NBitArray.from_int(x, length)
     
     def get_byte(self, bit_ndx=None, byte_ndx=None):
         '''return byte starting at bit_ndx or byte_ndx'''
@@ -311,13 +461,13 @@ class NBitArray(object):
                 result.append(self[-tail_len:].bit_list())
         return result
     
+    def to_bytes(self):
+        '''to bytes (bits are on the left of the last byte, if len(self) isn't a multiple of 8)'''
+        return bytes(self._ba)
+    
     def to_int(self):
         '''to integer'''
-        l = len(self)
-        result = 0
-        for ndx in range(0, l):
-            result += self[ndx] << (l-ndx-1)
-        return result
+        return int.from_bytes(self._ba, 'big') >> (len(self._ba) * BYTE_SIZE - self.length)
     
     def swap_lr(self):
         '''swap left and right parts'''
@@ -341,13 +491,36 @@ class NBitArray(object):
                 - + int  len(msg)                      size(len(msg)) == 64 bits
               hence k = (512 - 64 - 1 - l) mod 512
         '''
-        l = len(self)
-        l2 = NBitArray(l.to_bytes(8,'big'))   # int l as 64 bits (8 bytes)
-        k = (md - 64 - 1 - l) % md
-        tail = [1]
-        tail.extend([0] * k)
-        tail = NBitArray(tail)
-        return self + tail + l2
+        nbytes, tail = self._tail(md)
+        result = NBitArray(self._ba[:nbytes])
+        result._ba += md_padding(tail, len(self), md)   # only the tail is padded
+        result.length = len(result._ba) * BYTE_SIZE
+        return result
+    
+    def _tail(self, md):
+        '''(n.of bytes of the complete blocks of md bits, bits after them,);
+           the bits are bytes if they are whole bytes, otherwise an NBitArray
+        '''
+        nbytes = len(self) // md * md // BYTE_SIZE
+        if len(self) % BYTE_SIZE == 0:
+            return nbytes, bytes(self._ba[nbytes:])
+        tail = NBitArray(self._ba[nbytes:])
+        tail.length = len(self) - nbytes * BYTE_SIZE
+        return nbytes, tail
+    
+    def padded_blocks(self, md=512):
+        '''blocks of the padded array, as padding(md).break_to_list(el=md), but
+           the blocks are copied one at a time and only the last one(s) are padded
+        
+        return a (python) GENERATOR of NBitArray, each of md bits
+        '''
+        size = md // BYTE_SIZE
+        nbytes, tail = self._tail(md)
+        for start in range(0, nbytes, size):
+            yield NBitArray(self._ba[start:start + size])
+        padded = md_padding(tail, len(self), md)
+        for start in range(0, len(padded), size):
+            yield NBitArray(padded[start:start + size])
     
     def break_to_list(self, el=32):
         '''break istance in list of (nbitarray) elements, each of el bits
@@ -358,6 +531,9 @@ class NBitArray(object):
         '''
         if len(self) % el != 0:
             raise ValueError('instance length is not a multiple of element length')
+        if el % BYTE_SIZE == 0:                         # whole bytes: copied by slices
+            size = el // BYTE_SIZE
+            return [NBitArray(self._ba[start:start + size]) for start in range(0, len(self._ba), size)]
         steps = len(self) // el
         result = []
         for step in range(steps):
@@ -366,8 +542,265 @@ class NBitArray(object):
             element = NBitArray([self[ndx] for ndx in range(startbit, stopbit)])
             result.append(element)
         return result
+
+
+class ImmutableNBitArray(NBitArray):
+    '''an NBitArray that can't be changed, so it can be hashed: a key of dict,
+       an element of set
+       
+       instance data: as NBitArray, plus
+         - _hash     int - hash, computed on first use
+       
+       note. create it by NBitArray.freeze(), or as an NBitArray;
+             methods returning a new array return a (mutable) NBitArray
+    '''
+    __slots__ = ('_hash', )
+    
+    def __init__(self, bits):
+        super().__init__(bits)
+        self._ba = bytes(self._ba)
+        self._hash = None
+    
+    def __setitem__(self, index, value):
+        raise TypeError('ImmutableNBitArray does not support item assignment')
+    
+    def __eq__(self, other):
+        '''same length and same bits; other objects are not compared as strings
+           of bits (as NBitArray does): their hash would differ
+        '''
+        if isinstance(other, NBitArray):
+            return self.length == other.length and self._ba == other._ba
+        return NotImplemented
+    
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.length, self._ba))
+        return self._hash
+    
+    def freeze(self):
+        return self
+    
+    def _set_int(self, x):
+        raise TypeError('ImmutableNBitArray does not support item assignment')
+    
+    def __iand__(self, other):                # not in place: a new NBitArray, as for int
+        return self & other
+    
+    def __ior__(self, other):
+        return self | other
+    
+    def __ixor__(self, other):
+        return self ^ other
+    
+    def add_mod(self, other, inplace=False):
+        return super().add_mod(other)
         
 
+_counters = None              # the active Counters, if any
+_originals = {}               # {(class, name): method} of NBitArray and ImmutableNBitArray, replaced by counting wrappers
+
+
+class Counters(object):
+    '''counters of NBitArray instances and operations, as context manager
+    
+       instance data:
+         - instances  int - n.of NBitArray created (ImmutableNBitArray and freeze copies too)
+         - nbytes     int - bytes allocated by them (their bytearrays, or bytes)
+         - calls      dict - {method name: n.of calls}; ImmutableNBitArray methods
+                      as 'ImmutableNBitArray.name'
+         - bit_ops    int - n.of single bit reads and writes (ba[ndx], ba[ndx] = x)
+       
+       note. entering the first active Counters wraps all methods of NBitArray, class
+             and static methods included (and those redefined by ImmutableNBitArray),
+             exiting the last one puts back the original methods; they can
+             be nested: the previous one is restored on exit
+    '''
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        '''zero all counters'''
+        self.instances = 0
+        self.nbytes    = 0
+        self.calls     = {}
+        self.bit_ops   = 0
+    
+    def snapshot(self):
+        '''counters as a new dict'''
+        return {'instances': self.instances,
+                'nbytes':    self.nbytes,
+                'calls':     dict(self.calls),
+                'bit_ops':   self.bit_ops, }
+    
+    def report(self, limit=5):
+        '''counters as text; if tracemalloc is tracing, it adds the "limit" lines
+           of NBitArray holding more (still allocated) memory
+        '''
+        rows = [f'instances: {self.instances}', f'bytes:     {self.nbytes}', f'bit ops:   {self.bit_ops}', 'calls:']
+        for name, calls in sorted(self.calls.items(), key=lambda item: -item[1]):
+            rows.append(f'  {name:<20}{calls:>12}')
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            import inspect
+            lines, first = inspect.getsourcelines(NBitArray)
+            methods = range(first, first + len(lines))                    # not the lines of counters
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, __file__)])
+            stats = [stat for stat in snapshot.statistics('lineno') if stat.traceback[0].lineno in methods]
+            rows.append('tracemalloc (live memory allocated by NBitArray methods):')
+            for stat in stats[:limit]:
+                rows.append(f'  {stat}')
+        return '\n'.join(rows)
+    
+    def __enter__(self):
+        global _counters
+        self._previous = _counters
+        if not _originals:
+            _wrap_methods()
+        _counters = self
+        return self
+    
+    def __exit__(self, *exc_info):
+        global _counters
+        _counters = self._previous
+        if _counters is None:
+            _unwrap_methods()
+        return False
+
+
+def _counting(name, method, label):
+    '''wrapper of NBitArray method that updates the active Counters; calls are counted as label'''
+    from functools import wraps
+    if name == '__init__' and label == name:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            method(self, *args, **kwargs)
+            c = _counters
+            c.calls[name] = c.calls.get(name, 0) + 1
+            c.instances += 1
+            c.nbytes += len(self._ba)
+    elif name == '__init__':                 # ImmutableNBitArray: instance counted by NBitArray.__init__, plus its bytes copy
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            method(self, *args, **kwargs)
+            c = _counters
+            c.calls[label] = c.calls.get(label, 0) + 1
+            c.nbytes += len(self._ba)
+    elif name == 'freeze':
+        @wraps(method)
+        def wrapper(self):
+            result = method(self)
+            c = _counters
+            c.calls[label] = c.calls.get(label, 0) + 1
+            if result is not self:           # a copy, made without __init__
+                c.instances += 1
+                c.nbytes += len(result._ba)
+            return result
+    elif name in ('__getitem__', '__setitem__'):
+        @wraps(method)
+        def wrapper(self, index, *args):
+            c = _counters
+            c.calls[label] = c.calls.get(label, 0) + 1
+            if isinstance(index, int):
+                c.bit_ops += 1
+            return method(self, index, *args)
+    else:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            c = _counters
+            c.calls[label] = c.calls.get(label, 0) + 1
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _wrap_methods():
+    '''replace methods of NBitArray and ImmutableNBitArray with counting wrappers'''
+    for cls in (NBitArray, ImmutableNBitArray, ):
+        prefix = '' if cls is NBitArray else f'{cls.__name__}.'
+        for name, item in list(vars(cls).items()):
+            if isinstance(item, (classmethod, staticmethod)):            # wrap the function, then the descriptor again
+                _originals[cls, name] = item
+                setattr(cls, name, type(item)(_counting(name, item.__func__, prefix + name)))
+            elif callable(item) and name not in ('__hash__', '__repr__', '__str__'):
+                _originals[cls, name] = item
+                setattr(cls, name, _counting(name, item, prefix + name))
+
+
+def _unwrap_methods():
+    '''put back the original methods of NBitArray and ImmutableNBitArray'''
+    for (cls, name), item in _originals.items():
+        setattr(cls, name, item)
+    _originals.clear()
+
+
+class Buffer(object):
+    '''bytes of a file path or of an object supporting the buffer protocol
+       (bytes, bytearray, mmap.mmap, memoryview, ...), as context manager
+    
+       instance data:
+         - view       memoryview - of unsigned bytes, valid inside "with"
+       
+       note. a path (str or os.PathLike) is mapped read only by mmap: pages
+             are read from disk when they are touched; release(start, stop)
+             drops pages already used (MADV_DONTNEED), so reading a big file
+             sequentially doesn't grow the resident memory up to its size.
+             a path that isn't a regular file (a pipe, a device) is read
+             all at once. other objects aren't copied, and release does nothing
+    '''
+    __slots__ = ('data', 'view', '_file', '_map', )
+    
+    def __init__(self, data):
+        self.data = data
+        self.view = self._file = self._map = None
+    
+    @staticmethod
+    def accepts(data):
+        '''True if data is a path or supports the buffer protocol (it is not, e.g., a file object)'''
+        if isinstance(data, (str, os.PathLike)):
+            return True
+        try:
+            memoryview(data).release()
+        except TypeError:
+            return False
+        return True
+    
+    def __enter__(self):
+        data = self.data
+        if isinstance(data, (str, os.PathLike)):
+            import mmap
+            self._file = open(data, 'rb')
+            info = os.fstat(self._file.fileno())
+            if not stat.S_ISREG(info.st_mode):                 # it can't be mapped
+                data = self._file.read()
+            elif info.st_size == 0:                            # an empty file can't be mapped
+                data = b''
+            else:
+                data = self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(data, 'madvise'):
+                    data.madvise(mmap.MADV_SEQUENTIAL)
+        self.view = memoryview(data).cast('B')
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.view.release()
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self.view = self._file = self._map = None
+        return False
+    
+    def release(self, start, stop):
+        '''bytes in [start, stop) are no more needed'''
+        m = self._map
+        if m is None or not hasattr(m, 'madvise'):
+            return
+        import mmap
+        start -= start % mmap.PAGESIZE                        # madvise wants start aligned to a page
+        if stop > start:
+            m.madvise(mmap.MADV_DONTNEED, start, min(stop, len(m)) - start)
+
+
 def main():
     ba = NBitArray('1111000011110000')
     l = ba.break_to_list(el=4)
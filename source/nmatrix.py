@@ -25,16 +25,16 @@
 
 # import std libs
 #import timeit as tm
-import secrets
 from numbers import Number
+#   secrets is imported where it is used: importing this module stays light
 
 # import 3rd parties libs
 
 # import user libs
-try:
+if __package__:                          # imported as a module of package "source"
+    from . import numbers_ops as nops
+else:                                    # run as script, or imported from its directory
     import numbers_ops as nops
-except:
-    import source.numbers_ops as nops
 
 
 
@@ -52,8 +52,11 @@ class NMatrix(object):
     
        instance data:
          - __m            list of lists - each row of the matrix is an inner list
-         - shape            tuple of 2 int - (n.rows, ncols,)
+       
+       note. instances have __slots__, without a __dict__; shape is derived from __m
     '''
+    __slots__ = ('__m', )
+    
     @classmethod
     def identity(cls, n):
         '''identity matrix, n*n
@@ -89,6 +92,7 @@ class NMatrix(object):
            note. if rands is None, it will be made composing an interval of numbers [0, 1)
                  with step==1/(nrows*ncols*10); numbers will be rounded at (nrows*ncols*10) order of magnitude
         '''
+        import secrets
         if ncols is None:
             ncols = nrows
         if rands is None:
@@ -97,13 +101,18 @@ class NMatrix(object):
             rands = [round(item / max, rnd) for item in range(0, max)]
         return cls([[secrets.choice(rands) for x in range(0, ncols)] for x in range(0, nrows)])
     
+    @property
+    def shape(self):
+        '''(n.rows, ncols,)'''
+        return (len(self.__m), len(self.__m[0]),)
+
     @property
     def nrows(self):
-        return self.shape[0]
+        return len(self.__m)
 
     @property
     def ncols(self):
-        return self.shape[1]
+        return len(self.__m[0])
 
     def __init__(self, lol):
         '''init matrix instance
@@ -116,7 +125,6 @@ class NMatrix(object):
             if len(lol[ndx])!=lc:
                 raise ValueError('rows are of different lenghts')
         self.__m = lol
-        self.shape = (lr, lc,)
     
     def __eq__(self, M):
         return self.__m == M._get_core()
@@ -265,7 +273,7 @@ class NMatrix(object):
 
     def __len__(self):
         '''return nrows'''
-        return self.shape[0]
+        return len(self.__m)
     
     def _get_core(self):
         '''return the matrix core element'''
@@ -6,7 +6,8 @@
 #
 # functions:
 #     - coprimes_gen           coprime numbers (python) GENERATOR
-#     - coprimes               list of coprime numbers
+#     - coprimes               list (or array) of coprime numbers
+#     - prime_factors          distinct prime factors by trial division
 #     - generate_prime_number  random generator of a single prime number
 #     - primes_gen             prime numbers (python) GENERATOR
 #     - primes                 list of prime numbers
@@ -14,31 +15,136 @@
 #     - gcd                    greatest common divisor
 #     - is_prime               primality test
 #     - is_prime_mr            Miller-Rabin: statistically primality test 
+#     - factorize              prime factorization, as dict {prime: exponent}
+#     - factorize_many         prime factorizations of a lot of small numbers
+#     - spf_sieve              smallest prime factor table (memoised, read only)
+#     - pollard_brent          a factor of a composite number
 #     - lcg                    pseudorandom numbers using a Linear Congruential (python) GENERATOR;
 #                                  attention: this returns a python generator, call "next" to get the number
+#     - lcg_fill               a batch of pseudorandom numbers of lcg, as an array
+#     - lcg_skip               jump ahead of lcg, in O(log(steps))
+#     - lcg_streams            seeds of independent streams of lcg
 #     - equiv_list             list of members of an equivalence class of remainders
 #     - naive_invmod           inverse modulus, naive version
 #     - egcd                   extended euclidean algorithm (extended greatest common divisor)
 #     - invmod                 inverse modulus
 
 # import std libs
+import math
+import sys
+from array import array
+from functools import lru_cache
+from itertools import compress
 from random import randrange
-from secrets import randbits
+#   secrets is imported where it is used: importing this module stays light
 
+UINT32 = 'I' if array('I').itemsize == 4 else 'L'  # typecode of 4 bytes unsigned ints ('L' is 8 bytes on 64 bits linux)
 
-def coprimes_gen(n, min=2):
-    '''coprime numbers generator'''
-    if min < 2 or min >= n: raise ValueError(f"min < 2 or min >= n") # min coprime is 2
-    i = min
-    while i <= n:
-        if is_coprime(i, n):
-            yield i
-        i += 1
 
+COPRIME_BOUND = 1000     # coprimes_gen: max prime factor to find by trial division
+WHEEL_SIZE = 1 << 16     # coprimes_gen: max product of prime factors used as wheel
+
+TRIAL_BOUND = 1000       # factorize: max prime factor found by trial division
+SPF_LIMIT = 1 << 22      # factorize_many: max number in its smallest prime factor table (16 MB)
 
-def coprimes(n, min=3):
-    '''list of coprime numbers'''
-    return list(coprimes_gen(n, min=min))
+LCG_A = 1103515245       # lcg: multiplier, as glibc
+LCG_C = 12345            # lcg: increment
+LCG_M = 2 << 31          # lcg: modulus, this is 2^32
+LCG_LANES = 1024         # lcg_fill: numbers computed at a time
+
+
+def coprimes_gen(n, min=2, factors=None):
+    '''coprime numbers generator
+    
+    params
+      - n          int - number to get coprimes of
+      - min        int - min coprime to yield
+      - factors    iterable of int - if not None, they must be all the prime factors of n
+    
+    return a generator of coprimes of n from min to n
+    
+    remark. prime factors of n up to COPRIME_BOUND are found by trial division; they make
+            a wheel of residues coprime with their product, so non coprimes multiple of
+            them are skipped without testing; the other candidates are tested with gcd
+            against the rest of n (if any)
+    '''
+    if min < 2 or min >= n: raise ValueError(f"min < 2 or min >= n") # min coprime is 2
+    if factors is None:
+        factors, rest = prime_factors(n, bound=COPRIME_BOUND)
+    else:
+        factors, rest = sorted(set(factors)), 1
+    wheel = 1
+    for p in factors:
+        wheel *= p
+    if wheel > WHEEL_SIZE:                                # too many spokes: test factors one by one
+        for i in range(min, n + 1):
+            if all(i % p for p in factors) and (rest == 1 or math.gcd(i, rest) == 1):
+                yield i
+        return
+    spokes = [r for r in range(wheel) if all(r % p for p in factors)]   # residues coprime with wheel
+    base = min - min % wheel
+    while True:
+        for r in spokes:
+            i = base + r
+            if i < min:
+                continue
+            if i > n:
+                return
+            if rest == 1 or math.gcd(i, rest) == 1:
+                yield i
+        base += wheel
+
+
+def coprimes(n, min=3, factors=None, asarray=False):
+    '''list of coprime numbers
+    
+    params
+      - n          int - number to get coprimes of
+      - min        int - min coprime to list
+      - factors    iterable of int - if not None, they must be all the prime factors of n
+      - asarray    bool - if True return an array of unsigned ints, instead of a list
+    
+    return a list (or array) of coprimes of n from min to n
+    
+    remark. it factorizes n and sieves out the multiples of its prime factors from a bytearray
+    '''
+    if min < 2 or min >= n: raise ValueError(f"min < 2 or min >= n")
+    if factors is None:
+        factors = factorize(n)
+    sieve = bytearray([1]) * (n + 1 - min)           # sieve[i-min] is 1 if i is coprime of n
+    for p in set(factors):
+        first = -min % p                                # index of the 1st multiple of p
+        sieve[first::p] = bytes(len(range(first, len(sieve), p)))
+    result = compress(range(min, n + 1), sieve)
+    if asarray:
+        return array(UINT32 if n < (1 << 32) else 'Q', result)
+    return list(result)
+
+
+def prime_factors(n, bound=None):
+    '''distinct prime factors of n, by trial division
+    
+    params
+      - n          int - number to factor, > 1
+      - bound      int - max factor to try; if None, n will be factored completely
+    
+    return (factors, rest,)   factors is the sorted list of the distinct prime factors found, 
+                              rest is n divided by them, as many times as possible;
+                              if bound is None rest is 1
+    '''
+    if n <= 1: raise ValueError(f"argument <= 1")
+    factors = []
+    p = 2
+    while p * p <= n and (bound is None or p <= bound):
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1 if p == 2 else 2
+    if n > 1 and (bound is None or n <= bound or p * p > n):    # what remains is prime
+        factors.append(n)
+        n = 1
+    return (factors, n,)
 
 
 def primes_gen(min=2, max=100):
@@ -122,6 +228,140 @@ def is_prime(n):
     return True
 
 
+def factorize(n, spf=None):
+    '''prime factorization
+    
+    params
+      - n          int - number to factor, > 1
+      - spf        array | memoryview - smallest prime factor table, as spf_sieve(limit); used if n <= limit
+    
+    return a dict {prime: exponent}, sorted by prime
+    
+    remark. primes up to TRIAL_BOUND are removed by trial division; then each 
+            remaining factor is checked by is_prime_mr and, if composite, split
+            by pollard_brent, until all factors are primes
+    '''
+    if n <= 1: raise ValueError(f"argument <= 1")
+    result = {}
+    if spf is not None and n < len(spf):
+        while n > 1:
+            p = spf[n]
+            result[p] = result.get(p, 0) + 1
+            n //= p
+        return result
+    for p in _trial_primes():
+        if p * p > n:
+            break
+        while n % p == 0:
+            result[p] = result.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if m <= TRIAL_BOUND ** 2 or is_prime_mr(m, k=40):     # no factor <= TRIAL_BOUND: m is prime
+            result[m] = result.get(m, 0) + 1
+        else:
+            d = pollard_brent(m)
+            stack.extend((d, m // d))
+    return dict(sorted(result.items()))
+
+
+def factorize_many(numbers):
+    '''prime factorizations of a lot of small numbers
+    
+    params numbers   iterable of int - numbers to factor, each > 1
+    return a list of dicts {prime: exponent}, one for each number
+    
+    remark. it uses one smallest prime factor table, up to the max number but not over
+            SPF_LIMIT: larger numbers are factored by factorize; the table isn't memoised
+    '''
+    numbers = list(numbers)
+    spf = _spf_table(min(max(numbers), SPF_LIMIT)) if numbers else None
+    return [factorize(n, spf=spf) for n in numbers]
+
+
+def spf_sieve(limit):
+    '''smallest prime factor table, memoised
+    
+    params limit     int - max number in table
+    return a read only memoryview of unsigned ints, where item n is the smallest prime factor of n
+           (0 and 1 map to themselves)
+    
+    remark. the table is shared by later calls (and factorize_many): it can't be written
+    '''
+    return memoryview(_spf_sieve(limit)).toreadonly()
+
+
+@lru_cache(maxsize=4)
+def _spf_sieve(limit):
+    '''smallest prime factor table, as an array (spf_sieve without view)'''
+    return _spf_table(limit)
+
+
+def _spf_table(limit):
+    '''smallest prime factor table, as a new array
+    
+    remark. it assigns the multiples of each prime p as a slice, starting at p*p;
+            primes are in decreasing order, so the smallest prime factor is the last written
+    '''
+    if limit < 1 or limit >= (1 << 32): raise ValueError(f"limit out of range")
+    spf = array('I', range(limit + 1))
+    root = math.isqrt(limit)
+    sieve = bytearray([1]) * (root + 1)                 # primes up to sqrt(limit)
+    for p in range(2, math.isqrt(root) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, root + 1, p)))
+    for p in range(root, 1, -1):
+        if sieve[p]:
+            spf[p * p::p] = array('I', [p]) * len(range(p * p, limit + 1, p))
+    return spf
+
+
+def pollard_brent(n):
+    '''a non trivial factor of n, by Pollard's rho algorithm with Brent's cycle detection
+    
+    params n      int - a composite number
+    return a factor of n, different from 1 and n
+    
+    remark. from R. P. Brent, "An improved Monte Carlo factorization algorithm", 1980;
+            products of m differences are taken before computing the gcd;
+            if the gcd is n, steps are done again one at a time from the last product;
+            if this fails too, it retries with another random polynomial y^2 + c
+    '''
+    if n % 2 == 0:
+        return 2
+    m = 128
+    while True:
+        y, c = randrange(1, n), randrange(1, n)
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+@lru_cache(maxsize=1)
+def _trial_primes():
+    '''primes up to TRIAL_BOUND, for factorize'''
+    return tuple(primes(max=TRIAL_BOUND))
+
+
 def is_coprime(a, b):
     return True if gcd(a, b) == 1 else False
     
@@ -140,6 +380,7 @@ def generate_prime_candidate(length):
         
         rem. from https://medium.com/@prudywsh/how-to-generate-big-prime-numbers-miller-rabin-49e6e6af32fb
     """
+    from secrets import randbits
     # generate random bits
     p = randbits(length)
     # apply a mask to set MSB and LSB to 1
@@ -180,18 +421,100 @@ def lcg(seed=0):
     '''pseudorandom numbers using a linear congruential generator
         
         param  seed       int - an initial value
-        return a generator of float pseudorandom number in interval (0, 1]
+        return a generator of float pseudorandom number in interval [0, 1)
         
         remark - constants are from wikipedia (https://en.wikipedia.org/wiki/Linear_congruential_generator) 
                      as glibc used by GCC
                - calculates pseudorandom number as Y_{i+1} = (a * Y_i + c ) mod m
     '''
-    a = 1103515245
-    c = 12345
-    m = 2 << 31       # this is 2^31
+    a = LCG_A
+    c = LCG_C
+    m = LCG_M
     while True:
         seed = (a * seed + c) % m               # see remarks
-        yield (seed & 0x3fffffff) / (2 << 29)   # last 30 bits, divided by 2^29 to adjust in interval (0,1]
+        yield (seed & 0x3fffffff) / (2 << 29)   # last 30 bits, divided by 2^30 to adjust in interval [0,1)
+
+
+def lcg_fill(n, seed=0, typecode='d'):
+    '''a batch of pseudorandom numbers using the linear congruential generator of lcg
+    
+        params
+          - n          int - how many numbers to make
+          - seed       int - an initial value
+          - typecode   str - 'd': floats in [0, 1), as lcg
+                             'I': ints, the 30 bits of which the floats are made
+        return an array of n numbers, the same as the first n numbers of lcg(seed)
+        
+        remark - it computes LCG_LANES numbers at a time: each one is a lane of 64 bits of
+                     a big int, and a lane jumps ahead LCG_LANES steps with a big int
+                     multiply, add and mask (a * Y < 2^64 doesn't overflow the lane)
+               - use lcg_skip to get the seed of the next batch, or of an independent stream
+    '''
+    if typecode not in ('d', 'I'): raise ValueError(f"typecode must be 'd' or 'I'")
+    lanes = max(1, min(n, LCG_LANES))
+    mask = LCG_M - 1
+    first = array('Q')                              # first numbers: one in each lane
+    for _ in range(lanes):
+        seed = (LCG_A * seed + LCG_C) & mask        # mod m, as m is a power of 2
+        first.append(seed)
+    jump_c = lcg_skip(0, lanes)                     # Y -> jump_a * Y + jump_c are "lanes" steps
+    jump_a = (lcg_skip(1, lanes) - jump_c) % LCG_M
+    nbytes = first.itemsize * lanes
+    ones = int.from_bytes(array('Q', [1] * lanes).tobytes(), sys.byteorder)
+    mask_m, mask_30, add_c = mask * ones, 0x3fffffff * ones, jump_c * ones
+    x = int.from_bytes(first.tobytes(), sys.byteorder)
+    bits = array('Q')
+    for _ in range(-(-n // lanes)):
+        bits.frombytes((x & mask_30).to_bytes(nbytes, sys.byteorder))   # last 30 bits, as lcg
+        x = ((x * jump_a) & mask_m) + add_c & mask_m
+    del bits[n:]
+    if typecode == 'I':
+        return array('I', bits)
+    scale = 1 / (2 << 29)
+    return array('d', [item * scale for item in bits])
+
+
+def lcg_skip(seed, steps):
+    '''jump ahead the linear congruential generator of lcg
+    
+        params
+          - seed       int - current value
+          - steps      int - how many numbers to skip
+        return the value after steps numbers, in O(log(steps)) operations
+        
+        remark. it composes Y -> a*Y + c with itself, by squaring:
+                    steps times it is Y -> A*Y + C, with A = a^steps and
+                    C = c * (a^(steps-1) + ... + a + 1) (mod m)
+                from F. Brown, "Random number generation with arbitrary strides", 1994
+    '''
+    if steps < 0: raise ValueError(f"steps < 0")
+    m = LCG_M
+    acc_a, acc_c = 1, 0                         # composition to return: identity
+    cur_a, cur_c = LCG_A, LCG_C                 # composition of 2^k steps
+    while steps > 0:
+        if steps & 1:
+            acc_a = acc_a * cur_a % m
+            acc_c = (acc_c * cur_a + cur_c) % m
+        cur_c = (cur_a + 1) * cur_c % m
+        cur_a = cur_a * cur_a % m
+        steps >>= 1
+    return (acc_a * seed + acc_c) % m
+
+
+def lcg_streams(nstreams, size, seed=0):
+    '''seeds of independent (not overlapping) streams of the lcg generator
+    
+        params
+          - nstreams   int - number of streams
+          - size       int - numbers in each stream
+          - seed       int - seed of the 1st stream
+        return a list of seeds; lcg_fill(size, seed=seeds[i]) is the i-th stream, i.e.
+               numbers from i*size to (i+1)*size-1 of lcg(seed)
+    '''
+    result = [seed]
+    for _ in range(1, nstreams):
+        result.append(lcg_skip(result[-1], size))
+    return result
 
 
 def equiv_list(m, a=0, max_q=5):
@@ -239,52 +562,56 @@ def egcd(a, b):
     
     params: a, b     int - numbers to get GCD
     returns (g, x, y,)
-    note. remember ax+by = gcd(a, b)
+    note. 
+      - remember ax+by = gcd(a, b)
+      - iterative version of the recursive algorithm "egcd(b % a, a)", with the same results:
+          x0, x1 are the coefficients of a, y0, y1 the ones of b
     '''
     if a < 0 or b < 0:
         raise ValueError(f"there is a negative argument")
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while a != 0:
+        q = b // a
+        b, a = a, b - q * a
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return (b, y0, x0)
 
 
 def gcd(a, b):
-    '''euclidean algorithm to Greatest Common Divisor
+    '''Greatest Common Divisor
     
     params a, b    int - both >0, integers to discover gcd
     
     return the gcd as an int
     
-    remark. from https://en.wikipedia.org/wiki/Euclidean_algorithm
+    remark. it delegates to math.gcd, that uses the euclidean algorithm 
+            (https://en.wikipedia.org/wiki/Euclidean_algorithm) accelerated
+            by Lehmer's method for big ints
     '''
     if a < 0 or b < 0:
         raise ValueError(f"there is a negative argument")
-    while b != 0:
-        t = b
-        b = a % b
-        a = t
-    return a
+    return math.gcd(a, b)
 
 
 def invmod(a, m):
-    '''modular multiplicative inverse of "a" (mod m), using egcd
+    '''modular multiplicative inverse of "a" (mod m)
     
     parameters
       - a        int - number to invert
       - m        int - modulus
     return a^-1(mod m)        an int - if it exists
            raise valueError if it doesn't exist
-    note. remember: a * x ≡ 1 (mod m); where x is the modular multiplicative inverse of a
+    note. 
+      - remember: a * x ≡ 1 (mod m); where x is the modular multiplicative inverse of a
+      - it uses pow(a, -1, m)
     '''
     if a < 0:
         a = a % m
-    g, x, y = egcd(a, m)
-    if g != 1:
-        raise ValueError(f"{a} doesn't have an inverse under modulo {m}")
-    else:
-        return x % m
+    try:
+        return pow(a, -1, m)
+    except ValueError:                  # a isn't invertible
+        raise ValueError(f"{a} doesn't have an inverse under modulo {m}") from None
 
 
 def main():
@@ -0,0 +1,122 @@
+# :filename: pbkdf2.py key derivation using PBKDF2 with HMAC-SHA1 (RFC 8018)
+#
+# DK = T1 || T2 || ... (first dklen bytes)
+# where: Ti        U1 xor U2 xor ... xor Uc            c: n.of iterations
+#        U1        hmac(password, salt || i)           i: 4 bytes, big endian
+#        Uj        hmac(password, Uj-1)
+#
+# every Uj (j > 1) is the hmac of 20 bytes: from the hmac states of the
+# password (see hmac_sha1.py) it is only 2 compressions of a single block, whose
+# padding is always the same. The two blocks are lists of 80 int words reused
+# in place (see sha1.compress_words): an iteration only writes the 5 words of
+# the previous hash in them
+#
+# use:
+#   dk = pbkdf2_sha1(password, salt, iterations, dklen=32)     # bytes
+#   dk = pbkdf2_sha1(password, salt, iterations, dklen=64, jobs=4)   # blocks Ti in 4 processes
+
+
+# import std libs
+#   concurrent.futures is imported where it is used: importing this module stays light
+import os
+import struct
+
+# import user libs
+if __package__:                          # imported as a module of package "source"
+    from . import hmac_sha1
+    from . import sha1
+else:                                    # run as script, or imported from its directory
+    import hmac_sha1
+    import sha1
+
+DIGEST_SIZE = sha1.Sha1.DIGEST_SIZE              # bytes of each block Ti
+_LENGTH = 8 * (sha1.Sha1.BLOCK_SIZE + DIGEST_SIZE)   # bits hashed by an hmac of Uj-1: a key block and 20 bytes
+
+
+def _block_words(h):
+    '''a block holding the 5 words h, padded as the last block of a hmac
+       message of 20 bytes, with room for the message schedule (80 words)
+    '''
+    w = [0] * 80
+    w[:5] = h
+    w[5] = 0x80000000                             # bit 1
+    w[15] = _LENGTH
+    return w
+
+
+def pbkdf2_block(password, salt, iterations, index):
+    '''block Ti of the derived key
+
+       params
+         - password     bytes-like
+         - salt         bytes-like
+         - iterations   int - n.of hmacs, c
+         - index        int - i, from 1
+
+       return bytes - DIGEST_SIZE bytes
+    '''
+    mac = hmac_sha1.hmac_sha1(password)
+    inner, outer = mac.inner.h, mac.outer.h       # states after the key blocks
+    u = struct.unpack('>5I', mac.digest(bytes(salt) + index.to_bytes(4, 'big')))
+    t0, t1, t2, t3, t4 = u
+    wi, wo = _block_words(u), _block_words(u)     # blocks of the inner and outer hashes, reused
+    compress_words = sha1.compress_words
+    for _ in range(iterations - 1):
+        wi[:5] = u
+        wo[:5] = compress_words(inner, wi)
+        u = compress_words(outer, wo)
+        t0 ^= u[0]
+        t1 ^= u[1]
+        t2 ^= u[2]
+        t3 ^= u[3]
+        t4 ^= u[4]
+    return struct.pack('>5I', t0, t1, t2, t3, t4)
+
+
+def _block_task(args):
+    '''pbkdf2_block(*args), in a worker process'''
+    return pbkdf2_block(*args)
+
+
+def pbkdf2_sha1(password, salt, iterations, dklen=None, jobs=1):
+    '''derive a key from password, as PBKDF2 with HMAC-SHA1
+
+       params
+         - password     bytes-like (str is encoded as utf-8)
+         - salt         bytes-like (str is encoded as utf-8)
+         - iterations   int - n.of hmacs for each block (at least 1)
+         - dklen        int - length in bytes of the derived key (default DIGEST_SIZE)
+         - jobs         int - n.of worker processes computing the blocks; None: os.cpu_count(); 1 (default): no pool
+
+       return bytes - the derived key, dklen bytes
+
+       note. blocks of DIGEST_SIZE bytes are independent: when dklen needs
+             more than one of them they can be computed in a process pool (jobs != 1)
+    '''
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    if isinstance(salt, str):
+        salt = salt.encode('utf-8')
+    if iterations < 1:
+        raise ValueError('iterations must be at least 1')
+    dklen = DIGEST_SIZE if dklen is None else dklen
+    if dklen < 1:
+        raise ValueError('dklen must be at least 1')
+    nblocks = -(-dklen // DIGEST_SIZE)
+    tasks = [(bytes(password), bytes(salt), iterations, index) for index in range(1, nblocks + 1)]
+    jobs = min(jobs or os.cpu_count() or 1, nblocks)
+    if jobs == 1:
+        return b''.join(map(_block_task, tasks))[:dklen]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return b''.join(executor.map(_block_task, tasks))[:dklen]
+
+
+def main():
+    # test vector from RFC 6070
+    print(pbkdf2_sha1(b'password', b'salt', 4096).hex())
+    print('4b007901b765489abead49d926f721d065a429c1')
+
+
+if __name__ == '__main__':
+    main()
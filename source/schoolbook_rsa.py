@@ -6,13 +6,28 @@
 #        key distribution (not here)
 #        encryption
 #        decription
+#
+# bulk operations:
+#     - encrypt_many / decrypt_many       integers (python) GENERATORS, decrypt_many can use a process pool
+#     - encrypt_bytes / decrypt_bytes     byte strings, split in blocks of plain_block_size(n) bytes
+#     - encrypt_stream / decrypt_stream   binary files, read in chunks and written as fixed-width blocks
+#
+# byte blocks: plaintext is padded with 0x80 0x00 ... 0x00 (ISO/IEC 7816-4) to a multiple of
+#     plain_block_size(n) bytes, so the last block doesn't need a stored length; each block is
+#     converted to an int with int.from_bytes(..., 'big') and each ciphertext int is written
+#     in cipher_block_size(n) bytes
+
 
+# import std libs
+#   concurrent.futures is imported where it is used: importing this module stays light
+from functools import partial
+from itertools import islice
 
 # import user libs
-try:
+if __package__:                          # imported as a module of package "source"
+    from . import numbers_ops as nops
+else:                                    # run as script, or imported from its directory
     import numbers_ops as nops
-except:
-    import source.numbers_ops as nops
 
 
 def keys(prime_len=10, p=None, q=None):
@@ -47,8 +62,9 @@ def keys(prime_len=10, p=None, q=None):
     cgen = nops.coprimes_gen(lambda_n, min=min)       # coprimes generator starting @ min, stopping @ lambda_n
     e = next(cgen)                                    # 1st coprime (usually 65537)
 
-    #    Determine d as d ≡ e^−1 (mod lambda_n); that is, d is the modular multiplicative inverse of e modulo lambda_n. Use egcd(e, lambda_n) because they are coprime, so equation is a form of Bézout's identity, where d is one of the coefficients. d is kept secret as the private key exponent.
-    _, d, _ = nops.egcd(e, lambda_n)
+    #    Determine d as d ≡ e^−1 (mod lambda_n); that is, d is the modular multiplicative inverse of e modulo lambda_n. d is kept secret as the private key exponent.
+    #    rem. d must be positive: the Bézout coefficient given by egcd(e, lambda_n) can be negative, and pow(0, -d, n) raises ValueError
+    d = nops.invmod(e, lambda_n)
 
     return ((n, e,), (n, d,),)          # (public_key,  private_key, )
 
@@ -77,6 +93,243 @@ def decrypt(y, pri):
     return pow(y, pri[1], pri[0])
 
 
+def crack(pub):
+    '''private key from public key, factoring n
+    
+       args
+           - pub   (n, e,) - public key
+       
+       return private key (n, d,)
+       
+       rem. feasible only for small n, as the ones of keys with a small prime_len:
+            it is here to teach (or to audit) why n must be big
+    '''
+    n, e = pub
+    factors = nops.factorize(n)
+    if len(factors) != 2 or set(factors.values()) != {1}:
+        raise ValueError("n is not the product of two distinct primes")
+    p, q = factors
+    lambda_n = nops.lcm(p - 1, q - 1)
+    return (n, nops.invmod(e, lambda_n),)
+
+
+def plain_block_size(n):
+    '''max number of plaintext bytes in one block: their int must be < n'''
+    size = (n.bit_length() - 1) // 8
+    if size < 1:
+        raise ValueError("modulus too small to hold a byte")
+    return size
+
+
+def cipher_block_size(n):
+    '''number of bytes of one ciphertext block: enough to hold any int < n'''
+    return (n.bit_length() + 7) // 8
+
+
+def encrypt_many(xs, pub):
+    '''encrypt ints using public key
+    
+       args
+           - xs    iterable of int - each < n, coded plaintexts
+           - pub   (n, e,) - public key
+       
+       return a generator of ciphertexts as ints
+    '''
+    n, e = pub
+    for x in xs:
+        yield pow(x, e, n)
+
+
+def decrypt_many(ys, pri, processes=None, chunksize=1024):
+    '''decrypt ints using private key
+    
+       args
+           - ys          iterable of int - ciphertexts
+           - pri         (n, d,) - private key
+           - processes   int - if not None, number of worker processes to use
+           - chunksize   int - ciphertexts sent to a worker at a time
+       
+       return a generator of plaintexts as ints, in the same order of ys
+    '''
+    if processes is None:
+        n, d = pri
+        for y in ys:
+            yield pow(y, d, n)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        ys = iter(ys)
+        decrypt_pri = partial(decrypt, pri=pri)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            group = list(islice(ys, chunksize * processes))  # bounded: executor.map would read all ys at once
+            while group:
+                yield from executor.map(decrypt_pri, group, chunksize=chunksize)
+                group = list(islice(ys, chunksize * processes))
+
+
+def bytes_to_blocks(data, size):
+    '''split (padded) data in blocks of size bytes
+    
+       args
+           - data   bytes-like - its length must be a multiple of size
+           - size   int - bytes in a block
+       
+       return a generator of blocks as ints (big endian)
+    '''
+    data = memoryview(data)
+    if len(data) % size != 0:
+        raise ValueError("data length is not a multiple of block size")
+    for start in range(0, len(data), size):
+        yield int.from_bytes(data[start:start + size], 'big')
+
+
+def blocks_to_bytes(xs, size):
+    '''join ints as blocks of size bytes (big endian)'''
+    return b''.join(x.to_bytes(size, 'big') for x in xs)
+
+
+def plain_blocks_to_bytes(xs, size):
+    '''join decrypted ints as blocks of size bytes (big endian)
+
+       rem. a wrong private key or a corrupt ciphertext can give a block
+            that doesn't fit in size bytes: ValueError
+    '''
+    limit = 1 << (8 * size)
+    xs = list(xs)
+    if any(x >= limit for x in xs):
+        raise ValueError("bad key or corrupt ciphertext")
+    return blocks_to_bytes(xs, size)
+
+
+def pad(data, size):
+    '''pad data with 0x80 0x00 ... 0x00 to a multiple of size bytes'''
+    return bytes(data) + b'\x80' + bytes((-len(data) - 1) % size)
+
+
+def unpad(data):
+    '''remove the padding added by pad'''
+    end = data.rfind(b'\x80')
+    if end < 0 or any(data[end + 1:]):
+        raise ValueError("wrong padding")
+    return data[:end]
+
+
+def encrypt_bytes(data, pub):
+    '''encrypt a byte string using public key
+    
+       args
+           - data  bytes-like - plaintext
+           - pub   (n, e,) - public key
+       
+       return ciphertext as bytes, a block of cipher_block_size(n) bytes
+              for each block of plain_block_size(n) bytes of padded plaintext
+    '''
+    n = pub[0]
+    blocks = bytes_to_blocks(pad(data, plain_block_size(n)), plain_block_size(n))
+    return blocks_to_bytes(encrypt_many(blocks, pub), cipher_block_size(n))
+
+
+def decrypt_bytes(data, pri, processes=None):
+    '''decrypt a byte string using private key
+    
+       args
+           - data        bytes-like - ciphertext, as made by encrypt_bytes
+           - pri         (n, d,) - private key
+           - processes   int - if not None, number of worker processes to use
+       
+       return plaintext as bytes
+    '''
+    n = pri[0]
+    blocks = bytes_to_blocks(data, cipher_block_size(n))
+    return unpad(plain_blocks_to_bytes(decrypt_many(blocks, pri, processes=processes), plain_block_size(n)))
+
+
+def read_exactly(fin, size):
+    '''read size bytes from a binary file, less only at end of file
+    
+       rem. a raw file or a pipe can return less bytes than asked for
+    '''
+    chunk = fin.read(size)
+    if not chunk or len(chunk) == size:
+        return chunk
+    chunks = [chunk]
+    size -= len(chunk)
+    while size > 0:
+        chunk = fin.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_blocks(fin, size, nblocks=1024):
+    '''read a binary file as blocks of size bytes, nblocks at a time
+    
+       return a generator of blocks as ints (big endian)
+    '''
+    chunk = read_exactly(fin, size * nblocks)
+    while chunk:
+        yield from bytes_to_blocks(chunk, size)
+        chunk = read_exactly(fin, size * nblocks)
+
+
+def encrypt_stream(fin, fout, pub, nblocks=1024):
+    '''encrypt a binary file using public key
+    
+       args
+           - fin       binary file - plaintext, read nblocks plaintext blocks at a time
+           - fout      binary file - where to write ciphertext
+           - pub       (n, e,) - public key
+           - nblocks   int - blocks to read at a time
+       
+       return number of plaintext bytes read
+    '''
+    n = pub[0]
+    psize, csize = plain_block_size(n), cipher_block_size(n)
+    total = 0
+    chunk = read_exactly(fin, psize * nblocks)
+    while True:
+        nxt = read_exactly(fin, psize * nblocks)
+        total += len(chunk)
+        if not nxt:                             # last chunk: pad it
+            chunk = pad(chunk, psize)
+        fout.write(blocks_to_bytes(encrypt_many(bytes_to_blocks(chunk, psize), pub), csize))
+        if not nxt:
+            return total
+        chunk = nxt
+
+
+def decrypt_stream(fin, fout, pri, nblocks=1024, processes=None):
+    '''decrypt a binary file using private key
+    
+       args
+           - fin         binary file - ciphertext, as made by encrypt_stream
+           - fout        binary file - where to write plaintext
+           - pri         (n, d,) - private key
+           - nblocks     int - blocks to read at a time
+           - processes   int - if not None, number of worker processes to use
+       
+       return number of plaintext bytes written
+    '''
+    n = pri[0]
+    psize, csize = plain_block_size(n), cipher_block_size(n)
+    total = 0
+    xs = decrypt_many(read_blocks(fin, csize, nblocks), pri, processes=processes)
+    group = list(islice(xs, nblocks))
+    if not group:
+        raise ValueError("empty ciphertext")
+    while True:
+        nxt = list(islice(xs, nblocks))         # last group is held back to remove padding
+        chunk = plain_blocks_to_bytes(group, psize)
+        if not nxt:
+            chunk = chunk[:-psize] + unpad(chunk[-psize:])
+        fout.write(chunk)
+        total += len(chunk)
+        if not nxt:
+            return total
+        group = nxt
+
+
 def main():
     public, private = keys()
     print(f"public key: {public}, private key: {private}")
@@ -20,13 +20,35 @@
 # use: s = sha1(msg)
 # where: s         int - the sha-1 code of message msg
 #        msg       nbitarray - the message to compute: NBitArray(message_as_bytestring)
+#                  or a file path, or a bytes-like (bytes, mmap, memoryview, ...): it is read
+#                  by 64 bytes blocks straight from the buffer (a file is mapped by mmap)
+#
+# note. hash_computation, msg_schedule and round work on words.Word32: a word
+#       is a single int object, masked to 32 bits by its operations
+#
+# or, to hash a message arriving in chunks (e.g. a file read a piece at a time):
+#        h = Sha1()
+#        h.update(chunk)           # chunk: bytes-like; as many times as needed
+#        h.digest()                # 20 bytes; h.hexdigest() as 40 hex digits; h.to_int() as sha1()
+#        h.copy()                  # a new hasher going on from the same state
+#
+# or, to hash a lot of small messages in a call:
+#        sha1_many(messages, jobs=)   # a list of int, as sha1(); messages: iterable of bytes-like
 
 
+# import std libs
+import struct
+
 # import user libs
-try:
+if __package__:                          # imported as a module of package "source"
+    from . import nbitarray as nba
+    from .words import Word32
+else:                                    # run as script, or imported from its directory
     import nbitarray as nba
-except:
-    import source.nbitarray as nba
+    from words import Word32
+
+MASK = 0xffffffff                               # 32 bits
+_WORDS = struct.Struct('>16I')                   # a block as 16 words of 32 bits, big endian
 
 K = [
     0x5a827999,
@@ -42,6 +64,10 @@ F = [
     lambda b, c, d: b ^ c ^ d,
 ]
 
+H0_INT = (0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476, 0xc3d2e1f0, )   # H0 as int
+
+H0_WORDS = tuple(map(Word32, H0_INT))            # H0 as Word32, see words.py
+
 H0 = [
     nba.NBitArray([0x67, 0x45, 0x23, 0x01]),
     nba.NBitArray([0xef, 0xcd, 0xab, 0x89]),
@@ -54,17 +80,219 @@ H0 = [
 def sha1(msg):
     '''compute sha-1 of message
        
-       params msg     nbitarray - messsage to hash
+       params msg     nbitarray - messsage to hash; or
+                      str | os.PathLike - path of a file to hash (it is mapped in memory); or
+                      bytes-like - bytes, bytearray, mmap.mmap, memoryview, ... to hash
        
        return sha-1 hash of message as integer
+       
+       note. files and bytes-like are read a block at a time from the
+             buffer, by Sha1, without copying them
+    '''
+    if not isinstance(msg, nba.NBitArray):
+        return Sha1().update_buffer(msg).to_int()
+    h = H0_WORDS                                  # init result H with H0
+    for block in msg.padded_blocks(md=512):       # blocks (xi) of 512 bits of the padded message; only the last ones are padded
+        h = hash_computation(block, h)            # for each block xi calculate H
+    return Sha1.words_to_int(h)                   # result as int
+
+
+class Sha1(object):
+    '''incremental sha-1: message is given by chunks of bytes
+    
+       instance data:
+         - h          tuple of 5 int - hash of the blocks processed up to now (32 bits words)
+         - length     int - n.of bytes given up to now
+    
+       note. blocks of 64 bytes (512 bits) are read by compress straight
+             from the given buffer, as soon as they are complete; only
+             the incomplete tail (< 64 bytes) is copied and kept until the
+             next update. Padding is applied by digest, that doesn't change
+             the instance
+       note. other hashes of the same family (see sha256.py) are subclasses
+             that change H0, DIGEST_SIZE and compress
+    '''
+    BLOCK_SIZE = 64                               # bytes
+    DIGEST_SIZE = 20                              # bytes
+    H0 = H0_INT
+    
+    def __init__(self, data=b''):
+        self.h = self.H0
+        self.length = 0
+        self._tail = b''
+        if data:
+            self.update(data)
+    
+    @staticmethod
+    def compress(h, block, offset=0):
+        return compress(h, block, offset)
+    
+    def copy(self):
+        '''a new hasher with the same state: it goes on from the message given up to now'''
+        result = type(self)()
+        result.h, result.length, result._tail = self.h, self.length, self._tail
+        return result
+    
+    def update(self, data):
+        '''add data (bytes-like: bytes, bytearray, mmap, memoryview, ...) to the message'''
+        compress = self.compress
+        with memoryview(data) as raw, raw.cast('B') as view:
+            size = len(view)
+            self.length += size
+            h, ndx = self.h, 0
+            if self._tail:                            # complete the previous tail
+                ndx = min(size, self.BLOCK_SIZE - len(self._tail))
+                self._tail += view[:ndx].tobytes()
+                if len(self._tail) < self.BLOCK_SIZE:
+                    return self
+                h = compress(h, self._tail)
+            end = size - (size - ndx) % self.BLOCK_SIZE
+            for offset in range(ndx, end, self.BLOCK_SIZE):
+                h = compress(h, view, offset)
+            self.h = h
+            self._tail = view[end:].tobytes()
+        return self
+    
+    def update_buffer(self, source):
+        '''add the bytes of a file path or of a bytes-like to the message, by
+           windows of WINDOW bytes; pages of a mapped file are released after use
+        '''
+        with nba.Buffer(source) as buf:
+            for start in range(0, len(buf.view), WINDOW):
+                self.update(buf.view[start:start + WINDOW])
+                buf.release(start, start + WINDOW)
+        return self
+    
+    def to_int(self):
+        '''hash of the message given up to now, as integer (as sha1())'''
+        tail = nba.md_padding(self._tail, 8 * self.length)
+        h = self.h
+        for offset in range(0, len(tail), self.BLOCK_SIZE):
+            h = self.compress(h, tail, offset)
+        return self.words_to_int(h)
+    
+    @classmethod
+    def words_to_int(cls, h):
+        '''words of the hash (32 bits each) as integer of DIGEST_SIZE bytes'''
+        result = 0
+        for word in h[:cls.DIGEST_SIZE // 4]:
+            result = (result << 32) | word
+        return result
+    
+    def digest(self):
+        '''hash of the message given up to now, as DIGEST_SIZE bytes'''
+        return self.to_int().to_bytes(self.DIGEST_SIZE, 'big')
+    
+    def hexdigest(self):
+        '''hash of the message given up to now, as 2 * DIGEST_SIZE hex digits'''
+        return self.digest().hex()
+
+
+def compress(h, block, offset=0):
+    '''hash computation of a block, on 32 bits words as int: the same of
+       hash_computation (with msg_schedule and round), without NBitArray
+    
+       params
+         - h          tuple of 5 int - 32 bits words
+         - block      bytes-like - a buffer with 64 bytes from offset
+         - offset     int - start of block in buffer
+       
+       return h: a tuple of 5 int
+    '''
+    w = list(_WORDS.unpack_from(block, offset))   # 16 words, big endian
+    w.extend(_SCHEDULE)
+    return compress_words(h, w)
+
+
+_SCHEDULE = (0, ) * 64                            # room for words 16-79 of the message schedule
+
+
+def compress_words(h, w):
+    '''hash computation of a block given as words, as compress
+    
+       params
+         - h          tuple of 5 int - 32 bits words
+         - w          list of 80 int - the 16 words (32 bits) of the block, then
+                      64 items overwritten by the message schedule: a caller
+                      hashing a lot of blocks can reuse the same list
+       
+       return h: a tuple of 5 int
+    '''
+    for j in range(16, 80):
+        x = w[j-3] ^ w[j-8] ^ w[j-14] ^ w[j-16]
+        w[j] = ((x << 1) | (x >> 31)) & MASK
+    a, b, c, d, e = h
+    k = K[0]
+    for j in range(0, 20):
+        a, b, c, d, e = ((((a << 5) | (a >> 27)) + ((b & c) | (~b & d)) + e + k + w[j]) & MASK,
+                         a, ((b << 30) | (b >> 2)) & MASK, c, d)
+    k = K[1]
+    for j in range(20, 40):
+        a, b, c, d, e = ((((a << 5) | (a >> 27)) + (b ^ c ^ d) + e + k + w[j]) & MASK,
+                         a, ((b << 30) | (b >> 2)) & MASK, c, d)
+    k = K[2]
+    for j in range(40, 60):
+        a, b, c, d, e = ((((a << 5) | (a >> 27)) + ((b & c) | (b & d) | (c & d)) + e + k + w[j]) & MASK,
+                         a, ((b << 30) | (b >> 2)) & MASK, c, d)
+    k = K[3]
+    for j in range(60, 80):
+        a, b, c, d, e = ((((a << 5) | (a >> 27)) + (b ^ c ^ d) + e + k + w[j]) & MASK,
+                         a, ((b << 30) | (b >> 2)) & MASK, c, d)
+    return ((h[0] + a) & MASK, (h[1] + b) & MASK, (h[2] + c) & MASK, (h[3] + d) & MASK, (h[4] + e) & MASK, )
+
+
+WINDOW = 1 << 24                                  # bytes of a mapped file hashed before releasing their pages
+
+
+def sha1_many(messages, jobs=1, chunksize=1024):
+    '''compute sha-1 of a lot of (small) messages
+    
+       params
+         - messages     iterable of bytes-like - messages to hash (it can be a lazy iterator)
+         - jobs         int - n.of worker processes; None: os.cpu_count(); 1: no pool
+         - chunksize    int - n.of messages sent to a worker at a time
+       
+       return a list of int, the sha-1 of each message (as sha1()), in the same order
+       
+       note. each message is padded as a whole and its blocks are compressed
+             on the same list of words (see compress_words): there isn't a
+             hasher, an NBitArray or a buffer mapping for each message
     '''
-    padded = msg.padding()                        # pad message as multiple of 512 bytes
-    blocks = padded.break_to_list(el=512)         # divide padded message in blocks (xi) of 512 bits
-    h = H0                                        # init result H with H0
-    for block in blocks:                          # for each block xi calculate H
-        h = hash_computation(block, h)
-    result = h[0] + h[1] + h[2] + h[3] + h[4]     # result as nbitarray
-    result =  result.to_int()                     # convet result to int
+    if jobs == 1:
+        return _sha1_chunk(messages)
+    import os
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import islice
+    jobs = jobs or os.cpu_count() or 1
+    messages = iter(messages)
+    result = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        inflight = deque()                            # futures in order of submission, at most 2 * jobs
+        while True:
+            while len(inflight) < 2 * jobs:
+                chunk = [bytes(msg) for msg in islice(messages, chunksize)]
+                if not chunk:
+                    break
+                inflight.append(executor.submit(_sha1_chunk, chunk))
+            if not inflight:
+                return result
+            result.extend(inflight.popleft().result())
+
+
+def _sha1_chunk(messages):
+    '''sha-1 of messages, as a list of int (sha1_many without pool)'''
+    w = [0] * 80                                   # words of a block, then its message schedule: reused
+    unpack_from, compress, padding = _WORDS.unpack_from, compress_words, nba.md_padding
+    result = []
+    for msg in messages:
+        with memoryview(msg) as raw, raw.cast('B') as view:
+            data = padding(view, 8 * len(view))   # the whole (small) message, padded; length in bytes, not items
+        h = H0_INT
+        for offset in range(0, len(data), 64):
+            w[:16] = unpack_from(data, offset)
+            h = compress(h, w)
+        result.append((h[0] << 128) | (h[1] << 96) | (h[2] << 64) | (h[3] << 32) | h[4])
     return result
 
 
@@ -72,43 +300,39 @@ def hash_computation(block, h):
     '''compute hash of input block
     
        params 
-         - block     nbitarray - block of text, len is 512 bits
-         - h         tuple of 5 nbitarray - each of 32 bits
+         - block     nbitarray - block of text, len is 512 bits; or bytes-like of 64 bytes
+         - h         tuple of 5 nbitarray | Word32 - each of 32 bits
+       
+       return h: a tuple of 5 instances (a, b, c, d , e,) each one of 32 bits, of the same type of h
        
-       return h: a tuple of 5 nbitarray instances (a, b, c, d , e,) each instance of 32 bits
+       note. rounds work on Word32 (see words.py): a word is a single int object
     '''
     wj = msg_schedule(block)
-    hi = h
-    mod = 2 << 31                               # 2 ** 32
+    hi = tuple(Word32(item.to_int()) for item in h)
     for roundn in range(0, 80):
         stage = roundn // 20 + 1
         hi = round(hi, wj[roundn], stage)
-    result = []
-    for ndx in range(0, len(hi)):
-        item  = h[ndx].to_int()
-        iitem = hi[ndx].to_int()
-        result.append( nba.NBitArray(nba.int_to_bit_list((item + iitem) % mod, length=32)) )
-    return tuple(result)
+    return tuple(h[ndx].add_mod(hi[ndx]) for ndx in range(0, len(hi)))
 
 
 def msg_schedule(block):
     '''computer a 32bit word for each round
     
-       params block      nbitarray - (padded) text of 512 bits
+       params block      nbitarray - (padded) text of 512 bits; or bytes-like of 64 bytes
     
-       return a tuple with 80 elements, each element is an nbitarray of 32 bits: (w0, w1, ... w79,)
+       return a tuple with 80 elements, each element is a Word32: (w0, w1, ... w79,)
        
        note with xi = break of h in 32 bits words
             wj[i] = xi[i]    if 0<=i<=15
             wj[i] = (wj[i-16] xor wj[i-14] xor wj[i-8] xor wj[i-3]) <<< 1
     '''
-    xi = block.break_to_list()
+    xi = Word32.unpack(block.to_bytes() if isinstance(block, nba.NBitArray) else block, count=16)
     wj = []
     for ndx in range(0, 80):
         if ndx < 16:
             wj.append(xi[ndx])
         else:
-            w = (wj[ndx-16] ^ wj[ndx-14] ^ wj[ndx-8] ^ wj[ndx-3]).__lshift__(1, circular=True)
+            w = (wj[ndx-16] ^ wj[ndx-14] ^ wj[ndx-8] ^ wj[ndx-3]).rotl(1)
             wj.append(w)
     return tuple(wj)
 
@@ -117,32 +341,20 @@ def round(h, wj, t):
     '''hash computation core function
     
        params: 
-         - h      tuple of 5 nbitarray instances - each instance of 32 bits
-         - wj     nbitarray instances - 32 bits
+         - h      tuple of 5 Word32 | nbitarray instances - each instance of 32 bits
+         - wj     Word32 | nbitarray instance - 32 bits
          - t      int - number of stage (from 1 to 4)
                
-       returns h: a tuple of 5 nbitarray instances (a, b, c. d. e,)
+       returns h: a tuple of 5 instances (a, b, c. d. e,), of the same type of h
     '''
     if t < 1 or t > 4:
         raise ValueError('number of stage out of permitted range (i.e. 1 to 4)')
     sa = h[0].__lshift__(5, circular=True)        # shifted "a"
     sb = h[1].__lshift__(30, circular=True)       # shifted "b"
-    a = h[0].to_int()
-    b = h[1].to_int()
-    c = h[2].to_int()
-    d = h[3].to_int()
-    e = h[4].to_int()
-    wj = wj.to_int()
-    sa = sa.to_int()
-    sb = sb.to_int()
-    f = F[t-1](b, c, d)
-    mod = 2 << 31                            # 2**32
-    result_a = nba.NBitArray(nba.int_to_bit_list((e + f + sa + wj + K[t-1]) % mod, length=32))
-    result_b = nba.NBitArray(nba.int_to_bit_list(a, length=32))
-    result_c = nba.NBitArray(nba.int_to_bit_list(sb, length=32))
-    result_d = nba.NBitArray(nba.int_to_bit_list(c, length=32))
-    result_e = nba.NBitArray(nba.int_to_bit_list(d, length=32))
-    return (result_a, result_b, result_c, result_d, result_e,)
+    a = F[t-1](h[1], h[2], h[3])                  # a new word: an NBitArray is updated in place, a Word32 replaced
+    for addend in (h[4], sa, wj, K[t-1]):
+        a = a.add_mod(addend, inplace=True)
+    return (a, h[0], sb, h[2], h[3],)
     
 
 def main():
@@ -0,0 +1,185 @@
+# :filename: sha1sum.py sha-1 of a lot of files, as the sha1sum command
+#
+# use:
+#   import sha1sum
+#
+#   sha1sum.digest_file(path)                     # sha-1 of a file as 40 hex digits
+#   for path, digest in sha1sum.digest_files(paths, jobs=4, ordered=False):
+#       print(sha1sum.format_line(path, digest))  # "digest  path": a line of "sha1sum" output
+#   for path, ok in sha1sum.check(open('SHA1SUMS')):   # as "sha1sum -c SHA1SUMS"
+#       print(f'{path}: {"OK" if ok else "FAILED"}')
+#
+# files are hashed in a process pool; at most max_inflight files are submitted
+# and not yet yielded, so memory doesn't grow with the number of paths, that
+# can be a (lazy) iterator. A file is mapped by mmap and hashed a block at a
+# time straight from the mapped memory (see sha1.sha1).
+#
+# a file that can't be read has digest None (sha1sum prints an error and
+# goes on).
+#
+# with a cache (see digest_cache.py), a file whose size, modification time
+# and inode didn't change isn't read again.
+
+
+# import std libs
+#   concurrent.futures is imported where it is used: importing this module stays light
+import os
+from itertools import islice
+
+# import user libs
+if __package__:                          # imported as a module of package "source"
+    from . import sha1
+else:                                    # run as script, or imported from its directory
+    import sha1
+
+def digest_file(path):
+    '''sha-1 of a file, as 40 hex digits
+
+       note. the file is mapped by mmap and read a block at a time (see sha1.sha1)
+    '''
+    return f'{sha1.sha1(path):0>40x}'
+
+
+def _digest_or_none(path):
+    '''digest_file, but None if the file can't be read'''
+    try:
+        return digest_file(path)
+    except OSError:
+        return None
+
+
+def _cached_or_none(path, cache):
+    '''(digest of path by cache, n.of hits, n.of misses,) of this lookup; digest None
+       if the file can't be read (a miss too, if it was looked up before reading it)
+    '''
+    hits, misses = cache.hits, cache.misses
+    try:
+        result = cache.digest(path)
+    except OSError:
+        result = None
+    return result, cache.hits - hits, cache.misses - misses
+
+
+def digest_files(paths, jobs=None, ordered=True, max_inflight=None, cache=None):
+    '''sha-1 of files, in a process pool
+
+       params
+         - paths          iterable of str - files to hash
+         - jobs           int - n.of worker processes; None: os.cpu_count(); 1: no pool
+         - ordered        bool - if True, results follow the order of paths; if False,
+                            they are yielded as soon as they are ready
+         - max_inflight   int - max n.of files submitted and not yet yielded (default 2 * jobs)
+         - cache          digest_cache.DigestCache - if given, unchanged files aren't read
+                            again; hits and misses of workers are added to its counters
+
+       return a (python) GENERATOR of (path, digest,); digest is 40 hex digits,
+              or None if the file can't be read
+    '''
+    if jobs == 1:
+        for path in paths:
+            yield path, _digest_or_none(path) if cache is None else _cached_or_none(path, cache)[0]
+        return
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    jobs = jobs or os.cpu_count() or 1
+    max_inflight = max(1, max_inflight or 2 * jobs)
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        inflight = {}                                  # {future: path}, in order of submission
+        def submit(items):
+            for path in items:
+                if cache is None:
+                    inflight[executor.submit(_digest_or_none, path)] = path
+                else:
+                    inflight[executor.submit(_cached_or_none, path, cache)] = path
+        try:
+            submit(islice(paths, max_inflight))
+            while inflight:
+                if ordered:
+                    done = (next(iter(inflight)),)     # the oldest one
+                else:
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = inflight.pop(future)
+                    result = future.result()
+                    if cache is not None:                  # counted by the copy of cache in the worker
+                        result, hits, misses = result
+                        cache.hits += hits
+                        cache.misses += misses
+                    yield path, result
+                    submit(islice(paths, 1))
+        finally:                                       # generator closed early: drop what isn't started
+            for future in inflight:
+                future.cancel()
+
+
+def format_line(path, digest):
+    '''a line of sha1sum output (without newline): "digest  path"
+
+       note. as sha1sum, if path has a backslash or a newline, they are
+             escaped and the line starts with a backslash
+    '''
+    if '\\' in path or '\n' in path:
+        return '\\' + digest + '  ' + path.replace('\\', '\\\\').replace('\n', '\\n')
+    return digest + '  ' + path
+
+
+def parse_line(line):
+    '''(digest, path,) from a line of sha1sum output
+
+       note. accept "digest  path" (text mode) and "digest *path" (binary mode)
+             and escaped lines (see format_line); raise ValueError on wrong lines
+    '''
+    line = line.rstrip('\r\n')
+    escaped = line.startswith('\\')
+    if escaped:
+        line = line[1:]
+    digest, sep, path = line[:40], line[40:42], line[42:]
+    if len(digest) != 40 or sep not in ('  ', ' *') or not path:
+        raise ValueError(f'improperly formatted sha1 checksum line: {line!r}')
+    int(digest, 16)                                    # ValueError if it isn't hex
+    if escaped:
+        chars, ndx = [], 0
+        while ndx < len(path):
+            if path[ndx] == '\\' and ndx + 1 < len(path):
+                chars.append('\n' if path[ndx + 1] == 'n' else path[ndx + 1])
+                ndx += 2
+            else:
+                chars.append(path[ndx])
+                ndx += 1
+        path = ''.join(chars)
+    return digest.lower(), path
+
+
+def check(lines, jobs=None, ordered=True, max_inflight=None, cache=None):
+    '''verify files listed in sha1sum output, as "sha1sum -c"
+
+       params
+         - lines         iterable of str - lines of sha1sum output (blank lines are skipped)
+         - others        as digest_files
+
+       return a (python) GENERATOR of (path, ok,); ok is True if the digest
+              matches, False if not, None if the file can't be read
+    '''
+    expected = {}                                      # {path: [digests]}: a path can be listed more times
+    def paths():
+        for line in lines:
+            if line.strip():
+                digest, path = parse_line(line)
+                expected.setdefault(path, []).append(digest)
+                yield path
+    for path, digest in digest_files(paths(), jobs=jobs, ordered=ordered, max_inflight=max_inflight, cache=cache):
+        wanted = expected[path].pop(0)
+        yield path, None if digest is None else digest == wanted
+
+
+def main():
+    here = os.path.abspath(__file__)
+    for path, digest in digest_files([here], jobs=1):
+        line = format_line(path, digest)
+        print(line)
+    for path, ok in check([line], jobs=1):
+        print(f'{path}: {"OK" if ok else "FAILED"}')
+
+
+if __name__ == '__main__':
+    main()
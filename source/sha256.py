@@ -0,0 +1,146 @@
+# :filename: sha256.py hash computation using sha-256 and sha-224 (sha-2 family)
+#
+# they use the same block pipeline of sha-1 (see sha1.py): message padded as
+# multiple of 512 bits, blocks of 512 bits, each one compressed with the hash of
+# the previous ones. Differences are in the compression function:
+#     - 8 words of 32 bits (a, b, c, d, e, f, g, h), H0 from square roots of the first 8 primes
+#     - for each block
+#         - 64 words wj: wj = xi_j if 0<=j<=15, else wj-16 + s0(wj-15) + wj-7 + s1(wj-2) mod 2^32
+#           with s0(x) = (x >>> 7) xor (x >>> 18) xor (x >> 3), s1(x) = (x >>> 17) xor (x >>> 19) xor (x >> 10)
+#         - 64 rounds, each one with a constant Kj (from cube roots of the first 64 primes)
+#         - Hi = add mod 2^32 the 8 words of Hi with the 8 words of Hi-1
+#     - sha-224 is sha-256 with other H0, truncated to 224 bits (the first 7 words)
+#
+# use: s = sha256(msg)           # or sha224(msg)
+# where: s         int - the hash of message msg
+#        msg       nbitarray - the message to compute: NBitArray(message_as_bytestring)
+#                  or a file path, or a bytes-like (bytes, mmap, memoryview, ...), as sha1.sha1
+#
+# or, to hash a message arriving in chunks:
+#        h = Sha256()              # or Sha224()
+#        h.update(chunk)           # chunk: bytes-like; as many times as needed
+#        h.digest()                # 32 bytes (28 for Sha224); h.hexdigest(); h.to_int() as sha256()
+#
+# note. compress works on ints, as sha1.compress; "x >>> n" (circular right
+#       shift) is computed without masking: bits over 32 are dropped only by
+#       the sums, because the low 32 bits of a sum depend only on the low 32
+#       bits of its addends
+
+
+# import std libs
+import struct
+
+# import user libs
+if __package__:                          # imported as a module of package "source"
+    from . import nbitarray as nba
+    from . import sha1
+else:                                    # run as script, or imported from its directory
+    import nbitarray as nba
+    import sha1
+
+MASK = 0xffffffff                                # 32 bits
+_WORDS = struct.Struct('>16I')                   # a block as 16 words of 32 bits, big endian
+
+K = (                                            # first 32 bits of fractional parts of cube roots of the first 64 primes
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5,
+    0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3,
+    0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc,
+    0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7,
+    0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13,
+    0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3,
+    0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5,
+    0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208,
+    0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+)
+
+H0_256 = (0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19, )
+H0_224 = (0xc1059ed8, 0x367cd507, 0x3070dd17, 0xf70e5939, 0xffc00b31, 0x68581511, 0x64f98fa7, 0xbefa4fa4, )
+
+
+def compress(h, block, offset=0):
+    '''hash computation of a block, on 32 bits words as int
+
+       params
+         - h          tuple of 8 int - 32 bits words
+         - block      bytes-like - a buffer with 64 bytes from offset
+         - offset     int - start of block in buffer
+
+       return h: a tuple of 8 int
+    '''
+    w = list(_WORDS.unpack_from(block, offset))   # 16 words, big endian
+    for j in range(16, 64):
+        x, y = w[j-15], w[j-2]
+        s0 = ((x >> 7) | (x << 25)) ^ ((x >> 18) | (x << 14)) ^ (x >> 3)
+        s1 = ((y >> 17) | (y << 15)) ^ ((y >> 19) | (y << 13)) ^ (y >> 10)
+        w.append((w[j-16] + s0 + w[j-7] + s1) & MASK)
+    a, b, c, d, e, f, g, hh = h
+    for k, wj in zip(K, w):
+        t1 = (hh + (((e >> 6) | (e << 26)) ^ ((e >> 11) | (e << 21)) ^ ((e >> 25) | (e << 7)))
+              + (g ^ (e & (f ^ g))) + k + wj)
+        t2 = (((a >> 2) | (a << 30)) ^ ((a >> 13) | (a << 19)) ^ ((a >> 22) | (a << 10))) + ((a & b) | (c & (a | b)))
+        a, b, c, d, e, f, g, hh = (t1 + t2) & MASK, a, b, c, (d + t1) & MASK, e, f, g
+    return ((h[0] + a) & MASK, (h[1] + b) & MASK, (h[2] + c) & MASK, (h[3] + d) & MASK,
+            (h[4] + e) & MASK, (h[5] + f) & MASK, (h[6] + g) & MASK, (h[7] + hh) & MASK, )
+
+
+class Sha256(sha1.Sha1):
+    '''incremental sha-256: message is given by chunks of bytes (see sha1.Sha1)
+
+       instance data:
+         - h          tuple of 8 int - hash of the blocks processed up to now (32 bits words)
+         - length     int - n.of bytes given up to now
+    '''
+    DIGEST_SIZE = 32                              # bytes
+    H0 = H0_256
+    compress = staticmethod(compress)
+
+
+class Sha224(Sha256):
+    '''incremental sha-224: sha-256 with other H0, truncated to 28 bytes'''
+    DIGEST_SIZE = 28                              # bytes
+    H0 = H0_224
+
+
+def _hash(cls, msg):
+    '''hash of msg (NBitArray, file path or bytes-like) by the hasher class cls, as integer'''
+    if not isinstance(msg, nba.NBitArray):
+        return cls().update_buffer(msg).to_int()
+    h = cls.H0
+    for block in msg.padded_blocks(md=512):       # only the last block(s) are padded
+        h = compress(h, block.to_bytes())
+    return cls.words_to_int(h)
+
+
+def sha256(msg):
+    '''compute sha-256 of message
+
+       params msg     nbitarray - messsage to hash; or
+                      str | os.PathLike - path of a file to hash (it is mapped in memory); or
+                      bytes-like - bytes, bytearray, mmap.mmap, memoryview, ... to hash
+
+       return sha-256 hash of message as integer (256 bits)
+    '''
+    return _hash(Sha256, msg)
+
+
+def sha224(msg):
+    '''compute sha-224 of message, as sha256; return an integer of 224 bits'''
+    return _hash(Sha224, msg)
+
+
+def main():
+    msg = nba.NBitArray(b'The quick brown fox jumps over the lazy dog')           # message
+    expected = 'd7a8fbb307d7809469ca9abcb0082e4f8d5651e46d3cdb762d02d0bf37c9e592'
+    s = sha256(msg)
+    print(f'{s:0>64x}\n{expected}')                   # print as 64 hex digits
+
+
+if __name__ == '__main__':
+    main()
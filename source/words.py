@@ -0,0 +1,218 @@
+# :filename: words.py fixed-width words (registers) of cipher internals
+#
+# a word of n bits is an immutable int in [0, 2^n): every operation is masked
+# to n bits and gives a word of the same width, so it behaves as a register of
+# the cipher. Words are ints (int subclass without __dict__): they cost a
+# single object, they can be used as ints everywhere (tables, struct, format)
+# and mixed with them in operations (the left operand gives the type of the result)
+#
+#     a + b, a - b, a * b          mod 2^n
+#     a & b, a | b, a ^ b, ~a      bitwise, n bits
+#     a << k, a >> k               shifts, bits out of the word are dropped
+#     a.rotl(k), a.rotr(k)         circular shifts
+#     a.concat(b)                  word of a.BITS + b.BITS bits: a on the left
+#     a.split()                    two words of half width: (left, right,)
+#
+# they have the methods of NBitArray used on words by sha1 and des (to_int,
+# add_mod, __lshift__ with circular), so the reference functions work on both
+#
+# use:
+#   w = Word32(0x67452301)
+#   w.rotl(5)                      # Word32
+#   w.hex(), w.bin()               # '67452301', '0110...0001' (str(w), f'{w}' as int)
+#   w.pack()                       # b'\x67\x45\x23\x01'; w.pack('little') as little endian
+#   Word32.unpack(block)           # list of Word32: the words of block (bytes-like), big endian
+#   Word32.pack_words(words)       # bytes of words
+#   WordN = word_type(bits)        # class of words of bits bits (one for each width)
+
+
+# import std libs
+import struct
+
+_types = {}                                      # {bits: class of words of bits bits}
+_FORMATS = {8: 'B', 16: 'H', 32: 'I', 64: 'Q', }  # struct formats of the widths with a native type
+_ORDERS = {'big': '>', 'little': '<', }
+
+
+def _masked(op):
+    '''method of Word: the int operation op, masked to a word of the same class'''
+    def method(self, *args):
+        result = op(self, *args)
+        return result if result is NotImplemented else type(self)(result)
+    method.__name__ = op.__name__
+    return method
+
+
+class Word(int):
+    '''word of BITS bits, base class of the classes made by word_type
+
+       class data:
+         - BITS       int - width of the word
+         - MASK       int - 2^BITS - 1
+         - NBYTES     int - bytes of a packed word (BITS rounded up to bytes)
+
+       note. the left operand gives the type of the result: word op x is a word
+             (of the class of the left word), x op word is as x op int(word);
+             as ints, words are compared (and hashed) by value: Word32(1) == Word64(1) == 1
+    '''
+    __slots__ = ()
+    BITS = 0
+    MASK = 0
+    NBYTES = 0
+
+    def __new__(cls, value=0):
+        return int.__new__(cls, value & cls.MASK)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(0x{int(self):0{(self.BITS + 3) // 4}x})'
+
+    __str__ = int.__repr__                        # str(w), '%s' % w and f'{w}' as for int
+
+    def bin(self):
+        '''the word as BITS binary digits, as str(NBitArray)'''
+        return format(int(self), f'0{self.BITS}b')
+
+    def hex(self):
+        '''the word as hex digits, as NBitArray.hex'''
+        return format(int(self), f'0{(self.BITS + 3) // 4}x')
+
+    def to_int(self):
+        '''the word as plain int'''
+        return int(self)
+
+    def __len__(self):
+        return self.BITS
+
+    # arithmetic, mod 2^BITS
+    __add__ = _masked(int.__add__)
+    __sub__ = _masked(int.__sub__)
+    __mul__ = _masked(int.__mul__)
+    __neg__ = _masked(int.__neg__)
+
+    def add_mod(self, other, inplace=False):
+        '''self + other mod 2^BITS, as NBitArray.add_mod; a word is immutable,
+           so a new word is returned also if inplace
+        '''
+        return type(self)(int.__add__(self, other))
+
+    # bitwise
+    __and__ = _masked(int.__and__)
+    __or__ = _masked(int.__or__)
+    __xor__ = _masked(int.__xor__)
+
+    def __invert__(self):
+        return type(self)(int(self) ^ self.MASK)
+
+    def __lshift__(self, n, circular=False):
+        '''self << n on BITS bits; if circular, bits out on the left come in on the right'''
+        if circular:
+            return self.rotl(n)
+        return type(self)(int(self) << n)
+
+    def __rshift__(self, n, circular=False):
+        '''self >> n; if circular, bits out on the right come in on the left'''
+        if circular:
+            return self.rotr(n)
+        return type(self)(int(self) >> n)
+
+    def rotl(self, n):
+        '''circular left shift of n bits'''
+        n %= self.BITS
+        x = int(self)
+        return type(self)((x << n) | (x >> (self.BITS - n)))
+
+    def rotr(self, n):
+        '''circular right shift of n bits'''
+        return self.rotl(-n % self.BITS)
+
+    # registers
+    def concat(self, other):
+        '''word of self.BITS + other.BITS bits: self on the left, other (a word) on the right'''
+        return word_type(self.BITS + other.BITS)((int(self) << other.BITS) | other)
+
+    def split(self):
+        '''the two halves of the word, (left, right,): words of BITS // 2 bits;
+           ValueError if BITS is odd
+        '''
+        if self.BITS % 2:
+            raise ValueError(f'a word of {self.BITS} bits has no halves')
+        half = self.BITS // 2
+        cls = word_type(half)
+        return cls(int(self) >> half), cls(self)
+
+    # packing
+    def pack(self, byteorder='big'):
+        '''the word as NBYTES bytes'''
+        return int.to_bytes(self, self.NBYTES, byteorder)
+
+    @classmethod
+    def from_bytes(cls, data, byteorder='big'):
+        '''a word from bytes-like data (its low BITS bits)'''
+        return cls(int.from_bytes(data, byteorder))
+
+    @classmethod
+    def _struct(cls, count, byteorder):
+        '''struct of count words, or None if the width has no struct format'''
+        code = _FORMATS.get(cls.BITS)
+        return None if code is None else struct.Struct(f'{_ORDERS[byteorder]}{count}{code}')
+
+    @classmethod
+    def unpack(cls, data, byteorder='big', offset=0, count=None):
+        '''words packed in bytes-like data
+
+           params
+             - data         bytes-like - NBYTES bytes for each word
+             - byteorder    str - 'big' | 'little'
+             - offset       int - start of the first word in data
+             - count        int - n.of words to read; None: as many as data holds from offset
+
+           return list of words
+        '''
+        size = cls.NBYTES
+        if count is None:
+            count = (len(memoryview(data).cast('B')) - offset) // size
+        st = cls._struct(count, byteorder)
+        if st is not None:
+            return list(map(cls, st.unpack_from(data, offset)))
+        view = memoryview(data).cast('B')
+        return [cls(int.from_bytes(view[ndx:ndx + size], byteorder))
+                for ndx in range(offset, offset + count * size, size)]
+
+    @classmethod
+    def pack_words(cls, words, byteorder='big'):
+        '''words (ints of BITS bits at most) as bytes, NBYTES bytes for each one'''
+        words = list(words)
+        st = cls._struct(len(words), byteorder)
+        if st is not None:
+            return st.pack(*words)
+        return b''.join(int.to_bytes(w, cls.NBYTES, byteorder) for w in words)
+
+
+def word_type(bits):
+    '''class of the words of bits bits (a subclass of Word), made on first use'''
+    cls = _types.get(bits)
+    if cls is None:
+        if bits < 1:
+            raise ValueError('a word has at least 1 bit')
+        cls = type(f'Word{bits}', (Word, ), {'__slots__': (), 'BITS': bits, 'MASK': (1 << bits) - 1,
+                                               'NBYTES': (bits + 7) // 8, '__module__': __name__, })
+        _types[bits] = cls
+    return cls
+
+
+Word28 = word_type(28)                           # halves of the des key
+Word32 = word_type(32)                           # sha-1 words, des half blocks
+Word48 = word_type(48)                           # des keys of rounds, expanded half blocks
+Word56 = word_type(56)                           # des key without parity bits
+Word64 = word_type(64)                           # des blocks
+
+
+def main():
+    w = Word32(0x67452301)
+    print(repr(w), repr(w.rotl(5)), repr(w + 0xefcdab89), repr(~w))
+    print(Word32.unpack(b'The quick brown fox jumps over the lazy dog', count=4))
+    print(Word64(0x123456abcd132536).split())
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,10 @@
 
 
 # import std libs
+import io
 import os
 import sys
+import tempfile
 import unittest
 
 
@@ -111,6 +113,32 @@ class DesTests(unittest.TestCase):
         t = nba.NBitArray([0x12,0x34,0x56,0xab,0xcd,0x13,0x25,0x36,])
         self.assertEqual(c, t)
 
+class ProfilerTests(unittest.TestCase):
+
+    def test_profiler(self):
+        with des.Profiler() as prof:
+            c = des.encrypt([0x12,0x34,0x56,0xab,0xcd,0x13,0x25,0x36,],
+                            [0xaa,0xbb,0x09,0x18,0x27,0x36,0xcc,0xdd,])
+        self.assertEqual(c, nba.NBitArray([0xc0,0xb7,0xa8,0xd0,0x5f,0x3a,0x82,0x9c,]))
+        self.assertEqual(prof.calls, {'ip': 1, 'key_schedule': 1, 'expansion': 16, 'xor': 32,
+                                      'sbox': 16, 'pbox': 16, 'fp': 1, })
+        self.assertTrue(all(ns > 0 for ns in prof.ns.values()))
+        self.assertIn('sbox', prof.report())
+        self.assertIsNone(des._profiler)
+        des.encrypt([0x12,0x34,0x56,0xab,0xcd,0x13,0x25,0x36,],   # not recorded: profiler isn't active
+                    [0xaa,0xbb,0x09,0x18,0x27,0x36,0xcc,0xdd,])
+        self.assertEqual(prof.calls['ip'], 1)
+        prof.reset()
+        self.assertEqual(prof.calls['ip'], 0)
+
+    def test_nested(self):
+        with des.Profiler() as outer:
+            with des.Profiler() as inner:
+                self.assertIs(des._profiler, inner)
+            self.assertIs(des._profiler, outer)
+        self.assertIsNone(des._profiler)
+
+
 class SBoxes(unittest.TestCase):
 
     def test_indices(self):
@@ -154,6 +182,59 @@ class SBoxes(unittest.TestCase):
         bb = des.SBoxes.scrumble(ba)
         self.assertEqual(bb, target)
 
+    def test_tables(self):
+        for snum in range(1, 9):
+            for v in range(64):
+                a = nba.NBitArray(nba.int_to_bit_list(v << (6 * (8 - snum)), length=48))
+                r, c = des.SBoxes._indices(snum, a)
+                self.assertEqual(des.SBoxes._tables[snum-1][v], des.SBOXES[snum-1][r][c])
+
+    def test_scrumble_int(self):
+        self.assertEqual(des.SBoxes.scrumble_int(0b100011 << 42), 0xcfa72c4d)
+        for x in (0, 0x81818181818, 0xffffffffffff, 0x123456789abc, ):
+            a = nba.NBitArray(nba.int_to_bit_list(x, length=48))
+            self.assertEqual(des.SBoxes.scrumble_int(x), des.SBoxes.scrumble(a).to_int())
+        with self.assertRaises(TypeError):
+            des.SBoxes.scrumble(nba.NBitArray(40))
+
+class IntCoreTests(unittest.TestCase):
+    key = 0xaabb09182736ccdd
+
+    def test_key_schedule_int(self):
+        k = des.Key(list(self.key.to_bytes(8, 'big')))
+        self.assertEqual(des.key_schedule_int(self.key), [item.to_int() for item in k._keys48])
+        self.assertIs(k.keys_int, k.keys_int)                     # computed once
+        self.assertEqual(k.keys_int_reversed, k.keys_int[::-1])
+        self.assertIs(k.keys_int_reversed, k.keys_int_reversed)
+
+    def test_encrypt_int(self):
+        keys = des.key_schedule_int(self.key)
+        self.assertEqual(des.encrypt_int(0x123456abcd132536, keys), 0xc0b7a8d05f3a829c)
+        self.assertEqual(des.encrypt_int(0xc0b7a8d05f3a829c, keys[::-1]), 0x123456abcd132536)
+
+    def test_key_search(self):
+        p, c = 0x123456abcd132536, 0xc0b7a8d05f3a829c
+        mask = 0x00ff00000000fe00                                 # 14 unknown bits and a parity bit
+        base = self.key ^ mask                                    # unknown bits are wrong
+        key = self.key ^ 0x0001000000000000                       # found with the parity bits of base
+        calls = []
+        found = des.key_search(p, c, base=base, mask=mask, first=False, chunksize=1024,
+                               progress=lambda *args: calls.append(args))
+        self.assertEqual(found, [key])
+        self.assertEqual(calls[-1][:2], (1 << 14, 1 << 14))      # the parity bit is dropped
+        self.assertEqual(len(calls), 16)
+        self.assertEqual(des.key_search(p, c, base=base, mask=mask, partial=False), [key])
+        self.assertEqual(des.key_search(list(p.to_bytes(8, 'big')), c.to_bytes(8, 'big'),
+                                        base=base, mask=mask, jobs=2), [key])
+        self.assertEqual(des.key_search(p, c, base=base, mask=0x0f00), [])
+        self.assertEqual(des.key_search(p, c, candidates=range(self.key, self.key + 100), chunksize=50),
+                         [self.key])
+        self.assertEqual(des.key_search(p, c, candidates=range(self.key - 100, self.key + 100), first=False),
+                         [self.key - 1, self.key])                # keys differing in a parity bit
+        with self.assertRaises(ValueError):
+            des.key_search(p, c)
+
+
 class KeyTests(unittest.TestCase):
 
     def test_key(self):
@@ -173,8 +254,87 @@ class KeyTests(unittest.TestCase):
         self.assertEqual(k[1], k48_1)
         self.assertEqual(k[16], k48_16)
         self.assertEqual(k[0], k.key_core)
+
+    def test_key_schedules(self):
+        # calculate_keys (words) and key_schedule_int (int core) are two schedules: they must agree
+        for key in (0xfefefefefefefefe, 0xffffffffffffffff, 0xaabb09182736ccdd, 0x133457799bbcdff1, 0x0123456789abcdef, 0x1f1f1f1f0e0e0e0e):
+            k = des.Key(list(key.to_bytes(8, 'big')))
+            self.assertEqual([k[n].to_int() for n in range(1, 17)], des.key_schedule_int(key))
+            self.assertEqual(k.keys_int, des.key_schedule_int(key))
     
 
+class BytesTests(unittest.TestCase):
+    key = [0xaa,0xbb,0x09,0x18,0x27,0x36,0xcc,0xdd,]
+
+    def test_pad(self):
+        self.assertEqual(des.pad(b''), b'\x08' * 8)
+        self.assertEqual(des.pad(b'1234567'), b'1234567\x01')
+        self.assertEqual(des.unpad(des.pad(b'12345678')), b'12345678')
+        with self.assertRaises(ValueError):
+            des.unpad(b'1234567\x09')
+        with self.assertRaises(ValueError):
+            des.unpad(b'123456\x01\x02')
+
+    def test_encrypt_bytes(self):
+        # expected as "openssl enc -des-ecb -K aabb09182736ccdd"
+        c = des.encrypt_bytes(bytes([0x12,0x34,0x56,0xab,0xcd,0x13,0x25,0x36,]), self.key)
+        self.assertEqual(c.hex(), 'c0b7a8d05f3a829cb9935db182667e7a')
+        k = des.Key(self.key)
+        for n in (0, 1, 8, 21, ):
+            data = bytes(range(n))
+            self.assertEqual(des.decrypt_bytes(des.encrypt_bytes(data, k), k), data)
+
+    def test_encrypt_stream(self):
+        data = bytes(range(100))
+        fout = io.BytesIO()
+        self.assertEqual(des.encrypt_stream(io.BytesIO(data), fout, self.key, nblocks=3), len(data))
+        self.assertEqual(fout.getvalue(), des.encrypt_bytes(data, self.key))
+        fback = io.BytesIO()
+        self.assertEqual(des.decrypt_stream(io.BytesIO(fout.getvalue()), fback, self.key, nblocks=3), len(data))
+        self.assertEqual(fback.getvalue(), data)
+
+    def test_encrypt_stream_short_reads(self):
+        data = bytes(range(100))
+        fout = io.BytesIO()
+        self.assertEqual(des.encrypt_stream(ShortReader(data), fout, self.key, nblocks=3), len(data))
+        self.assertEqual(fout.getvalue(), des.encrypt_bytes(data, self.key))
+        fback = io.BytesIO()
+        self.assertEqual(des.decrypt_stream(ShortReader(fout.getvalue()), fback, self.key, nblocks=3), len(data))
+        self.assertEqual(fback.getvalue(), data)
+
+    def test_buffers(self):
+        data = bytes(range(100))
+        expected = des.encrypt_bytes(data, self.key)
+        self.assertEqual(des.encrypt_block(0x123456abcd132536, self.key), 0xc0b7a8d05f3a829c)
+        self.assertEqual(des.encrypt_block(0xc0b7a8d05f3a829c, self.key, reverse=True), 0x123456abcd132536)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data')
+            with open(path, 'wb') as f:
+                f.write(expected)
+            fout = io.BytesIO()
+            self.assertEqual(des.decrypt_stream(path, fout, self.key, nblocks=2), len(data))
+            self.assertEqual(fout.getvalue(), data)
+        fout = io.BytesIO()
+        self.assertEqual(des.encrypt_stream(memoryview(data), fout, self.key, nblocks=5), len(data))
+        self.assertEqual(fout.getvalue(), expected)
+        with self.assertRaises(ValueError):
+            des.decrypt_bytes(expected[:-1], self.key)
+
+
+class ShortReader(io.RawIOBase):
+    '''raw binary file returning at most 5 bytes per read'''
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        chunk = self.data.read(min(len(b), 5))
+        b[:len(chunk)] = chunk
+        return len(chunk)
+
 
 if __name__ == '__main__':
     unittest.main()
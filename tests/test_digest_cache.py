@@ -0,0 +1,145 @@
+# :filename: tests/test_digest_cache.py
+# to use: "cd tests; python test_digest_cache.py"
+
+# import std libs
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# import 3rd parties libs
+
+# import project's libs
+
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.digest_cache as digest_cache    # NOW we find digest_cache module if we import it ...
+import source.sha1sum as sha1sum              # ... and sha1sum module
+
+
+class DigestCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = os.path.join(self.tmp.name, 'digests.db')
+
+    def path(self, name, data):
+        result = os.path.join(self.tmp.name, name)
+        with open(result, 'wb') as f:
+            f.write(data)
+        return result
+
+    def test_digest(self):
+        a = self.path('a', b'abc')
+        with digest_cache.DigestCache(self.db) as cache:
+            self.assertIsNone(cache.get(a))
+            self.assertEqual(cache.digest(a), hashlib.sha1(b'abc').hexdigest())
+            with mock.patch.object(sha1sum, 'digest_file') as digest_file:
+                self.assertEqual(cache.digest(a), hashlib.sha1(b'abc').hexdigest())   # the file isn't read
+            digest_file.assert_not_called()
+            self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 1))
+            self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+            self.assertIn('hits: 1', cache.report())
+            self.path('a', b'abcd')                                     # size changes
+            self.assertIsNone(cache.get(a))
+            self.assertEqual(cache.digest(a), hashlib.sha1(b'abcd').hexdigest())
+            os.utime(a, ns=(0, 12345))                                  # mtime changes
+            self.assertIsNone(cache.get(a))
+            cache.put(a, '0' * 40)
+            self.assertEqual(cache.get(a), '0' * 40)
+            with self.assertRaises(OSError):
+                cache.digest(os.path.join(self.tmp.name, 'missing'))
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+        with digest_cache.DigestCache(self.db) as cache:                # persistent
+            cache.digest(a)
+            self.assertEqual(len(digest_cache.DigestCache(self.db)), 1)
+
+    def test_evict(self):
+        paths = [self.path(f'f{ndx}', bytes([ndx])) for ndx in range(6)]
+        with digest_cache.DigestCache(self.db, max_entries=3) as cache:
+            for path in paths[:3]:
+                cache.digest(path)
+            cache.get(paths[0])                                         # paths[1] is the least recently used
+            cache.digest(paths[3])
+            self.assertEqual(len(cache), 3)
+            self.assertIsNone(cache.get(paths[1]))
+            self.assertIsNotNone(cache.get(paths[0]))
+        size = len(os.path.abspath(paths[0])) + 40 + digest_cache.ENTRY_OVERHEAD
+        with digest_cache.DigestCache(self.db, max_bytes=2 * size) as cache:
+            cache.digest(paths[4])
+            self.assertEqual(len(cache), 2)
+
+    def test_evict_both_limits(self):
+        paths = [self.path(f'f{ndx}', bytes([ndx])) for ndx in range(6)]
+        size = len(os.path.abspath(paths[0])) + 40 + digest_cache.ENTRY_OVERHEAD
+        with digest_cache.DigestCache(self.db, max_entries=5, max_bytes=5 * size) as cache:
+            for path in paths:
+                cache.digest(path)
+            self.assertEqual(len(cache), 5)
+            self.assertIsNone(cache.get(paths[0]))
+        with digest_cache.DigestCache(self.db, max_entries=4, max_bytes=3 * size) as cache:
+            cache.put(paths[0], '0' * 40)
+            self.assertEqual(len(cache), 3)
+
+    def used(self, path):
+        '''last-used stamp of path in the database, read by another connection'''
+        with sqlite3.connect(self.db) as conn:
+            return conn.execute('SELECT used FROM digests WHERE path = ?', (os.path.abspath(path), )).fetchone()[0]
+
+    def test_used_batch(self):
+        a = self.path('a', b'abc')
+        cache = digest_cache.DigestCache(self.db)
+        cache.digest(a)
+        stamp = self.used(a)
+        self.assertIsNotNone(cache.get(a))
+        self.assertEqual(self.used(a), stamp)                           # a hit doesn't write
+        cache.close()
+        self.assertGreater(self.used(a), stamp)                         # written by close
+        b = self.path('b', b'abcd')
+        cache.digest(b)
+        stamp = self.used(a)
+        with mock.patch.object(digest_cache, 'USED_BATCH', 2):
+            cache.get(a)
+            self.assertEqual(self.used(a), stamp)
+            cache.get(b)                                                # stamps of 2 files: the batch is written
+            self.assertGreater(self.used(a), stamp)
+        cache.close()
+
+    def test_pool(self):
+        paths = [self.path(f'f{ndx}', bytes(range(ndx))) for ndx in range(5)]
+        cache = digest_cache.DigestCache(self.db)
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual((copy.database, copy.hits), (cache.database, 0))
+        expected = [(path, hashlib.sha1(bytes(range(ndx))).hexdigest()) for ndx, path in enumerate(paths)]
+        self.assertEqual(list(sha1sum.digest_files(paths, jobs=2, cache=cache)), expected)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 5, 5))
+        missing = os.path.join(self.tmp.name, 'missing')
+        self.assertEqual(list(sha1sum.digest_files(paths + [missing], jobs=2, cache=cache)),
+                         expected + [(missing, None)])
+        self.assertEqual((cache.hits, cache.misses), (5, 5))
+        self.assertEqual(list(sha1sum.digest_files(paths[:2], jobs=1, cache=cache)), expected[:2])
+        self.assertEqual(cache.hits, 7)
+        cache.close()
+
+    def test_unreadable(self):
+        a = self.path('a', b'abc')
+        folder = os.path.join(self.tmp.name, 'folder')                  # looked up, then it can't be read
+        os.mkdir(folder)
+        missing = os.path.join(self.tmp.name, 'missing')                # not even looked up
+        for jobs in (1, 2):
+            with digest_cache.DigestCache(self.db) as cache:
+                cache.clear()
+                result = list(sha1sum.digest_files([a, folder, missing], jobs=jobs, cache=cache))
+                self.assertEqual([digest for _, digest in result], [hashlib.sha1(b'abc').hexdigest(), None, None])
+                self.assertEqual((cache.hits, cache.misses), (0, 2), f'jobs={jobs}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# :filename: tests/test_hmac_sha1.py
+# to use: "cd tests; python test_hmac_sha1.py"
+
+# import std libs
+import hashlib
+import hmac
+import os
+import sys
+import unittest
+from unittest import mock
+
+# import 3rd parties libs
+
+# import project's libs
+
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.hmac_sha1 as hmac_sha1     # NOW we find hmac_sha1 module if we import it ...
+import source.sha1 as sha1               # ... and sha1, sha256 modules
+import source.sha256 as sha256
+
+
+class HmacSha1Tests(unittest.TestCase):
+
+    def test_rfc2202(self):
+        mac = hmac_sha1.hmac_sha1(b'\x0b' * 20)
+        self.assertEqual(mac.hexdigest(b'Hi There'), 'b617318655057264e28bc0b6fb378c8ef146be00')
+        mac = hmac_sha1.hmac_sha1(b'Jefe')
+        self.assertEqual(mac.hexdigest(b'what do ya want for nothing?'), 'effcdf6ae5eb2fa2d27416d5f184df9c259a7c79')
+        mac = hmac_sha1.hmac_sha1(b'\xaa' * 80)                  # key longer than a block
+        self.assertEqual(mac.hexdigest(b'Test Using Larger Than Block-Size Key - Hash Key First'),
+                         'aa4ae5e15272d00e95705637ce8a3b55ed402112')
+
+    def test_hmac(self):
+        for key in (b'', b'key', bytes(range(64)), bytes(range(100))):
+            mac = hmac_sha1.hmac_sha1(key)
+            for msg in (b'', b'abc', bytes(range(256)) * 3):
+                expected = hmac.new(key, msg, hashlib.sha1).digest()
+                self.assertEqual(mac.digest(msg), expected)
+                self.assertEqual(mac.to_int(msg), int.from_bytes(expected, 'big'))
+                self.assertTrue(mac.verify(msg, expected))
+                self.assertFalse(mac.verify(msg + b'x', expected))
+        mac = hmac_sha1.Hmac(b'key', sha256.Sha256)
+        self.assertEqual(mac.digest(b'abc'), hmac.new(b'key', b'abc', hashlib.sha256).digest())
+
+    def test_hasher(self):
+        mac = hmac_sha1.hmac_sha1(b'key')
+        msg = bytes(range(200))
+        h = mac.new(msg[:10])
+        for ndx in range(10, len(msg), 7):
+            h.update(msg[ndx:ndx+7])
+        other = h.copy().update(b'more')
+        self.assertEqual(h.digest(), mac.digest(msg))
+        self.assertEqual(other.hexdigest(), mac.hexdigest(msg + b'more'))
+        self.assertEqual(mac.digest(msg), mac.digest(msg))           # states aren't changed
+
+    def test_precomputed(self):
+        mac = hmac_sha1.hmac_sha1(b'key')
+        with mock.patch.object(sha1, 'compress', wraps=sha1.compress) as compress:
+            mac.digest(b'a short message')
+        self.assertEqual(compress.call_count, 2)                    # inner and outer last blocks only
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# :filename: tests/test_merkle.py
+# to use: "cd tests; python test_merkle.py"
+
+# import std libs
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# import 3rd parties libs
+
+# import project's libs
+
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.merkle as merkle           # NOW we find merkle module if we import it
+
+
+def reference_root(data, chunk_size):
+    '''root of the tree computed by hashlib, level by level'''
+    level = [hashlib.sha1(b'\x00' + data[start:start + chunk_size]).digest()
+             for start in range(0, max(len(data), 1), chunk_size)]
+    while len(level) > 1:
+        level = [hashlib.sha1(b'\x01' + level[ndx] + level[ndx + 1]).digest() if ndx + 1 < len(level) else level[ndx]
+                 for ndx in range(0, len(level), 2)]
+    return level[0]
+
+
+class MerkleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = bytes(range(256)) * 45                  # 11520 bytes: 12 chunks of 1000 bytes
+
+    def test_build(self):
+        for size in (1, 1000, 1000 * 8, len(self.data)):
+            data = self.data[:size]
+            tree = merkle.MerkleSHA1(chunk_size=1000).build(data, jobs=1)
+            self.assertEqual(tree.root, reference_root(data, 1000))
+        tree = merkle.MerkleSHA1(chunk_size=1000).build(self.data, jobs=1)
+        self.assertEqual((tree.nchunks, tree.counts), (12, [12, 6, 3, 2, 1]))
+        self.assertEqual(len(tree.nodes), 24 * merkle.DIGEST_SIZE)
+        self.assertEqual(tree.hexroot(), reference_root(self.data, 1000).hex())
+        empty = merkle.MerkleSHA1().build(b'')
+        self.assertEqual(empty.root, hashlib.sha1(b'\x00').digest())
+        self.assertEqual(merkle.MerkleSHA1(chunk_size=1000).build(self.data, jobs=2).root, tree.root)
+        with self.assertRaises(ValueError):
+            merkle.MerkleSHA1(chunk_size=0)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data')
+            with open(path, 'wb') as f:
+                f.write(self.data)
+            tree = merkle.MerkleSHA1(chunk_size=1000).build(path, jobs=2)
+            self.assertEqual(tree.root, reference_root(self.data, 1000))
+            changed = bytearray(self.data)
+            changed[5500] ^= 0xff                           # chunk 5
+            changed[-1] ^= 0xff                             # chunk 11
+            with open(path, 'wb') as f:
+                f.write(changed)
+            with mock.patch.object(merkle, 'node_hash', wraps=merkle.node_hash) as node_hash:
+                tree.update(path, [5, 11])
+            self.assertEqual(tree.root, reference_root(bytes(changed), 1000))
+            self.assertEqual(node_hash.call_count, 4 + 2)   # nodes on the two paths (chunk 11 is alone at level 2)
+            with open(path, 'ab') as f:
+                f.write(bytes(1000))
+            with self.assertRaises(ValueError):
+                tree.update(path, [12])
+
+    def test_proof(self):
+        tree = merkle.MerkleSHA1(chunk_size=1000).build(self.data, jobs=1)
+        for ndx in range(tree.nchunks):
+            chunk = self.data[ndx * 1000:(ndx + 1) * 1000]
+            proof = tree.proof(ndx)
+            self.assertTrue(merkle.MerkleSHA1.verify(chunk, proof, tree.root))
+            self.assertFalse(merkle.MerkleSHA1.verify(chunk + b'x', proof, tree.root))
+        self.assertEqual(len(tree.proof(11)), 3)            # 4 levels, but chunk 11 has no sibling at level 2
+        self.assertFalse(merkle.MerkleSHA1.verify(self.data[:1000], tree.proof(1), tree.root))
+        with self.assertRaises(IndexError):
+            tree.proof(12)
+
+
+if __name__ == '__main__':
+    unittest.main()
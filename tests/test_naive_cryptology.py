@@ -0,0 +1,155 @@
+# :filename: tests/test_naive_cryptology.py
+# to use: "cd tests; python test_naive_cryptology.py"
+
+
+# import std libs
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+# import 3rd parties libs
+
+
+# import project's libs
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import naive_cryptology as nc            # NOW we find naive_cryptology package if we import it
+
+
+def loaded_after(stmt):
+    '''sorted names of modules of source/ loaded, in a new interpreter, after stmt'''
+    code = (f'import sys; {stmt}; '
+            f'print(" ".join(sorted(m for m in sys.modules if m.startswith("source."))))')
+    out = subprocess.run([sys.executable, '-c', code], cwd=basedir,
+                         capture_output=True, text=True, check=True).stdout
+    return out.split()
+
+
+class NaiveCryptologyTests(unittest.TestCase):
+    '''testing naive_cryptology/__init__.py'''
+
+    def test_import_is_lazy(self):
+        self.assertEqual(loaded_after('import naive_cryptology'), [])
+        self.assertEqual(loaded_after('import naive_cryptology as nc; nc.sha1'),
+                         ['source.nbitarray', 'source.sha1', 'source.words'])
+        self.assertEqual(loaded_after('import naive_cryptology as nc; nc.gcd'),
+                         ['source.numbers_ops'])
+
+    def test_names(self):
+        self.assertEqual(nc.sha1(nc.NBitArray(b'abc')), 0xa9993e364706816aba3e25717850c26c9cd0d89d)
+        self.assertIs(nc.des_encrypt, nc.des.encrypt)
+        self.assertEqual(nc.gcd(12, 18), 6)
+        self.assertEqual(nc.invmod(3, 7), 5)
+        self.assertIn('rsa_keys', dir(nc))
+        self.assertEqual(set(nc.__all__) - set(dir(nc)), set())
+        with self.assertRaises(AttributeError):
+            nc.not_a_name
+
+
+class CliTests(unittest.TestCase):
+    '''testing naive_cryptology/cli.py, running "python -m naive_cryptology"'''
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name, data=None):
+        result = os.path.join(self.tmp.name, name)
+        if data is not None:
+            with open(result, 'wb') as f:
+                f.write(data)
+        return result
+
+    def run_cli(self, *args, data=b''):
+        env = dict(os.environ, PYTHONPATH=basedir)
+        return subprocess.run([sys.executable, '-m', 'naive_cryptology', *args], input=data,
+                              capture_output=True, env=env, cwd=self.tmp.name)
+
+    def test_sha1(self):
+        a, b = self.path('a', b'abc'), self.path('b', bytes(range(200)))
+        r = self.run_cli('sha1', a, b, '--jobs', '2', '--stats')
+        self.assertEqual(r.returncode, 0)
+        self.assertEqual(r.stdout.decode().splitlines(),
+                         [f'{hashlib.sha1(b"abc").hexdigest()}  {a}',
+                          f'{hashlib.sha1(bytes(range(200))).hexdigest()}  {b}', ])
+        self.assertIn('total: 203 bytes', r.stderr.decode())
+        r = self.run_cli('sha1', '--chunk-size', '7', data=b'abc')
+        self.assertEqual(r.stdout.decode(), f'{hashlib.sha1(b"abc").hexdigest()}  -\n')
+
+    def test_sha1_check(self):
+        a, b = self.path('a', b'abc'), self.path('b', b'')
+        sums = self.run_cli('sha1', a, b).stdout
+        r = self.run_cli('sha1', '-c', '--jobs', '2', data=sums)
+        self.assertEqual((r.returncode, r.stdout.decode()), (0, f'{a}: OK\n{b}: OK\n'))
+        self.path('b', b'changed')
+        os.remove(a)
+        r = self.run_cli('sha1', '-c', self.path('sums', sums))
+        self.assertEqual((r.returncode, r.stdout.decode()), (1, f'{a}: FAILED open or read\n{b}: FAILED\n'))
+
+    def test_sha1_cache(self):
+        a = self.path('a', b'abc')
+        db = self.path('digests.db')
+        r = self.run_cli('sha1', a, '--cache', db, '--stats')
+        self.assertIn('hits: 0, misses: 1', r.stderr.decode())
+        self.assertIn('total: 3 bytes', r.stderr.decode())
+        r = self.run_cli('sha1', a, '--cache', db, '--stats', '--jobs', '2')
+        self.assertEqual(r.stdout.decode(), f'{hashlib.sha1(b"abc").hexdigest()}  {a}\n')
+        self.assertIn('hits: 1, misses: 0', r.stderr.decode())
+        self.assertIn('total: 0 bytes', r.stderr.decode())     # a hit isn't read
+        r = self.run_cli('sha1', a, '--cache', self.path('missing/digests.db'))   # the database can't be opened
+        self.assertEqual(r.returncode, 1)
+        self.assertTrue(r.stderr.decode().startswith('python -m naive_cryptology: error: '))
+        self.assertNotIn('Traceback', r.stderr.decode())
+
+    def test_des(self):
+        data = bytes(range(50))
+        r = self.run_cli('des-enc', '--key', 'aabb09182736ccdd', data=data)
+        self.assertEqual(len(r.stdout), 56)
+        r = self.run_cli('des-dec', '--key', 'aabb09182736ccdd', '--chunk-size', '16', data=r.stdout)
+        self.assertEqual(r.stdout, data)
+        a, b = self.path('a', data), self.path('b', b'')
+        r = self.run_cli('des-enc', '--key', 'aabb09182736ccdd', a, b, '--jobs', '2')
+        self.assertEqual(r.returncode, 0)
+        r = self.run_cli('des-dec', '--key', 'aabb09182736ccdd', a + '.des', '-o', self.path('c'))
+        with open(self.path('c'), 'rb') as f:
+            self.assertEqual(f.read(), data)
+        r = self.run_cli('des-dec', '--key', 'aabb09182736ccdd', data=b'1234567')
+        self.assertEqual(r.returncode, 1)
+
+    def test_hill(self):
+        key = '17,17,5,21,18,21,2,2,19'
+        r = self.run_cli('hill-enc', '--key', key, '--chunk-size', '2', data=b'pay more money')
+        self.assertEqual(r.stdout, b'LNSHDLEWMTRW')
+        r = self.run_cli('hill-dec', '--key', key, data=r.stdout)
+        self.assertEqual(r.stdout, b'PAYMOREMONEY')
+        r = self.run_cli('hill-enc', '--key', key, data=b'paymoremone')
+        self.assertEqual(len(r.stdout), 12)                       # padded with X
+
+    def test_rsa(self):
+        r = self.run_cli('rsa-keygen', '--bits', '32', '-o', 'k')
+        self.assertEqual(r.returncode, 0)
+        data = bytes(range(100))
+        r = self.run_cli('rsa-enc', '--key', self.path('k.pub'), data=data)
+        r = self.run_cli('rsa-dec', '--key', self.path('k.pri'), data=r.stdout)
+        self.assertEqual(r.stdout, data)
+
+    def test_rsa_zeros(self):
+        data = bytes(4096)                      # all-zero blocks encrypt to 0
+        a = self.path('zeros', data)
+        for i in range(3):
+            r = self.run_cli('rsa-keygen', '--bits', '32', '-o', f'z{i}')
+            self.assertEqual(r.returncode, 0)
+            r = self.run_cli('rsa-enc', '--key', self.path(f'z{i}.pub'), a, '-o', self.path(f'zeros{i}.rsa'))
+            self.assertEqual(r.returncode, 0)
+            r = self.run_cli('rsa-dec', '--key', self.path(f'z{i}.pri'), self.path(f'zeros{i}.rsa'))
+            self.assertEqual(r.returncode, 0)
+            self.assertEqual(r.stdout, data)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
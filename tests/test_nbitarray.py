@@ -3,8 +3,11 @@
 
 
 # import std libs
+import array
+import io
 import os
 import sys
+import tempfile
 import unittest
 
 # import 3rd parties libs
@@ -101,6 +104,30 @@ class NBitArrayTests(unittest.TestCase):
         ba0 = nba.NBitArray([1,0,0,0,1,])
         ba1 = nba.NBitArray([1,0,0,0,1,])
         self.assertEqual(ba0, ba1)
+        self.assertNotEqual(ba0, nba.NBitArray([1,0,0,0,1,0,]))   # same bytes, different length
+        self.assertNotEqual(ba0, nba.NBitArray([1,0,0,0,0,]))
+        self.assertEqual(ba0, '10001')                            # other objects as strings of bits
+        with self.assertRaises(TypeError):
+            hash(ba0)
+    
+    def test_immutable(self):
+        ba = nba.NBitArray([1,0,0,0,1,])
+        fa = ba.freeze()
+        self.assertIsInstance(fa, nba.ImmutableNBitArray)
+        self.assertIs(fa.freeze(), fa)
+        self.assertEqual(fa, ba)
+        self.assertEqual(hash(fa), hash(nba.ImmutableNBitArray([1,0,0,0,1,])))
+        with self.assertRaises(TypeError):
+            fa[0] = 0
+        ba[0] = 0                                                 # the copy doesn't change
+        self.assertEqual(str(fa), '10001')
+        self.assertNotEqual(fa, '10001')                           # hashable: not equal to a str of another hash
+        self.assertNotEqual('10001', fa)
+        self.assertNotIn('10001', {fa})
+        table = {fa: 'a', nba.ImmutableNBitArray(b'ab'): 'b'}
+        self.assertEqual(table[nba.NBitArray(b'ab').freeze()], 'b')
+        self.assertEqual(len({fa, nba.NBitArray('10001').freeze()}), 1)
+        self.assertIsInstance(fa ^ fa, nba.NBitArray)
     
     def test_setitem(self):
         ba = nba.NBitArray([1,0,0,0,1,])
@@ -110,6 +137,17 @@ class NBitArrayTests(unittest.TestCase):
         i1 = ba[1]
         self.assertEqual(i0, 0)
         self.assertEqual(i1, 1)
+        with self.assertRaises(IndexError):
+            ba[5] = 1
+        a = nba.NBitArray(4)
+        a[-1] = 1                                 # the last bit, not a padding bit
+        self.assertEqual((str(a), a[-1], a[3]), ('0001', 1, 1))
+        a[-1] = 0
+        self.assertEqual(a, nba.NBitArray(4))
+        with self.assertRaises(IndexError):
+            a[-5] = 1
+        with self.assertRaises(IndexError):
+            a[-5]
     
     def test_getitem(self):
         ba = nba.NBitArray([1,0,0,0,1,])
@@ -175,6 +213,57 @@ class NBitArrayTests(unittest.TestCase):
         self.assertEqual(bc.get_byte(byte_ndx=0), 0x0f)
         self.assertEqual(bc.get_byte(byte_ndx=1), 0xf0)
     
+    def test_bitwise(self):
+        ba = nba.NBitArray('1100110011')
+        bb = nba.NBitArray('1010101010')
+        self.assertEqual(str(ba & bb), '1000100010')
+        self.assertEqual(str(ba | bb), '1110111011')
+        self.assertEqual(str(ba ^ bb), '0110011001')
+        self.assertEqual(str(~ba), '0011001100')
+        self.assertEqual(str(ba & 0b1111100000), '1100100000')       # an int as operand
+        self.assertEqual((~ba)._ba, bytearray([0x33, 0x00]))       # bits after length stay 0
+        with self.assertRaises(ValueError):
+            ba & nba.NBitArray(8)
+        bc, ba_ba = ba, ba._ba
+        ba ^= bb
+        ba |= 0b1
+        ba &= bb
+        self.assertIs(ba, bc)                                      # in place
+        self.assertIs(ba._ba, ba_ba)
+        self.assertEqual(str(ba), '0010001000')
+        fa = nba.NBitArray('0101').freeze()
+        fb = fa
+        fa ^= 0b1111                                                # a new instance, as for int
+        self.assertEqual((str(fa), str(fb)), ('1010', '0101'))
+    
+    def test_add_mod(self):
+        ba = nba.NBitArray([0xff, 0xff, 0xff, 0xf0])
+        bb = nba.NBitArray([0x00, 0x00, 0x00, 0x20])
+        self.assertEqual(ba.add_mod(bb).to_int(), 0x10)
+        self.assertEqual(ba.add_mod(0x0f).to_int(), 0xffffffff)
+        bc = ba.add_mod(bb, inplace=True)
+        self.assertIs(bc, ba)
+        self.assertEqual(ba.hex(), '00000010')
+        self.assertEqual(nba.NBitArray('111').add_mod(1).to_int(), 0)
+    
+    def test_counts(self):
+        ba = nba.NBitArray('0001011')
+        self.assertEqual(ba.popcount(), 3)
+        self.assertEqual(ba.parity(), 1)
+        self.assertEqual(ba.find_first_set(), 3)
+        self.assertEqual(ba.count_leading_zeros(), 3)
+        ba = nba.NBitArray(12)
+        self.assertEqual((ba.popcount(), ba.parity()), (0, 0))
+        self.assertEqual(ba.find_first_set(), -1)
+        self.assertEqual(ba.count_leading_zeros(), 12)
+    
+    def test_from_int(self):
+        ba = nba.NBitArray.from_int(0b1011, 10)
+        self.assertEqual(str(ba), '0000001011')
+        self.assertEqual(ba.to_int(), 0b1011)
+        self.assertEqual(str(nba.NBitArray.from_int(-1, 3)), '111')
+        self.assertIsInstance(nba.ImmutableNBitArray.from_int(1, 3), nba.ImmutableNBitArray)
+    
     def test_lshift(self):
         ba = nba.NBitArray([0x0f, 0x0f])
         bb = ba << 1
@@ -184,6 +273,10 @@ class NBitArrayTests(unittest.TestCase):
         bb = ba.__lshift__(1, circular=True)
         self.assertEqual(bb.get_byte(byte_ndx=0), 0x1e)
         self.assertEqual(bb.get_byte(byte_ndx=1), 0x1f)
+        ba = nba.NBitArray('10011')
+        self.assertEqual(str(ba << 2), '01100')
+        self.assertEqual(str(ba << 7), '00000')
+        self.assertEqual(str(ba.__lshift__(7, circular=True)), '01110')
 
     def test_rshift(self):
         ba = nba.NBitArray([0x0f, 0x0f])
@@ -194,6 +287,9 @@ class NBitArrayTests(unittest.TestCase):
         bb = ba.__rshift__(1, circular=True)
         self.assertEqual(bb.get_byte(byte_ndx=0), 0xc7)
         self.assertEqual(bb.get_byte(byte_ndx=1), 0x87)
+        ba = nba.NBitArray('10011')
+        self.assertEqual(str(ba >> 2), '00100')
+        self.assertEqual(str(ba.__rshift__(2, circular=True)), '11100')
 
     def test_hex(self):
         ba = nba.NBitArray([0x0f,0xf0,])
@@ -215,6 +311,8 @@ class NBitArrayTests(unittest.TestCase):
         self.assertEqual(ba.to_int(), 255)
         ba = nba.NBitArray([0xff, 0xff])
         self.assertEqual(ba.to_int(), 65535)
+        ba = nba.NBitArray('101')
+        self.assertEqual(ba.to_int(), 5)
     
     def test_swap_lr(self):
         ba = nba.NBitArray([0x0f, 0xf0])
@@ -226,12 +324,113 @@ class NBitArrayTests(unittest.TestCase):
         msg    = nba.NBitArray(b'abc')
         padded = msg.padding(md=128)
         self.assertEqual(padded, target)
+        ba = nba.NBitArray('10111')                               # not whole bytes
+        padded = ba.padding(md=128)
+        self.assertEqual(str(padded), '101111' + '0' * (128 - 64 - 6) + f'{5:0>64b}')
+        for size in (0, 3, 55, 56, 64, 100):
+            msg = nba.NBitArray(bytes(range(size)))
+            padded = msg.padding()
+            self.assertEqual(len(padded) % 512, 0)
+            self.assertEqual(str(padded)[:8 * size], str(msg))
+            self.assertEqual(padded.to_int() & 0xffffffffffffffff, 8 * size)
+            self.assertEqual(list(msg.padded_blocks()), padded.break_to_list(el=512))
+    
+    def test_md_padding(self):
+        self.assertEqual(nba.md_padding(b'abc', 8 * 67), b'abc\x80' + bytes(52) + (8 * 67).to_bytes(8, 'big'))
+        self.assertEqual(len(nba.md_padding(bytes(56), 8 * 56)), 128)       # no room for the length: 2 blocks
+        self.assertEqual(nba.md_padding(memoryview(b'abc'), 24), nba.md_padding(nba.NBitArray(b'abc'), 24))
+        self.assertEqual(nba.md_padding(nba.NBitArray('1'), 1, md=128), bytes([0xc0]) + bytes(7) + (1).to_bytes(8, 'big'))
         
     def test_break_to_list(self):
         ba = nba.NBitArray('1111000011110000')
         l = ba.break_to_list(el=4)
         self.assertEqual(len(l), 4)
         self.assertEqual(str(l[0]), '1111')
+        l = nba.NBitArray([0x01, 0x02, 0x03, 0x04]).break_to_list(el=16)
+        self.assertEqual([e.to_int() for e in l], [0x0102, 0x0304])
+
+class CountersTests(unittest.TestCase):
+    '''testing NBitArray instrumentation'''
+
+    def test_counters(self):
+        init = nba.NBitArray.__init__
+        with nba.Counters() as counters:
+            self.assertIsNot(nba.NBitArray.__init__, init)       # wrapped
+            ba = nba.NBitArray([0x0f, 0xf0])
+            bb = nba.NBitArray(b'\x00\x01')
+            b0 = ba[0]
+            ba[1] = 1
+            bc = ba[0:4]                                           # slice: 4 bits read, 1 new instance
+            bd = nba.NBitArray.from_int(5, 12)                     # classmethod: counted too
+        self.assertIs(nba.NBitArray.__init__, init)               # unwrapped
+        self.assertIsInstance(nba.NBitArray.__dict__['from_int'], classmethod)
+        self.assertEqual(nba.NBitArray.from_int(5, 12), bd)
+        snap = counters.snapshot()
+        self.assertEqual(snap['calls']['from_int'], 1)
+        self.assertEqual(snap['instances'], 4)
+        self.assertEqual(snap['nbytes'], 2 + 2 + 1 + 2)
+        self.assertEqual(snap['calls']['__getitem__'], 1 + 1 + 4)
+        self.assertEqual(snap['calls']['__setitem__'], 1)
+        self.assertEqual(snap['bit_ops'], 1 + 1 + 4)
+        self.assertIn('instances: 4', counters.report())
+        nba.NBitArray(8)                                           # not counted: counters isn't active
+        self.assertEqual(counters.instances, 4)
+        counters.reset()
+        self.assertEqual(counters.snapshot(), {'instances': 0, 'nbytes': 0, 'calls': {}, 'bit_ops': 0})
+
+    def test_freeze(self):
+        ba = nba.NBitArray([0x0f, 0xf0, 0x33])
+        freeze = nba.ImmutableNBitArray.freeze
+        with nba.Counters() as counters:
+            self.assertIsNot(nba.ImmutableNBitArray.freeze, freeze)          # wrapped
+            fa = ba.freeze()                                       # a copy: 1 new instance
+            self.assertIs(fa.freeze(), fa)                         # not a copy
+            ia = nba.ImmutableNBitArray([0x0f, 0xf0])              # its bytearray, then its bytes
+        self.assertIs(nba.ImmutableNBitArray.freeze, freeze)                 # unwrapped
+        snap = counters.snapshot()
+        self.assertEqual(snap['instances'], 2)
+        self.assertEqual(snap['nbytes'], 3 + 2 + 2)
+        self.assertEqual(snap['calls']['freeze'], 1)
+        self.assertEqual(snap['calls']['ImmutableNBitArray.freeze'], 1)
+        self.assertEqual(snap['calls']['ImmutableNBitArray.__init__'], 1)
+        self.assertEqual(fa, ba)
+
+    def test_nested(self):
+        init = nba.NBitArray.__init__
+        with nba.Counters() as outer:
+            with nba.Counters() as inner:
+                nba.NBitArray(8)
+            self.assertIsNot(nba.NBitArray.__init__, init)        # still wrapped for outer
+            nba.NBitArray(8)
+        self.assertIs(nba.NBitArray.__init__, init)
+        self.assertEqual((inner.instances, outer.instances), (1, 1))
+
+
+class BufferTests(unittest.TestCase):
+
+    def test_buffer(self):
+        data = bytes(range(256)) * 20
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data')
+            with open(path, 'wb') as f:
+                f.write(data)
+            with nba.Buffer(path) as buf:
+                self.assertEqual(buf.view[1000:1010].tobytes(), data[1000:1010])
+                buf.release(0, 4096)                              # pages are read again if needed
+                self.assertEqual(buf.view.tobytes(), data)
+            self.assertIsNone(buf.view)
+            empty = os.path.join(tmp, 'empty')
+            open(empty, 'wb').close()
+            with nba.Buffer(empty) as buf:
+                self.assertEqual(len(buf.view), 0)
+        for item in (data, bytearray(data), memoryview(data), array.array('I', [1, 2]), ):
+            with nba.Buffer(item) as buf:
+                self.assertEqual(buf.view.tobytes(), bytes(item))
+                buf.release(0, 8)                                 # nothing to do
+        self.assertTrue(nba.Buffer.accepts('a path'))
+        self.assertTrue(nba.Buffer.accepts(b''))
+        self.assertFalse(nba.Buffer.accepts(io.BytesIO()))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -24,6 +24,14 @@ class NumbersOpsTests(unittest.TestCase):
         g, x, y = nops.egcd(240, 46)
         #print(f"\ng: {g}, x: {x}, y: {y}")
         self.assertEqual(240*x+46*y, g)
+        self.assertEqual(nops.egcd(0, 5), (5, 0, 1))
+        # consecutive fibonacci numbers are the worst case: the recursive version overflowed the stack
+        a, b = 0, 1
+        for _ in range(5000):
+            a, b = b, a + b
+        g, x, y = nops.egcd(a, b)
+        self.assertEqual(g, 1)
+        self.assertEqual(a*x+b*y, g)
 
 
     def test_coprimes(self):
@@ -31,12 +39,58 @@ class NumbersOpsTests(unittest.TestCase):
         #print(f"\n{c}")
         self.assertEqual(len(c), 3)
 
+        self.assertEqual(nops.coprimes(10, min=2), [3, 7, 9])
+        self.assertEqual(nops.coprimes(30, factors=[2, 3, 5]), [7, 11, 13, 17, 19, 23, 29])
+        a = nops.coprimes(30, asarray=True)
+        self.assertEqual(a.typecode, nops.UINT32)
+        self.assertEqual(a.itemsize, 4)
+        self.assertEqual(list(a), [7, 11, 13, 17, 19, 23, 29])
+
+    def test_prime_factors(self):
+        self.assertEqual(nops.prime_factors(360), ([2, 3, 5], 1))
+        self.assertEqual(nops.prime_factors(2 * 1000003), ([2, 1000003], 1))
+        self.assertEqual(nops.prime_factors(2 * 1009 * 1013, bound=1000), ([2], 1009 * 1013))
+
+    def test_factorize(self):
+        self.assertEqual(nops.factorize(360), {2: 3, 3: 2, 5: 1})
+        self.assertEqual(nops.factorize(1000003), {1000003: 1})
+        p, q = 1000000007, 998244353                               # primes
+        self.assertEqual(nops.factorize(p * q * 1009**2 * 2), {2: 1, 1009: 2, q: 1, p: 1})
+        self.assertEqual(list(nops.factorize(p * q)), [q, p])     # sorted
+        with self.assertRaises(ValueError):
+            nops.factorize(1)
+
+    def test_pollard_brent(self):
+        p, q = 1000000007, 998244353
+        self.assertIn(nops.pollard_brent(p * q), (p, q))
+        self.assertEqual(nops.pollard_brent(2 * p), 2)
+
+    def test_spf_sieve(self):
+        spf = nops.spf_sieve(100)
+        self.assertEqual(len(spf), 101)
+        self.assertEqual([spf[n] for n in (2, 4, 9, 49, 91, 97, 100)], [2, 2, 3, 7, 7, 97, 2])
+        self.assertIs(nops.spf_sieve(100).obj, spf.obj)            # memoised
+        with self.assertRaises(TypeError):                          # shared: read only
+            spf[4] = 3
+        self.assertEqual(nops.factorize(84, spf=spf), {2: 2, 3: 1, 7: 1})
+
+    def test_factorize_many(self):
+        numbers = list(range(2, 2000))
+        self.assertEqual(nops.factorize_many(numbers), [nops.factorize(n) for n in numbers])
+        numbers = [6, 2**40 + 1, 97, 2**32 + 15]                   # over SPF_LIMIT: by factorize
+        self.assertEqual(nops.factorize_many(numbers), [nops.factorize(n) for n in numbers])
+        self.assertEqual(nops.factorize_many([6, 2**40 + 1])[1], {257: 1, 4278255361: 1})
+
     def test_coprimes_gen(self):
         gen = nops.coprimes_gen(10)
         self.assertEqual(type(gen), type((_ for n in range(5))))
         c = list(gen)
         #print(f"\n{c}")
         self.assertEqual(len(c), 3)
+        for n in (2*3*5*7*11*13, 2*3*5*7*11*13*17, 97*101, 2*1009*1013):   # wheel, too big wheel, no wheel, gcd on rest
+            c = [i for i in range(2, n+1) if nops.gcd(i, n) == 1]
+            self.assertEqual(list(nops.coprimes_gen(n)), c)
+        self.assertEqual(list(nops.coprimes_gen(30, min=8, factors=[2, 3, 5])), [11, 13, 17, 19, 23, 29])
 
     def test_is_coprime(self):
         self.assertTrue(nops.is_coprime(4, 9))
@@ -72,6 +126,10 @@ class NumbersOpsTests(unittest.TestCase):
     def test_gcd(self):
         self.assertEqual(nops.gcd(6, 35), 1)
         self.assertEqual(nops.gcd(1386, 3213), 63)
+        self.assertEqual(nops.gcd(0, 7), 7)
+        self.assertEqual(nops.gcd(2**4096 * 3, 2**4000 * 9), 2**4000 * 3)
+        with self.assertRaises(ValueError):
+            nops.gcd(-2, 4)
         
     def test_lcg(self):
         rgen = nops.lcg()
@@ -94,6 +152,32 @@ class NumbersOpsTests(unittest.TestCase):
         self.assertEqual(r0, 12345 / (2 << 29))
         self.assertTrue(((0.5-0.01) < m) and (m < (0.5+0.01)))
 
+    def test_lcg_fill(self):
+        rgen = nops.lcg(seed=7)
+        r = [next(rgen) for _ in range(3000)]
+        a = nops.lcg_fill(3000, seed=7)
+        self.assertEqual(a.typecode, 'd')
+        self.assertEqual(list(a), r)
+        a = nops.lcg_fill(3000, seed=7, typecode='I')
+        self.assertEqual(list(a), [int(item * (2 << 29)) for item in r])
+        self.assertEqual(len(nops.lcg_fill(0)), 0)
+        with self.assertRaises(ValueError):
+            nops.lcg_fill(10, typecode='f')
+
+    def test_lcg_skip(self):
+        seed = 0
+        for _ in range(1000):
+            seed = (nops.LCG_A * seed + nops.LCG_C) % nops.LCG_M
+        self.assertEqual(nops.lcg_skip(0, 1000), seed)
+        self.assertEqual(nops.lcg_skip(seed, 0), seed)
+        self.assertEqual(nops.lcg_skip(nops.lcg_skip(5, 10**9), 10**9), nops.lcg_skip(5, 2 * 10**9))
+
+    def test_lcg_streams(self):
+        seeds = nops.lcg_streams(4, 500, seed=3)
+        streams = [nops.lcg_fill(500, seed=s) for s in seeds]
+        whole = nops.lcg_fill(2000, seed=3)
+        self.assertEqual(streams[0] + streams[1] + streams[2] + streams[3], whole)
+
     def test_equiv_list(self):
         result = nops.equiv_list(9, 3, 2)
         self.assertEqual(result, [-15, -6, 3, 12, 21])
@@ -117,6 +201,10 @@ class NumbersOpsTests(unittest.TestCase):
         #self.assertEqual(x, 7)
         with self.assertRaises(ValueError):   # inverse of a wrong number
             x = nops.invmod(13, 13)
+        self.assertEqual(nops.invmod(-3, 11), 7)
+        m = 2**4096
+        a = 3**2000
+        self.assertEqual(a * nops.invmod(a, m) % m, 1)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+# :filename: tests/test_pbkdf2.py
+# to use: "cd tests; python test_pbkdf2.py"
+
+# import std libs
+import hashlib
+import os
+import sys
+import unittest
+from unittest import mock
+
+# import 3rd parties libs
+
+# import project's libs
+
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.pbkdf2 as pbkdf2           # NOW we find pbkdf2 module if we import it
+
+
+class Pbkdf2Tests(unittest.TestCase):
+
+    def test_rfc6070(self):
+        self.assertEqual(pbkdf2.pbkdf2_sha1(b'password', b'salt', 1).hex(),
+                         '0c60c80f961f0e71f3a9b524af6012062fe037a6')
+        self.assertEqual(pbkdf2.pbkdf2_sha1(b'password', b'salt', 2).hex(),
+                         'ea6c014dc72d6f8ccd1ed92ace1d41f0d8de8957')
+        self.assertEqual(pbkdf2.pbkdf2_sha1(b'password', b'salt', 4096).hex(),
+                         '4b007901b765489abead49d926f721d065a429c1')
+        self.assertEqual(pbkdf2.pbkdf2_sha1(b'passwordPASSWORDpassword', b'saltSALTsaltSALTsaltSALTsaltSALTsalt',
+                                            4096, 25, jobs=1).hex(),
+                         '3d2eec4fe41c849b80c8d83662c0e44a8b291a964cf2f07038')
+        self.assertEqual(pbkdf2.pbkdf2_sha1(b'pass\0word', b'sa\0lt', 4096, 16).hex(),
+                         '56fa6aa75548099dcc37d7f03425e0c3')
+
+    def test_pbkdf2(self):
+        for password, salt, iterations, dklen in ((b'', b'', 3, 1), (bytes(100), b'salt', 5, 41),
+                                                  ('pässword', 'salt', 10, 64), ):
+            expected = hashlib.pbkdf2_hmac('sha1', password.encode() if isinstance(password, str) else password,
+                                           salt.encode() if isinstance(salt, str) else salt, iterations, dklen)
+            self.assertEqual(pbkdf2.pbkdf2_sha1(password, salt, iterations, dklen), expected)
+        self.assertEqual(pbkdf2.pbkdf2_sha1(b'pw', b'salt', 7, 50, jobs=2),         # 3 blocks in a pool
+                         hashlib.pbkdf2_hmac('sha1', b'pw', b'salt', 7, 50))
+        with mock.patch('concurrent.futures.ProcessPoolExecutor') as executor:      # no pool by default
+            self.assertEqual(pbkdf2.pbkdf2_sha1(b'pw', b'salt', 7, 50), hashlib.pbkdf2_hmac('sha1', b'pw', b'salt', 7, 50))
+        executor.assert_not_called()
+        with self.assertRaises(ValueError):
+            pbkdf2.pbkdf2_sha1(b'pw', b'salt', 0)
+        with self.assertRaises(ValueError):
+            pbkdf2.pbkdf2_sha1(b'pw', b'salt', 1, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 # to use: "cd tests; python test_schoolbook_rsa.py"
 
 # import std libs
+import io
 import os
 import sys
 import unittest
@@ -45,6 +46,107 @@ class RSATests(unittest.TestCase):
         x = srsa.decrypt(2790, pri)
         self.assertEqual(x, 65)
 
+    def test_crack(self):
+        pri = srsa.crack((3233, 17))
+        self.assertEqual(pri, (3233, 413))
+        pub, pri = srsa.keys(prime_len=20)
+        cracked = srsa.crack(pub)
+        self.assertEqual(srsa.decrypt(srsa.encrypt(1234, pub), cracked), 1234)
+        with self.assertRaises(ValueError):
+            srsa.crack((61 * 61 * 53, 7))
+
+    def test_block_sizes(self):
+        self.assertEqual(srsa.plain_block_size(3233), 1)     # 3233 has 12 bits
+        self.assertEqual(srsa.cipher_block_size(3233), 2)
+        with self.assertRaises(ValueError):
+            srsa.plain_block_size(255)
+
+    def test_encrypt_many(self):
+        pub, pri = (3233, 17), (3233, 413)
+        ys = list(srsa.encrypt_many([65, 0, 1, 3232], pub))
+        self.assertEqual(ys[0], 2790)
+        self.assertEqual(list(srsa.decrypt_many(ys, pri)), [65, 0, 1, 3232])
+        self.assertEqual(list(srsa.decrypt_many(ys, pri, processes=2, chunksize=1)), [65, 0, 1, 3232])
+
+    def test_pad(self):
+        self.assertEqual(srsa.pad(b'ab', 4), b'ab\x80\x00')
+        self.assertEqual(srsa.pad(b'abcd', 4), b'abcd\x80\x00\x00\x00')
+        self.assertEqual(srsa.unpad(b'abcd\x80\x00\x00\x00'), b'abcd')
+        with self.assertRaises(ValueError):
+            srsa.unpad(b'abcd')
+
+    def test_encrypt_bytes(self):
+        pub, pri = srsa.keys(p=61, q=53)
+        msg = b'The quick brown fox jumps over the lazy dog'
+        c = srsa.encrypt_bytes(msg, pub)
+        self.assertEqual(len(c), (len(msg) + 1) * 2)        # 1 byte blocks in, 2 bytes blocks out
+        self.assertEqual(srsa.decrypt_bytes(c, pri), msg)
+        pub, pri = srsa.keys(prime_len=16)
+        c = srsa.encrypt_bytes(msg, pub)
+        self.assertEqual(len(c) % srsa.cipher_block_size(pub[0]), 0)
+        self.assertEqual(srsa.decrypt_bytes(c, pri), msg)
+        self.assertEqual(srsa.decrypt_bytes(srsa.encrypt_bytes(b'', pub), pri), b'')
+
+    def test_decrypt_wrong_key(self):
+        pub, pri = srsa.keys(p=61, q=53)
+        wrong = (pri[0], pub[1])                            # blocks of 0..3232 don't fit in 1 byte
+        c = srsa.encrypt_bytes(b'The quick brown fox jumps over the lazy dog', pub)
+        with self.assertRaisesRegex(ValueError, 'bad key'):
+            srsa.decrypt_bytes(c, wrong)
+        with self.assertRaisesRegex(ValueError, 'bad key'):
+            srsa.decrypt_stream(io.BytesIO(c), io.BytesIO(), wrong, nblocks=5)
+
+    def test_keys_positive_d(self):
+        for _ in range(20):
+            pub, pri = srsa.keys(prime_len=16)
+            self.assertGreater(pri[1], 0)
+
+    def test_encrypt_bytes_zeros(self):
+        # an all-zero block encrypts to 0: pow(0, d, n) needs d > 0
+        pub, pri = srsa.keys(p=1000003, q=1000033)
+        for msg in (bytes(300), b'abc' + bytes(64) + b'def' + bytes(17)):
+            self.assertEqual(srsa.decrypt_bytes(srsa.encrypt_bytes(msg, pub), pri), msg)
+            fin, fout = io.BytesIO(msg), io.BytesIO()
+            srsa.encrypt_stream(fin, fout, pub, nblocks=3)
+            fin, fplain = io.BytesIO(fout.getvalue()), io.BytesIO()
+            self.assertEqual(srsa.decrypt_stream(fin, fplain, pri, nblocks=2), len(msg))
+            self.assertEqual(fplain.getvalue(), msg)
+
+    def test_encrypt_stream(self):
+        pub, pri = srsa.keys(prime_len=16)
+        msg = bytes(range(256)) * 3
+        fin, fout = io.BytesIO(msg), io.BytesIO()
+        self.assertEqual(srsa.encrypt_stream(fin, fout, pub, nblocks=7), len(msg))
+        self.assertEqual(fout.getvalue(), srsa.encrypt_bytes(msg, pub))
+        fin, fplain = io.BytesIO(fout.getvalue()), io.BytesIO()
+        self.assertEqual(srsa.decrypt_stream(fin, fplain, pri, nblocks=5), len(msg))
+        self.assertEqual(fplain.getvalue(), msg)
+
+    def test_encrypt_stream_short_reads(self):
+        pub, pri = srsa.keys(prime_len=16)
+        msg = bytes(range(256)) * 3 + bytes(100)
+        fin, fout = ShortReader(msg), io.BytesIO()
+        self.assertEqual(srsa.encrypt_stream(fin, fout, pub, nblocks=5), len(msg))
+        self.assertEqual(fout.getvalue(), srsa.encrypt_bytes(msg, pub))
+        fin, fplain = ShortReader(fout.getvalue()), io.BytesIO()
+        self.assertEqual(srsa.decrypt_stream(fin, fplain, pri, nblocks=5), len(msg))
+        self.assertEqual(fplain.getvalue(), msg)
+
+
+class ShortReader(io.RawIOBase):
+    '''raw binary file returning at most 7 bytes per read'''
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        chunk = self.data.read(min(len(b), 7))
+        b[:len(chunk)] = chunk
+        return len(chunk)
+
 
 if __name__ == '__main__':
     unittest.main()
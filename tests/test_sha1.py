@@ -2,8 +2,12 @@
 # to use: "cd tests; python test_sha1.py"
 
 # import std libs
+from array import array
+import hashlib
+import mmap
 import os
 import sys
+import tempfile
 import unittest
 #import statistics as stat
 
@@ -41,6 +45,49 @@ class SHA1Tests(unittest.TestCase):
         s = sha1.sha1(msg)
         self.assertEqual(f'{s:0>40x}', expected)
 
+    def test_hasher(self):
+        msg = b'The quick brown fox jumps over the lazy dog'
+        h = sha1.Sha1()
+        for ndx in range(0, len(msg), 10):
+            h.update(msg[ndx:ndx+10])
+        self.assertEqual(h.hexdigest(), '2fd4e1c67a2d28fced849ee1bb76e7391b93eb12')
+        self.assertEqual(h.length, len(msg))
+        self.assertEqual(sha1.Sha1().hexdigest(), 'da39a3ee5e6b4b0d3255bfef95601890afd80709')   # empty message
+        for n in (55, 56, 64, 130, ):                     # padding in one or two blocks
+            msg = bytes(range(n))
+            self.assertEqual(sha1.Sha1(msg).to_int(), sha1.sha1(nba.NBitArray(msg)))
+            self.assertEqual(sha1.Sha1(msg).digest(), hashlib.sha1(msg).digest())
+
+    def test_compress(self):
+        block = bytes(range(64))
+        h = sha1.hash_computation(nba.NBitArray(block), sha1.H0)
+        self.assertEqual(sha1.compress(sha1.H0_INT, block), tuple(item.to_int() for item in h))
+        self.assertEqual(sha1.compress(sha1.H0_INT, b'x' + block, offset=1), sha1.compress(sha1.H0_INT, block))
+
+    def test_sha1_buffers(self):
+        msg = bytes(range(256)) * 3
+        expected = int(hashlib.sha1(msg).hexdigest(), 16)
+        for item in (msg, bytearray(msg), memoryview(msg), ):
+            self.assertEqual(sha1.sha1(item), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'msg')
+            with open(path, 'wb') as f:
+                f.write(msg)
+            self.assertEqual(sha1.sha1(path), expected)
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual(sha1.sha1(m), expected)
+
+    def test_sha1_many(self):
+        msgs = [bytes(range(n)) for n in (0, 20, 55, 56, 64, 200)] + [bytearray(b'abc'), memoryview(b'abc')]
+        expected = [int(hashlib.sha1(msg).hexdigest(), 16) for msg in msgs]
+        self.assertEqual(sha1.sha1_many(msgs), expected)
+        self.assertEqual(sha1.sha1_many(iter(msgs), jobs=2, chunksize=3), expected)
+        self.assertEqual(sha1.sha1_many([]), [])
+        words = array('I', range(40))                 # items of 4 bytes: the length is in bytes
+        expected = int(hashlib.sha1(words).hexdigest(), 16)
+        self.assertEqual(sha1.sha1_many([words, memoryview(words)]), [expected, expected])
+        self.assertEqual(sha1.sha1_many([words], jobs=2), [expected])
+
     
     
 
@@ -0,0 +1,74 @@
+# :filename: tests/test_sha1sum.py
+# to use: "cd tests; python test_sha1sum.py"
+
+
+# import std libs
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+
+
+# import 3rd parties libs
+
+
+# import project's libs
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.sha1sum as sha1sum         # NOW we find sha1sum module if we import it
+
+
+class Sha1sumTests(unittest.TestCase):
+    '''testing sha1sum.py'''
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data = {}
+        for name, size in (('a', 0), ('b', 1), ('c', 100), ('d', 300), ):
+            path = os.path.join(tmp.name, name)
+            self.data[path] = (bytes(range(256)) * 2)[:size]
+            with open(path, 'wb') as f:
+                f.write(self.data[path])
+        self.missing = os.path.join(tmp.name, 'missing')
+
+    def expected(self, path):
+        return hashlib.sha1(self.data[path]).hexdigest()
+
+    def test_digest_file(self):
+        for path in self.data:
+            self.assertEqual(sha1sum.digest_file(path), self.expected(path))
+        with self.assertRaises(OSError):
+            sha1sum.digest_file(self.missing)
+
+    def test_digest_files(self):
+        paths = list(self.data) + [self.missing]
+        expected = [(path, self.expected(path)) for path in self.data] + [(self.missing, None)]
+        self.assertEqual(list(sha1sum.digest_files(paths, jobs=1)), expected)
+        self.assertEqual(list(sha1sum.digest_files(iter(paths), jobs=2, max_inflight=1)), expected)
+        self.assertEqual(sorted(sha1sum.digest_files(paths, jobs=2, ordered=False), key=str),
+                         sorted(expected, key=str))
+
+    def test_lines(self):
+        digest = 'a' * 40
+        self.assertEqual(sha1sum.format_line('x y', digest), f'{digest}  x y')
+        self.assertEqual(sha1sum.format_line('x\\y\nz', digest), f'\\{digest}  x\\\\y\\nz')
+        for path in ('x y', 'x\\y\nz', ):
+            self.assertEqual(sha1sum.parse_line(sha1sum.format_line(path, digest) + '\n'), (digest, path))
+        self.assertEqual(sha1sum.parse_line(f'{digest.upper()} *x'), (digest, 'x'))
+        for line in ('', f'{digest} x', f'{"g" * 40}  x', f'{digest}  '):
+            with self.assertRaises(ValueError):
+                sha1sum.parse_line(line)
+
+    def test_check(self):
+        lines = [sha1sum.format_line(path, self.expected(path)) for path in self.data]
+        lines[1] = sha1sum.format_line(list(self.data)[1], '0' * 40)
+        lines += ['', sha1sum.format_line(self.missing, '0' * 40)]
+        result = list(sha1sum.check(lines, jobs=2))
+        self.assertEqual([ok for _, ok in result], [True, False, True, True, None])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
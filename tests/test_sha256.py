@@ -0,0 +1,73 @@
+# :filename: tests/test_sha256.py
+# to use: "cd tests; python test_sha256.py"
+
+# import std libs
+import hashlib
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+# import 3rd parties libs
+
+# import project's libs
+
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.sha256 as sha256           # NOW we find sha256 module if we import it ...
+import source.nbitarray as nba           # ... and nbitarray module
+
+
+def icbrt(n):
+    '''integer cube root of n'''
+    x = 1 << ((n.bit_length() + 2) // 3)
+    while True:
+        y = (2 * x + n // (x * x)) // 3
+        if y >= x:
+            return x
+        x = y
+
+
+class SHA256Tests(unittest.TestCase):
+
+    def test_constants(self):
+        primes = [p for p in range(2, 312) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+        self.assertEqual(sha256.K, tuple(icbrt(p << 96) & sha256.MASK for p in primes))
+        self.assertEqual(sha256.H0_256, tuple(math.isqrt(p << 64) & sha256.MASK for p in primes[:8]))
+
+    def test_sha256(self):
+        msg = nba.NBitArray(b'The quick brown fox jumps over the lazy dog')
+        s = sha256.sha256(msg)
+        self.assertEqual(f'{s:0>64x}', 'd7a8fbb307d7809469ca9abcb0082e4f8d5651e46d3cdb762d02d0bf37c9e592')
+        for n in (0, 3, 55, 56, 64, 130, 1000, ):        # padding in one or two blocks
+            msg = bytes(range(256)) * 4
+            msg = msg[:n]
+            self.assertEqual(sha256.sha256(msg), int(hashlib.sha256(msg).hexdigest(), 16))
+            self.assertEqual(sha256.sha224(msg), int(hashlib.sha224(msg).hexdigest(), 16))
+            self.assertEqual(sha256.sha256(nba.NBitArray(msg) if msg else nba.NBitArray(0)),
+                             sha256.sha256(msg))
+
+    def test_hasher(self):
+        msg = bytes(range(200))
+        for cls, reference in ((sha256.Sha256, hashlib.sha256), (sha256.Sha224, hashlib.sha224), ):
+            h = cls()
+            for ndx in range(0, len(msg), 7):
+                h.update(msg[ndx:ndx+7])
+            self.assertEqual(h.digest(), reference(msg).digest())
+            self.assertEqual(h.hexdigest(), reference(msg).hexdigest())
+            self.assertEqual(cls().hexdigest(), reference(b'').hexdigest())
+        self.assertEqual(len(sha256.Sha224(msg).digest()), 28)
+
+    def test_file(self):
+        msg = bytes(range(256)) * 3
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'msg')
+            with open(path, 'wb') as f:
+                f.write(msg)
+            self.assertEqual(sha256.sha256(path), int(hashlib.sha256(msg).hexdigest(), 16))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# :filename: tests/test_words.py
+# to use: "cd tests; python test_words.py"
+
+# import std libs
+import os
+import pickle
+import sys
+import unittest
+
+# import 3rd parties libs
+
+# import project's libs
+
+# we need to add the project directory to pythonpath to find project's module(s) in development PC without installing it
+basedir, _ = os.path.split(os.path.abspath(os.path.dirname(__file__)).replace('\\', '/'))
+sys.path.insert(1, basedir)              # ndx==1 because 0 is reserved for local directory
+import source.words     as words         # NOW we find words module if we import it
+import source.nbitarray as nba
+import source.sha1      as sha1
+import source.des       as des
+
+Word32 = words.Word32
+
+
+class WordsTests(unittest.TestCase):
+    '''testing words.py'''
+
+    def test_mask(self):
+        self.assertEqual(Word32(1 << 32 | 5), 5)
+        self.assertEqual(Word32(-1), 0xffffffff)
+        self.assertIsInstance(Word32(5), int)
+        self.assertIs(words.word_type(32), Word32)
+        self.assertEqual(words.word_type(12).MASK, 0xfff)
+        with self.assertRaises(ValueError):
+            words.word_type(0)
+
+    def test_arithmetic(self):
+        a, b = Word32(0xfffffff0), Word32(0x20)
+        for result, expected in ((a + b, 0x10), (b - a, 0x30), (a * b, 0xfffffe00), (-b, 0xffffffe0),
+                                 (a & 0xff, 0xf0), (a | 0xf, 0xffffffff), (a ^ b, 0xffffffd0), (~a, 0xf),
+                                 (a << 8, 0xfffff000), (a >> 8, 0xffffff), (a.add_mod(b, inplace=True), 0x10), ):
+            self.assertEqual(result, expected)
+            self.assertIsInstance(result, Word32)
+        self.assertEqual(1 + a, 0xfffffff1)      # an int on the left: plain int
+        self.assertNotIsInstance(1 + a, Word32)
+        self.assertEqual((1 << 32) | b, 0x100000020)
+
+    def test_rotations(self):
+        a = Word32(0x80000001)
+        self.assertEqual(a.rotl(1), 0x00000003)
+        self.assertEqual(a.rotr(1), 0xc0000000)
+        self.assertEqual(a.rotl(32), a)
+        self.assertEqual(a.rotl(33), a.rotl(1))
+        self.assertEqual(a.__lshift__(4, circular=True), a.rotl(4))
+        self.assertEqual(words.Word28(0x8000001).rotl(2), 0x6)
+        for n in range(0, 40):                    # as NBitArray circular shift
+            x = nba.NBitArray.from_int(0x12345678, 32).__lshift__(n, circular=True)
+            self.assertEqual(Word32(0x12345678).rotl(n), x.to_int())
+
+    def test_registers(self):
+        x = words.Word64(0x123456abcd132536)
+        left, right = x.split()
+        self.assertEqual((left, right), (0x123456ab, 0xcd132536))
+        self.assertIsInstance(left, Word32)
+        self.assertEqual(right.concat(left), 0xcd132536123456ab)
+        self.assertIsInstance(right.concat(left), words.Word64)
+        self.assertEqual(len(x), 64)
+        self.assertEqual(x.hex(), '123456abcd132536')
+        self.assertEqual(repr(Word32(0xab)), 'Word32(0x000000ab)')
+        self.assertEqual(Word32(5).bin(), '0' * 29 + '101')
+        self.assertEqual((str(Word32(5)), f'{Word32(5)}', '%s' % Word32(5), f'{Word32(5):x}'), ('5', '5', '5', '5'))
+        with self.assertRaises(ValueError):
+            words.word_type(7)(0x7f).split()
+
+    def test_packing(self):
+        data = bytes(range(16))
+        self.assertEqual(Word32.unpack(data), [0x00010203, 0x04050607, 0x08090a0b, 0x0c0d0e0f])
+        self.assertEqual(Word32.unpack(data, 'little', offset=4, count=2), [0x07060504, 0x0b0a0908])
+        self.assertEqual(words.Word64.unpack(data, 'little')[1], 0x0f0e0d0c0b0a0908)
+        self.assertEqual(words.Word48.unpack(data[:12]), [0x000102030405, 0x060708090a0b])
+        for cls in (Word32, words.Word48, words.Word64):
+            for order in ('big', 'little'):
+                w = cls.unpack(data, order)
+                self.assertEqual(cls.pack_words(w, order), data[:len(w) * cls.NBYTES])
+        self.assertEqual(Word32(0x01020304).pack('little'), b'\x04\x03\x02\x01')
+        self.assertEqual(Word32.from_bytes(b'\x01\x02\x03\x04'), 0x01020304)
+        self.assertIsInstance(Word32.unpack(data)[0], Word32)
+
+    def test_pickle(self):
+        w = pickle.loads(pickle.dumps(words.Word48(0xabc)))
+        self.assertEqual(w, 0xabc)
+        self.assertIsInstance(w, words.Word48)
+
+    def test_sha1(self):
+        block = bytes(range(64))
+        wj = sha1.msg_schedule(nba.NBitArray(block))
+        self.assertEqual(len(wj), 80)
+        self.assertTrue(all(isinstance(w, Word32) for w in wj))
+        self.assertEqual(sha1.msg_schedule(block), wj)
+        h = sha1.hash_computation(block, sha1.H0_WORDS)
+        self.assertTrue(all(isinstance(w, Word32) for w in h))
+        self.assertEqual(tuple(h), sha1.compress(sha1.H0_INT, block))
+
+    def test_des(self):
+        k = des.Key([0xaa,0xbb,0x09,0x18,0x27,0x36,0xcc,0xdd,])
+        self.assertEqual([key.to_int() for key in k.calculate_keys()], k.keys_int)
+        txt = words.Word64(0x14a7d67818ca18ad)
+        result = des.round_txt(txt, words.Word48(k[1].to_int()), 1)
+        self.assertIsInstance(result, words.Word64)
+        self.assertEqual(result, 0x18ca18ad5a78e394)
+        self.assertIsInstance(des.des_function(Word32(0x18ca18ad), k[1]), Word32)
+
+
+if __name__ == '__main__':
+    unittest.main()